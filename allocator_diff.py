@@ -0,0 +1,321 @@
+"""
+Differential testing of seat allocators against the current Cinema allocators.
+
+Any alternative allocation engine is run side by side with the reference
+`allocate_default_seats` / `allocate_seats_from_position` on randomized
+halls, fill states and requests. The first request where the two disagree
+is shrunk to a minimal reproduction, and both sides are timed, so a faster
+engine comes with evidence that customers get the same seats.
+
+An engine is a callable `engine(cinema, request)` returning the suggested
+seats, None, or `UNSUPPORTED` for requests it does not handle. Engines must
+not change the cinema.
+"""
+import contextlib
+import logging
+import random
+import time
+from collections import namedtuple
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from hall_layout import (GENERAL_TYPES, SEAT_BLOCKED, SEAT_COMPANION, SEAT_STANDARD, SEAT_WHEELCHAIR,
+                         SELLABLE_TYPES, NO_SEAT, HallLayout)
+from zones import ZoneMap
+
+# Request kinds
+REQUEST_DEFAULT = "default"
+REQUEST_POSITION = "position"
+
+# One-character zone codes used by randomized halls
+ZONE_CODES = {"p": "premium", "s": "standard", "f": "front-row"}
+NO_ZONE = "_"
+
+# Returned by engines for requests they do not handle
+UNSUPPORTED = "unsupported"
+
+# Requests tried against each randomized hall and fill state
+REQUESTS_PER_HALL = 20
+
+# A hall: layout rows of seat type characters, zone rows of ZONE_CODES
+# characters (None for the default tiers), and the seats already booked
+Hall = namedtuple("Hall", ["cells", "zones", "taken"])
+Request = namedtuple("Request", ["kind", "num_tickets", "start_row", "start_col", "zone"])
+Case = namedtuple("Case", ["hall", "request"])
+
+Divergence = namedtuple("Divergence", ["case", "expected", "actual", "minimized"])
+DiffResult = namedtuple("DiffResult", ["cases", "skipped", "reference_time", "candidate_time", "divergence"])
+
+
+@contextlib.contextmanager
+def quiet_allocators():
+    """
+    Silence the cinema's per-allocation logging for the duration of a run.
+    """
+    cinema_logger = logging.getLogger("cinema")
+    previous_level = cinema_logger.level
+    cinema_logger.setLevel(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        cinema_logger.setLevel(previous_level)
+
+
+def reference_engine(cinema, request):
+    """
+    The current Cinema allocators, which every other engine must match.
+    """
+    if request.kind == REQUEST_DEFAULT:
+        return cinema.allocate_default_seats(request.num_tickets, request.zone)
+    return cinema.allocate_seats_from_position(request.num_tickets, request.start_row,
+                                               request.start_col, request.zone)
+
+
+def naive_engine(cinema, request):
+    """
+    Straightforward reading of the allocation rules over the seating map,
+    without any of the bitmasks. Slow, but easy to check by eye.
+    """
+    if request.num_tickets <= 0:
+        raise ValueError("Number of tickets must be positive")
+    if request.kind == REQUEST_POSITION and not (0 <= request.start_row < cinema.rows
+                                                 and 0 <= request.start_col < cinema.seats_per_row):
+        raise ValueError("Starting position is out of bounds")
+    if request.zone is not None and request.zone not in cinema.zones.names:
+        raise ValueError(f"Unknown zone '{request.zone}'")
+
+    def allocatable(row_index, col_index):
+        return (cinema.seating_map[row_index][col_index] == '.'
+                and cinema.seat_type(row_index, col_index) in GENERAL_TYPES
+                and (request.zone is None or cinema.zones.zone_at(row_index, col_index) == request.zone))
+
+    mid_col = cinema.seats_per_row // 2 - (1 if cinema.seats_per_row % 2 == 0 else 0)
+    middle_out = [mid_col]
+    for offset in range(1, cinema.seats_per_row):
+        middle_out += [col_index for col_index in (mid_col + offset, mid_col - offset)
+                       if 0 <= col_index < cinema.seats_per_row]
+
+    if request.kind == REQUEST_DEFAULT:
+        candidates = [(row_index, col_index) for row_index in range(cinema.rows - 1, -1, -1)
+                      for col_index in middle_out]
+    else:
+        candidates = ([(request.start_row, col_index) for col_index in range(request.start_col, cinema.seats_per_row)]
+                      + [(row_index, col_index) for row_index in range(request.start_row - 1, -1, -1)
+                         for col_index in middle_out])
+
+    seats = [seat for seat in candidates if allocatable(*seat)][:request.num_tickets]
+    return seats if len(seats) == request.num_tickets else None
+
+
+def build_cinema(hall):
+    """
+    Build the cinema described by a hall, with its taken seats booked.
+    """
+    layout = HallLayout([list(row) for row in hall.cells])
+    zones = None
+    if hall.zones is not None:
+        zones = ZoneMap([[ZONE_CODES.get(code) for code in row] for row in hall.zones])
+    cinema = Cinema("Differential", layout.rows, layout.seats_per_row, layout, zones)
+    if hall.taken:
+        cinema.book_seats(list(hall.taken), "BK0001")
+    return cinema
+
+
+def random_hall(rng):
+    """
+    Return a random hall: mostly small, sometimes full size, with aisles,
+    seat types, custom zones and a random share of seats taken.
+    """
+    if rng.random() < 0.05:
+        rows, seats_per_row = MAX_ROWS, MAX_SEATS_PER_ROW
+    else:
+        rows, seats_per_row = rng.randint(1, 10), rng.randint(1, 16)
+
+    aisles = {col_index for col_index in range(seats_per_row) if rng.random() < 0.1}
+    weights = (SEAT_STANDARD,) * 16 + (SEAT_COMPANION, SEAT_WHEELCHAIR, SEAT_BLOCKED, NO_SEAT)
+    cells = tuple("".join(NO_SEAT if col_index in aisles else rng.choice(weights)
+                          for col_index in range(seats_per_row))
+                  for _ in range(rows))
+
+    zones = None
+    if rng.random() < 0.5:
+        codes = tuple(ZONE_CODES) + (NO_ZONE,)
+        zones = tuple("".join(rng.choice(codes) if rng.random() < 0.2 else row_code
+                              for _ in range(seats_per_row))
+                      for row_code in (rng.choice(codes) for _ in range(rows)))
+
+    fill_ratio = rng.choice((0.0, 0.3, 0.7, 0.95, rng.random()))
+    taken = tuple((row_index, col_index) for row_index in range(rows) for col_index in range(seats_per_row)
+                  if cells[row_index][col_index] in SELLABLE_TYPES and rng.random() < fill_ratio)
+    return Hall(cells, zones, taken)
+
+
+def random_request(rng, cinema):
+    """
+    Return a random request for a cinema, occasionally an invalid one.
+    """
+    kind = rng.choice((REQUEST_DEFAULT, REQUEST_POSITION))
+    num_tickets = rng.choice((1, 2, 3, 4, 6, 10, rng.randint(1, cinema.total_seats + 2)))
+    if rng.random() < 0.01:
+        num_tickets = 0
+
+    start_row, start_col = rng.randrange(cinema.rows), rng.randrange(cinema.seats_per_row)
+    if rng.random() < 0.01:
+        start_col = cinema.seats_per_row
+
+    zone = None
+    if rng.random() < 0.3:
+        zone = rng.choice(cinema.zones.names + ["balcony"]) if cinema.zones.names else "balcony"
+    return Request(kind, num_tickets, start_row, start_col, zone)
+
+
+def outcome(engine, cinema, request):
+    """
+    Run an engine and return `(result, seconds)`, where an exception is
+    recorded by its type so errors are compared too.
+    """
+    start_time = time.perf_counter()
+    try:
+        seats = engine(cinema, request)
+    except Exception as e:
+        result = ("error", type(e).__name__)
+    else:
+        result = seats if seats in (None, UNSUPPORTED) else ("seats", tuple(seats))
+    return result, time.perf_counter() - start_time
+
+
+def diverges(case, candidate, reference=reference_engine):
+    """
+    Return `(expected, actual)` if the engines disagree on a case, else None.
+    """
+    with quiet_allocators():
+        cinema = build_cinema(case.hall)
+        expected, _ = outcome(reference, cinema, case.request)
+        actual, _ = outcome(candidate, cinema, case.request)
+    if actual == UNSUPPORTED or actual == expected:
+        return None
+    return expected, actual
+
+
+def _without_row(case, row_index):
+    hall, request = case
+    if len(hall.cells) == 1 or (request.kind == REQUEST_POSITION and request.start_row == row_index):
+        return None
+    shift = lambda r: r - 1 if r > row_index else r
+    hall = Hall(hall.cells[:row_index] + hall.cells[row_index + 1:],
+                None if hall.zones is None else hall.zones[:row_index] + hall.zones[row_index + 1:],
+                tuple((shift(r), c) for r, c in hall.taken if r != row_index))
+    return Case(hall, request._replace(start_row=shift(request.start_row)))
+
+
+def _without_column(case, col_index):
+    hall, request = case
+    if len(hall.cells[0]) == 1 or (request.kind == REQUEST_POSITION and request.start_col == col_index):
+        return None
+    shift = lambda c: c - 1 if c > col_index else c
+    drop = lambda rows: tuple(row[:col_index] + row[col_index + 1:] for row in rows)
+    hall = Hall(drop(hall.cells), None if hall.zones is None else drop(hall.zones),
+                tuple((r, shift(c)) for r, c in hall.taken if c != col_index))
+    return Case(hall, request._replace(start_col=shift(request.start_col)))
+
+
+def _shrink_candidates(case):
+    # Simpler variants of a case, biggest reductions first
+    hall, request = case
+    if request.kind == REQUEST_POSITION:
+        yield Case(hall, request._replace(kind=REQUEST_DEFAULT))
+    if request.zone is not None:
+        yield Case(hall, request._replace(zone=None))
+    if hall.zones is not None:
+        yield Case(hall._replace(zones=None), request)
+    for row_index in range(len(hall.cells)):
+        yield _without_row(case, row_index)
+    for col_index in range(len(hall.cells[0])):
+        yield _without_column(case, col_index)
+
+    chunk = len(hall.taken) // 2
+    while chunk >= 1:
+        for start in range(0, len(hall.taken), chunk):
+            yield Case(hall._replace(taken=hall.taken[:start] + hall.taken[start + chunk:]), request)
+        chunk //= 2
+
+    if request.num_tickets > 1:
+        yield Case(hall, request._replace(num_tickets=1))
+        yield Case(hall, request._replace(num_tickets=request.num_tickets - 1))
+    for row_index, row in enumerate(hall.cells):
+        for col_index, seat_type in enumerate(row):
+            if seat_type != SEAT_STANDARD:
+                cells = list(hall.cells)
+                cells[row_index] = row[:col_index] + SEAT_STANDARD + row[col_index + 1:]
+                yield Case(hall._replace(cells=tuple(cells)), request)
+
+
+def minimize(case, candidate, reference=reference_engine):
+    """
+    Greedily shrink a diverging case - fewer rows, columns, taken seats and
+    tickets, plainer seats - while the engines keep disagreeing.
+    """
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for smaller in _shrink_candidates(case):
+            if smaller is None:
+                continue
+            try:
+                if diverges(smaller, candidate, reference) is None:
+                    continue
+            except ValueError:
+                # Not a valid hall any more, such as a zone outside the layout
+                continue
+            case = smaller
+            shrunk = True
+            break
+    return case
+
+
+def format_reproduction(case, expected, actual):
+    """
+    Return Python source that rebuilds a case and calls the reference allocator.
+    """
+    hall, request = case
+    if request.kind == REQUEST_DEFAULT:
+        call = f"cinema.allocate_default_seats({request.num_tickets}, zone={request.zone!r})"
+    else:
+        call = (f"cinema.allocate_seats_from_position({request.num_tickets}, {request.start_row}, "
+                f"{request.start_col}, zone={request.zone!r})")
+    return (f"from allocator_diff import Hall, build_cinema\n"
+            f"cinema = build_cinema(Hall(cells={hall.cells!r}, zones={hall.zones!r}, taken={hall.taken!r}))\n"
+            f"{call}\n"
+            f"# reference: {expected!r}\n"
+            f"# candidate: {actual!r}")
+
+
+def run_differential(candidate, num_cases, seed=0, reference=reference_engine, requests_per_hall=REQUESTS_PER_HALL):
+    """
+    Compare `candidate` with `reference` on `num_cases` random requests and
+    return a DiffResult. Stops at the first divergence, which is minimized.
+    """
+    rng = random.Random(seed)
+    cases = skipped = 0
+    reference_time = candidate_time = 0.0
+    divergence = None
+    with quiet_allocators():
+        while cases < num_cases and divergence is None:
+            hall = random_hall(rng)
+            cinema = build_cinema(hall)
+            for _ in range(min(requests_per_hall, num_cases - cases)):
+                request = random_request(rng, cinema)
+                expected, reference_seconds = outcome(reference, cinema, request)
+                actual, candidate_seconds = outcome(candidate, cinema, request)
+                cases += 1
+                if actual == UNSUPPORTED:
+                    skipped += 1
+                    continue
+
+                reference_time += reference_seconds
+                candidate_time += candidate_seconds
+                if actual != expected:
+                    case = Case(hall, request)
+                    divergence = Divergence(case, expected, actual, minimize(case, candidate, reference))
+                    break
+
+    return DiffResult(cases, skipped, reference_time, candidate_time, divergence)
@@ -1,6 +1,13 @@
+import html
+import uuid
+
 import streamlit as st
-import pandas as pd
-from cinema import Cinema
+from bookings_table import BookingsTable
+from cinema import Cinema, SeatConflictError
+from customer_index import Customer, format_customer
+from hall_layout import HallLayout
+from seat_map_view import SeatMapView
+from waiting_room import WaitingRoom
 
 # Page configuration
 st.set_page_config(
@@ -10,7 +17,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load and apply custom cinema-themed styling
+# Load and apply custom cinema-themed styling, read from disk once per server
+@st.cache_resource
 def load_css():
     with open('styles.css', 'r') as f:
         css = f.read()
@@ -18,61 +26,60 @@ def load_css():
 
 st.markdown(load_css(), unsafe_allow_html=True)
 
+class SharedCinema:
+    """Holder for the cinema shared by every browser session of this process"""
+    def __init__(self):
+        self.cinema = None
+        self.bookings_table = None
+        self.waiting_room = None
+    
+    def set_cinema(self, cinema):
+        """Replace the shared cinema, along with its bookings table and waiting room"""
+        if self.bookings_table is not None:
+            self.bookings_table.close()
+        self.cinema = cinema
+        self.bookings_table = BookingsTable(cinema) if cinema is not None else None
+        self.waiting_room = WaitingRoom() if cinema is not None else None
+
+@st.cache_resource
+def get_shared_cinema():
+    """Process-wide shared cinema holder, created once per server"""
+    return SharedCinema()
+
 def init_session_state():
     """Initialize Streamlit session state variables"""
-    if 'cinema' not in st.session_state:
-        st.session_state.cinema = None
     if 'current_booking' not in st.session_state:
         st.session_state.current_booking = None
     if 'selected_seats' not in st.session_state:
         st.session_state.selected_seats = []
     if 'booking_id' not in st.session_state:
         st.session_state.booking_id = None
+    if 'offer' not in st.session_state:
+        st.session_state.offer = None
+    if 'offer_version' not in st.session_state:
+        st.session_state.offer_version = None
+    if 'notice' not in st.session_state:
+        st.session_state.notice = None
     if 'page' not in st.session_state:
-        st.session_state.page = 'setup'
+        st.session_state.page = 'main'
+    if 'visitor_id' not in st.session_state:
+        st.session_state.visitor_id = uuid.uuid4().hex
 
-def format_seating_map(cinema, current_booking=None):
-    """Format the seating map for display in Streamlit with enhanced styling"""
+def format_seating_map(cinema, current_booking=None, selected_seats=None):
+    """Format the seating map for display in Streamlit, redrawing only seats changed since the last render"""
     if not cinema:
         return ""
     
-    # Screen header - let CSS handle the centering
-    screen_text = "S C R E E N"
-    # Create separator line that matches the seating area width
-    separator_length = cinema.seats_per_row * 4
-    
-    seating_display = f'<div class="screen-header">{screen_text}</div>\n'
-    seating_display += f'<div style="color: #ffd700; text-align: center; margin-bottom: 20px;">{"═" * separator_length}</div>\n'
-    
-    # Seating grid with colored seats
-    for row_index in range(cinema.rows):
-        row_letter = cinema.get_row_letter(row_index)
-        line = f'<span style="color: #ffd700; font-weight: bold;">{row_letter}</span>   '
-
-        for col_index in range(cinema.seats_per_row):
-            seat_status = cinema.seating_map[row_index][col_index]
-
-            if seat_status == '.':
-                line += '<span style="color: #90EE90;">●</span>'  # Available - green
-            elif current_booking and seat_status == current_booking:
-                line += '<span style="color: #FFD700;">●</span>'  # Selected - gold
-            else:
-                line += '<span style="color: #FF6B6B;">●</span>'  # Booked - red
-            line += "   "
-        
-        seating_display += line + "\n"
-    
-    # Column numbers with styling
-    line = "    "  # Match the spacing after row letters
-    for col in range(1, cinema.seats_per_row + 1):
-        if col < 10:
-            line += f'<span style="color: #ffd700;">{col}</span>   '
-        else:
-            line += f'<span style="color: #ffd700;">{col}</span>  '
-    seating_display += line
+    view = st.session_state.get('seat_map_view')
+    if view is None or view.cinema is not cinema:
+        view = SeatMapView(cinema)
+        st.session_state.seat_map_view = view
     
-    # Wrap in HTML for proper formatting
-    return f'<div style="font-family: monospace; line-height: 1.8; text-align: center;">{seating_display}</div>'
+    # Seats offered to this session are highlighted without touching the shared map
+    highlight_seats = list(selected_seats or ())
+    if current_booking:
+        highlight_seats.extend(cinema.bookings.get(current_booking, ()))
+    return view.render(highlight_seats)
 
 def cinema_setup_page():
     """Cinema setup page"""
@@ -97,6 +104,8 @@ def cinema_setup_page():
         with col3:
             seats_per_row = st.number_input("Seats per Row", min_value=1, max_value=50, value=10)
         
+        layout_file = st.file_uploader("Hall Layout (optional, overrides rows and seats)", type=["txt"])
+        
         submitted = st.form_submit_button("Create Cinema", type="primary")
         
         if submitted:
@@ -104,8 +113,11 @@ def cinema_setup_page():
                 st.error("Please enter a movie title")
             else:
                 try:
-                    cinema = Cinema(title, rows, seats_per_row)
-                    st.session_state.cinema = cinema
+                    layout = None
+                    if layout_file is not None:
+                        layout = HallLayout.from_string(layout_file.getvalue().decode("utf-8"))
+                    cinema = Cinema(title, rows, seats_per_row, layout)
+                    get_shared_cinema().set_cinema(cinema)
                     st.session_state.page = 'main'
                     st.success(f"Cinema created successfully! {cinema.total_seats} seats available.")
                     st.rerun()
@@ -114,7 +126,7 @@ def cinema_setup_page():
 
 def main_menu_page():
     """Main menu page"""
-    cinema = st.session_state.cinema
+    cinema = get_shared_cinema().cinema
     
     st.markdown(f'<h1 class="cinema-title">{cinema.title}</h1>', unsafe_allow_html=True)
     
@@ -139,7 +151,7 @@ def main_menu_page():
             st.rerun()
         
         if st.button("Reset Cinema", use_container_width=True):
-            st.session_state.cinema = None
+            get_shared_cinema().set_cinema(None)
             st.session_state.page = 'setup'
             st.rerun()
     
@@ -162,24 +174,72 @@ def main_menu_page():
     </div>
     """, unsafe_allow_html=True)
 
+def allocate_offer(cinema, offer):
+    """Allocate seats for an offer, returning the seats and the cinema version they were taken at"""
+    method, num_tickets, zone, num_spaces, position = offer
+    with cinema.lock:
+        if method == "Auto-allocate (recommended)":
+            seats = cinema.allocate_default_seats(num_tickets, zone)
+        elif method == "Keep party together":
+            seats = cinema.allocate_contiguous_seats(num_tickets)
+        elif method == "Wheelchair access":
+            seats = cinema.allocate_accessible_seats(num_spaces, num_tickets - num_spaces)
+        else:
+            seats = cinema.allocate_seats_from_position(num_tickets, position[0], position[1], zone)
+        return seats, cinema.version
+
+# Seconds between a queued visitor's checks; well inside the waiting room's queue timeout
+WAITING_ROOM_RECHECK = 3
+
+@st.fragment(run_every=WAITING_ROOM_RECHECK)
+def waiting_room_page():
+    """Queue position shown while the booking page is full, rechecked every few seconds"""
+    # Only this fragment reruns on the timer, so no server thread waits between checks
+    admission = get_shared_cinema().waiting_room.enter(st.session_state.visitor_id)
+    if admission.admitted:
+        st.rerun()
+    minutes, seconds = divmod(round(admission.eta), 60)
+    st.info(f"The booking page is busy right now. You are number {admission.position} in the queue.")
+    st.markdown(f"**Estimated wait:** {minutes} min {seconds} s. This page will let you in automatically.")
+
 def booking_page():
     """Ticket booking page"""
-    cinema = st.session_state.cinema
+    shared = get_shared_cinema()
+    cinema = shared.cinema
     
     st.markdown(f'<h1 class="cinema-title">{cinema.title}</h1>', unsafe_allow_html=True)
     st.markdown('<h2 style="color: #ffd700; text-align: center;">Book Your Tickets</h2>', unsafe_allow_html=True)
     
     with st.sidebar:
         if st.button("← Back to Main Menu", use_container_width=True):
+            shared.waiting_room.leave(st.session_state.visitor_id)
             st.session_state.page = 'main'
             st.session_state.selected_seats = []
             st.session_state.booking_id = None
+            st.session_state.offer = None
             st.rerun()
     
+    if st.session_state.notice:
+        st.warning(st.session_state.notice)
+        st.session_state.notice = None
+    
     if cinema.available_seats == 0:
+        shared.waiting_room.leave(st.session_state.visitor_id)
         st.error("Sorry, no seats available!")
         return
     
+    admission = shared.waiting_room.enter(st.session_state.visitor_id)
+    if not admission.admitted:
+        waiting_room_page()
+        return
+    
+    # Seats left per pricing zone, read from the cinema's zone counters
+    st.markdown('<h3 style="color: #ffd700;">Seats Left by Zone</h3>', unsafe_allow_html=True)
+    zone_columns = st.columns(len(cinema.zone_available))
+    for zone_column, (zone, seats_left) in zip(zone_columns, cinema.zone_available.items()):
+        with zone_column:
+            st.metric(zone.replace("-", " ").title(), seats_left)
+    
     # Number of tickets selection
     st.markdown('<h3 style="color: #ffd700;">Select Number of Tickets</h3>', unsafe_allow_html=True)
     num_tickets = st.number_input(
@@ -193,9 +253,26 @@ def booking_page():
     st.markdown('<h3 style="color: #ffd700;">Seat Selection</h3>', unsafe_allow_html=True)
     allocation_method = st.radio(
         "Choose allocation method:",
-        ["Auto-allocate (recommended)", "Choose starting position"]
+        ["Auto-allocate (recommended)", "Keep party together", "Wheelchair access", "Choose starting position"]
     )
     
+    # Zone restriction for the general allocation methods
+    zone = None
+    if allocation_method in ("Auto-allocate (recommended)", "Choose starting position"):
+        zone_choice = st.selectbox("Seating zone:", ["Any zone"] + list(cinema.zone_available))
+        if zone_choice != "Any zone":
+            zone = zone_choice
+    
+    # Wheelchair spaces needed (the rest of the party are companions)
+    num_spaces = 1
+    if allocation_method == "Wheelchair access":
+        num_spaces = st.number_input(
+            "How many wheelchair spaces are needed?",
+            min_value=1,
+            max_value=num_tickets,
+            value=1
+        )
+    
     # Custom position selection (only show when needed)
     row_letter = None
     seat_number = None
@@ -219,21 +296,24 @@ def booking_page():
     
     # Seat allocation
     if st.button("Show Available Seats", type="primary"):
-        if allocation_method == "Auto-allocate (recommended)":
-            seats = cinema.allocate_default_seats(num_tickets)
-        else:
+        position = None
+        if allocation_method == "Choose starting position":
             # Custom position selection
             if row_letter and seat_number:
-                row_index = cinema.get_row_index(row_letter)
-                col_index = seat_number - 1
-                seats = cinema.allocate_seats_from_position(num_tickets, row_index, col_index)
+                position = (cinema.get_row_index(row_letter), seat_number - 1)
             else:
                 st.error("Please select a starting row and seat number.")
-                seats = None
+        
+        seats = None
+        if allocation_method != "Choose starting position" or position:
+            offer = (allocation_method, num_tickets, zone, num_spaces, position)
+            seats, version = allocate_offer(cinema, offer)
         
         if seats:
             st.session_state.selected_seats = seats
             st.session_state.booking_id = cinema.generate_booking_id()
+            st.session_state.offer = offer
+            st.session_state.offer_version = version
         else:
             st.error("Could not allocate the requested seats. Please try a different number or position.")
     
@@ -241,18 +321,9 @@ def booking_page():
     if st.session_state.selected_seats:
         st.markdown('<h3 style="color: #ffd700;">Selected Seats</h3>', unsafe_allow_html=True)
         
-        # Create temporary booking for display
-        temp_booking_id = "TEMP_DISPLAY"
-        for row_index, col_index in st.session_state.selected_seats:
-            cinema.seating_map[row_index][col_index] = temp_booking_id
-        
-        seating_map = format_seating_map(cinema, temp_booking_id)
+        seating_map = format_seating_map(cinema, selected_seats=st.session_state.selected_seats)
         st.markdown(f'<div class="seat-grid">{seating_map}</div>', unsafe_allow_html=True)
         
-        # Reset temporary booking
-        for row_index, col_index in st.session_state.selected_seats:
-            cinema.seating_map[row_index][col_index] = '.'
-        
         # Show booking details
         seat_list = []
         for row_index, col_index in st.session_state.selected_seats:
@@ -269,18 +340,49 @@ def booking_page():
         </div>
         """, unsafe_allow_html=True)
         
+        # Optional customer details, so the booking can be found by them later
+        st.markdown('<h3 style="color: #ffd700;">Your Details (optional)</h3>', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            customer_name = st.text_input("Name:").strip()
+        with col2:
+            customer_email = st.text_input("Email:").strip()
+        with col3:
+            customer_phone = st.text_input("Phone:").strip()
+        customer = None
+        if customer_name or customer_email or customer_phone:
+            customer = Customer(customer_name or None, customer_email or None, customer_phone or None)
+        
         # Confirm booking
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Confirm Booking", type="primary", use_container_width=True):
                 try:
-                    cinema.book_seats(st.session_state.selected_seats, st.session_state.booking_id)
+                    # Keyed by offer, so a resubmitted click gets the same outcome back
+                    cinema.confirm_booking(st.session_state.selected_seats, st.session_state.booking_id,
+                                           st.session_state.offer_version, customer,
+                                           idempotency_key=f"{st.session_state.booking_id}@{st.session_state.offer_version}")
                     st.success(f"Booking confirmed! Your booking ID is {st.session_state.booking_id}")
+                    shared.waiting_room.leave(st.session_state.visitor_id)
                     st.session_state.selected_seats = []
                     st.session_state.booking_id = None
+                    st.session_state.offer = None
                     st.session_state.page = 'main'  # Auto-redirect to main menu
                     st.balloons()
                     st.rerun()
+                except SeatConflictError:
+                    # Another session took some of the seats - offer new ones right away
+                    seats, version = allocate_offer(cinema, st.session_state.offer)
+                    if seats:
+                        st.session_state.selected_seats = seats
+                        st.session_state.offer_version = version
+                        st.session_state.notice = "Some of your seats were just booked by someone else. Here are new seats."
+                    else:
+                        st.session_state.selected_seats = []
+                        st.session_state.booking_id = None
+                        st.session_state.offer = None
+                        st.session_state.notice = "Your seats were just booked by someone else and no other seats match your request."
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Error confirming booking: {str(e)}")
         
@@ -288,11 +390,12 @@ def booking_page():
             if st.button("Select Different Seats", use_container_width=True):
                 st.session_state.selected_seats = []
                 st.session_state.booking_id = None
+                st.session_state.offer = None
                 st.rerun()
 
 def check_bookings_page():
     """Check and manage existing bookings"""
-    cinema = st.session_state.cinema
+    cinema = get_shared_cinema().cinema
     
     st.markdown(f'<h1 class="cinema-title">{cinema.title}</h1>', unsafe_allow_html=True)
     st.markdown('<h2 style="color: #ffd700; text-align: center;">Check Your Bookings</h2>', unsafe_allow_html=True)
@@ -306,28 +409,41 @@ def check_bookings_page():
         st.info("No bookings found.")
         return
     
-    # Show all bookings
+    # Show one page of bookings, formatting only the rows on that page
+    bookings_table = get_shared_cinema().bookings_table
     st.markdown('<h3 style="color: #ffd700;">All Bookings</h3>', unsafe_allow_html=True)
     
-    booking_data = []
-    for booking_id, seats in cinema.bookings.items():
-        seat_list = []
-        for row_index, col_index in seats:
-            row_letter = cinema.get_row_letter(row_index)
-            seat_list.append(f"{row_letter}{col_index + 1}")
-        
-        booking_data.append({
-            "Booking ID": booking_id,
-            "Number of Seats": len(seats),
-            "Seats": ", ".join(seat_list)
-        })
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Bookings per page:", [25, 50, 100], index=0)
+    with col2:
+        page_count = bookings_table.page_count(page_size)
+        page_number = st.number_input(f"Page (of {page_count}):", min_value=1, max_value=page_count, value=1)
     
+    page_rows = bookings_table.page(page_number - 1, page_size)
+    booking_data = [{
+        "Booking ID": booking_id,
+        "Customer": format_customer(cinema.customers.get(booking_id) or ()),
+        "Number of Seats": len(seats),
+        "Seats": bookings_table.seat_labels(seats)
+    } for booking_id, seats in page_rows]
+    
+    # pandas is only needed here, so it is not imported on every script run
+    import pandas as pd
     df = pd.DataFrame(booking_data)
     st.dataframe(df, use_container_width=True)
     
-    # Check specific booking
+    # Check specific booking, found by booking id prefix, customer details or picked from this page
     st.markdown('<h3 style="color: #ffd700;">Check Specific Booking</h3>', unsafe_allow_html=True)
-    booking_id = st.selectbox("Select Booking ID:", list(cinema.bookings.keys()))
+    query = st.text_input("Search by Booking ID, customer name, email or phone:", placeholder="e.g., BK00").strip()
+    if query:
+        booking_ids = bookings_table.search(query.upper()) or cinema.find_bookings(query)
+        if not booking_ids:
+            st.info(f"No bookings found for {query}.")
+            return
+    else:
+        booking_ids = [booking_id for booking_id, _ in page_rows]
+    booking_id = st.selectbox("Select Booking ID:", booking_ids)
     
     if booking_id:
         # Display seating map with this booking highlighted
@@ -335,26 +451,26 @@ def check_bookings_page():
         st.markdown(f'<div class="seat-grid">{seating_map}</div>', unsafe_allow_html=True)
         
         # Booking details
-        seats = cinema.bookings[booking_id]
-        seat_list = []
-        for row_index, col_index in seats:
-            row_letter = cinema.get_row_letter(row_index)
-            seat_list.append(f"{row_letter}{col_index + 1}")
+        seats = cinema.bookings.get(booking_id)
+        if seats is None:
+            st.info(f"Booking {booking_id} was just cancelled.")
+            return
         
         st.markdown(f"""
         <div class="booking-info">
         <h4>Booking Details</h4>
         <strong>Booking ID:</strong> {booking_id}<br>
+        <strong>Customer:</strong> {html.escape(format_customer(cinema.customers.get(booking_id) or ())) or "-"}<br>
         <strong>Movie:</strong> {cinema.title}<br>
         <strong>Number of Seats:</strong> {len(seats)}<br>
-        <strong>Seats:</strong> {', '.join(seat_list)}
+        <strong>Seats:</strong> {bookings_table.seat_labels(seats)}
         </div>
         """, unsafe_allow_html=True)
         
         # Cancel booking option
         st.markdown('<h3 style="color: #ff6b6b;">Cancel Booking</h3>', unsafe_allow_html=True)
         if st.button(f"Cancel Booking {booking_id}", type="secondary"):
-            if cinema.cancel_booking(booking_id):
+            if cinema.cancel_booking(booking_id, idempotency_key=f"cancel-{booking_id}"):
                 st.success(f"Booking {booking_id} has been cancelled successfully!")
                 st.rerun()
             else:
@@ -365,7 +481,7 @@ def main():
     init_session_state()
     
     # Route to appropriate page
-    if st.session_state.page == 'setup' or st.session_state.cinema is None:
+    if st.session_state.page == 'setup' or get_shared_cinema().cinema is None:
         cinema_setup_page()
     elif st.session_state.page == 'main':
         main_menu_page()
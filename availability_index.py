@@ -0,0 +1,129 @@
+"""
+Availability summaries of many screenings, for searching across them.
+"""
+import threading
+from collections import namedtuple
+
+# Seats of a screening the general allocators can hand out: in total, in
+# the largest block of adjacent seats, and per zone
+ScreeningSummary = namedtuple("ScreeningSummary", ["free", "largest_block", "zone_free"])
+
+
+class AvailabilityIndex:
+    """
+    Per-screening availability summaries, kept up to date on every booking,
+    cancellation and hold through cinema listeners.
+
+    Each screening keeps per-row free counts, per-zone free counts and
+    largest blocks. A change only re-reads the rows it touched, from the
+    cinema's free seat masks and free run index, and adjusts the totals by
+    the difference. Summaries are updated under the cinema lock as part of
+    the change itself, so a search is a comparison against each summary and
+    never runs an allocator. Wheelchair spaces are left out, as the general
+    allocators do not hand them out.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cinemas = {}
+        self._listeners = {}
+        self._rows = {}
+        self._summaries = {}
+
+    def __len__(self):
+        return len(self._cinemas)
+
+    def __contains__(self, key):
+        return key in self._cinemas
+
+    def add(self, cinema, key):
+        """
+        Start indexing a screening under `key` and return the key. Showings of
+        the same film share a title, so each needs its own key, e.g. its start
+        time.
+        """
+        with self._lock:
+            if key in self._cinemas:
+                raise ValueError(f"Screening '{key}' is already indexed")
+
+            def on_seat_change(event, booking_id, seats):
+                self._update(key, cinema, {row_index for row_index, _ in seats})
+
+            with cinema.lock:
+                self._cinemas[key] = cinema
+                self._listeners[key] = on_seat_change
+                self._rows[key] = ([0] * cinema.rows, [0] * cinema.rows,
+                                   {zone: [0] * cinema.rows for zone in cinema.zones.names})
+                self._summaries[key] = ScreeningSummary(0, 0, dict.fromkeys(cinema.zones.names, 0))
+                self._update(key, cinema, range(cinema.rows))
+                cinema.add_listener(on_seat_change)
+        return key
+
+    def remove(self, key):
+        """
+        Stop indexing a screening. Return False if it was not indexed.
+        """
+        with self._lock:
+            cinema = self._cinemas.pop(key, None)
+            if cinema is None:
+                return False
+            with cinema.lock:
+                cinema.remove_listener(self._listeners.pop(key))
+                del self._rows[key]
+                del self._summaries[key]
+        return True
+
+    def close(self):
+        """
+        Stop following every indexed screening.
+        """
+        for key in list(self._cinemas):
+            self.remove(key)
+
+    def _update(self, key, cinema, row_indexes):
+        # Called with the cinema lock held, after the change was applied
+        row_free, row_blocks, row_zone_free = self._rows[key]
+        free, _, zone_free = self._summaries[key]
+        zone_free = dict(zone_free)
+
+        for row_index in row_indexes:
+            free_mask = cinema.free_masks[row_index] & cinema.layout.general_masks[row_index]
+            count = bin(free_mask).count("1")
+            free += count - row_free[row_index]
+            row_free[row_index] = count
+            row_blocks[row_index] = cinema.free_runs.largest_run(row_index)
+
+            for zone, zone_rows in row_zone_free.items():
+                count = bin(free_mask & cinema.zones.masks[zone][row_index]).count("1")
+                zone_free[zone] += count - zone_rows[row_index]
+                zone_rows[row_index] = count
+
+        self._summaries[key] = ScreeningSummary(free, max(row_blocks, default=0), zone_free)
+
+    def summary(self, key):
+        """
+        Return the ScreeningSummary of an indexed screening.
+        """
+        return self._summaries[key]
+
+    def search(self, num_tickets, together=False, zone=None):
+        """
+        Return the keys of screenings that can seat `num_tickets` now, in the
+        order they were added. With `together`, the party must fit in one
+        block of adjacent seats; with `zone`, in that zone.
+        """
+        if num_tickets <= 0:
+            raise ValueError("Number of tickets must be positive")
+        if together and zone is not None:
+            raise ValueError("Searching for seats together within a zone is not supported")
+
+        matches = []
+        for key, summary in list(self._summaries.items()):
+            if together:
+                available = summary.largest_block
+            elif zone is not None:
+                available = summary.zone_free.get(zone, 0)
+            else:
+                available = summary.free
+            if available >= num_tickets:
+                matches.append(key)
+        return matches
@@ -0,0 +1,84 @@
+"""
+Differential run of an alternative allocation engine against the current
+Cinema allocators, timing both and printing a minimized reproduction of
+the first divergence.
+
+Engines: `naive` (plain reading of the rules), `scoring` (ScoringAllocator
+with the default profile, default requests without a zone only), or any
+`module:callable` taking `(cinema, request)`.
+
+Usage: python benchmarks/bench_allocator_diff.py [--engine naive] [--cases 1000000] [--seed 0]
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from allocator_diff import (REQUEST_DEFAULT, UNSUPPORTED, diverges, format_reproduction, naive_engine,
+                            run_differential)
+from seat_scoring import PROFILE_DEFAULT, ScoringAllocator
+
+
+class ScoringEngine:
+    """
+    ScoringAllocator with the default profile, built once per cinema.
+    """
+    def __init__(self):
+        self._cinema = None
+        self._allocator = None
+
+    def __call__(self, cinema, request):
+        if request.kind != REQUEST_DEFAULT or request.zone is not None:
+            return UNSUPPORTED
+        if cinema is not self._cinema:
+            if self._allocator is not None:
+                self._allocator.close()
+            self._cinema = cinema
+            self._allocator = ScoringAllocator(cinema, PROFILE_DEFAULT)
+        return self._allocator.allocate(request.num_tickets)
+
+
+def load_engine(name):
+    if name == "naive":
+        return naive_engine
+    if name == "scoring":
+        return ScoringEngine()
+    module_name, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential test of a seat allocation engine")
+    parser.add_argument("--engine", default="naive", help="naive, scoring or module:callable")
+    parser.add_argument("--cases", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    result = run_differential(load_engine(args.engine), args.cases, args.seed)
+    elapsed = time.perf_counter() - start_time
+
+    compared = result.cases - result.skipped
+    print(f"{result.cases:,} cases ({result.skipped:,} unsupported by the engine) in {elapsed:.1f}s")
+    if compared:
+        print(f"reference: {result.reference_time / compared * 1e6:8.1f} us/request")
+        print(f"{args.engine}: {result.candidate_time / compared * 1e6:8.1f} us/request "
+              f"({result.reference_time / result.candidate_time:.2f}x reference speed)")
+
+    if result.divergence is None:
+        print("No divergence found")
+        return
+
+    divergence = result.divergence
+    print(f"\nDivergence at case {result.cases:,}:")
+    print(f"  reference: {divergence.expected!r}\n  {args.engine}: {divergence.actual!r}")
+    print("\nMinimized reproduction:")
+    print(format_reproduction(divergence.minimized, *diverges(divergence.minimized, load_engine(args.engine))))
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark searching hundreds of screenings for seats with the availability
+index against running the allocator on every screening.
+
+Usage: python benchmarks/bench_availability_index.py
+"""
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from availability_index import AvailabilityIndex
+from cinema import Cinema
+
+NUM_SCREENINGS = 500
+ROWS = 15
+SEATS_PER_ROW = 20
+SEARCHES = 200
+
+
+def nearly_sold(seed):
+    # Scattered single bookings until 85-99% of the hall is taken
+    rng = random.Random(seed)
+    cinema = Cinema(f"Screening {seed}", ROWS, SEATS_PER_ROW)
+    free = [(row_index, col_index) for row_index in range(ROWS) for col_index in range(SEATS_PER_ROW)]
+    rng.shuffle(free)
+    taken = free[:int(len(free) * rng.uniform(0.85, 0.99))]
+    cinema.book_seats(taken, cinema.generate_booking_id())
+    return cinema
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+
+    screenings = [nearly_sold(seed) for seed in range(NUM_SCREENINGS)]
+    index = AvailabilityIndex()
+    for screening in screenings:
+        index.add(screening, screening.title)
+
+    print(f"{NUM_SCREENINGS} nearly sold {ROWS}x{SEATS_PER_ROW} screenings, {SEARCHES} searches per case")
+    print(f"{'party':>6} {'matches':>8} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for num_tickets, together in ((2, True), (4, True), (6, True), (6, False), (20, False)):
+        allocate = ((lambda cinema: cinema.allocate_contiguous_seats(num_tickets)) if together
+                    else (lambda cinema: cinema.allocate_default_seats(num_tickets)))
+
+        start_time = time.perf_counter()
+        for _ in range(SEARCHES):
+            scanned = [screening.title for screening in screenings if allocate(screening) is not None]
+        scan_time = (time.perf_counter() - start_time) / SEARCHES
+
+        start_time = time.perf_counter()
+        for _ in range(SEARCHES):
+            found = index.search(num_tickets, together=together)
+        index_time = (time.perf_counter() - start_time) / SEARCHES
+
+        assert found == scanned
+        label = f"{num_tickets}{' together' if together else ''}"
+        print(f"{label:>6} {len(found):>8} {scan_time * 1000:>9.2f} {index_time * 1000:>9.2f} "
+              f"{scan_time / index_time:>7.1f}x")
+
+    # Cost the index adds to every booking and cancellation
+    cinema = screenings[0]
+    seat = next((row_index, col_index) for row_index in range(ROWS) for col_index in range(SEATS_PER_ROW)
+                if cinema.is_seat_available(row_index, col_index))
+    for label in ("with index", "without index"):
+        start_time = time.perf_counter()
+        for _ in range(10000):
+            cinema.book_seats([seat], "BK9999")
+            cinema.cancel_booking("BK9999")
+        print(f"book + cancel {label}: {(time.perf_counter() - start_time) / 10000 * 1e6:.1f} us")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
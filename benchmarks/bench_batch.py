@@ -0,0 +1,65 @@
+"""
+Benchmark batch mode on 100k booking, lookup and cancel commands.
+
+Usage: python benchmarks/bench_batch.py
+"""
+import io
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import run_batch, run_batch_command
+
+NUM_COMMANDS = 100000
+
+
+def build_commands(num_commands, seed=1):
+    # Replay the commands on a scratch cinema so cancels and lookups only
+    # name bookings that exist at that point of the batch
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(seed)
+    commands = ["create Benchmark 26 50"]
+    cinema, _ = run_batch_command(None, "create", commands[0].split()[1:])
+    live = []
+    while len(commands) <= num_commands:
+        choice = rng.random()
+        if live and (choice < 0.3 or len(live) > 150):
+            command = f"cancel {live.pop(rng.randrange(len(live)))}"
+        elif live and choice < 0.5:
+            command = f"lookup {rng.choice(live)}"
+        elif choice < 0.75:
+            command = f"book {rng.randint(1, 6)}"
+        else:
+            row_letter = chr(ord("A") + rng.randrange(26))
+            command = f"book-from {rng.randint(1, 6)} {row_letter}{rng.randint(1, 50)}"
+
+        parts = command.split()
+        try:
+            _, result = run_batch_command(cinema, parts[0], parts[1:])
+        except ValueError:
+            continue
+        if parts[0].startswith("book"):
+            live.append(result.split()[1])
+        commands.append(command)
+    logging.disable(logging.NOTSET)
+    return commands
+
+
+def main():
+    commands = build_commands(NUM_COMMANDS)
+    out = io.StringIO()
+
+    start_time = time.perf_counter()
+    errors = run_batch(commands, out)
+    elapsed = time.perf_counter() - start_time
+
+    print(out.getvalue().splitlines()[-1])
+    print(f"{len(commands)} commands, {errors} errors, {elapsed:.2f}s total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark customer lookups with the secondary indexes against scanning
+every booking, on a screening with thousands of bookings.
+
+Usage: python benchmarks/bench_customer_index.py
+"""
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from customer_index import Customer, guess_field, normalize
+
+NUM_LOOKUPS = 2000
+FIRST_NAMES = ["Jane", "John", "Amir", "Mei", "Olga", "Kwame", "Lucia", "Ravi", "Sofia", "Tom"]
+LAST_NAMES = ["Doe", "Smith", "Okafor", "Chen", "Novak", "Garcia", "Patel", "Rossi", "Kim", "Brown"]
+
+
+def random_customer(rng, number):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return Customer(f"{first} {last}", f"{first}.{last}{number}@example.com".lower(),
+                    f"07700 {rng.randrange(10 ** 6):06d}")
+
+
+def scan(cinema, query, limit=20):
+    # The same matches without indexes: normalize every booking's customer
+    field = guess_field(query)
+    key = normalize(field, query)
+    exact, prefix = [], []
+    for booking_id in cinema.bookings:
+        customer = cinema.customers.get(booking_id)
+        value = customer and getattr(customer, field)
+        if not value:
+            continue
+        value = normalize(field, value)
+        words = value.split(" ") if field == "name" else [value]
+        if value == key:
+            exact.append(booking_id)
+        elif any(" ".join(words[start:]).startswith(key) for start in range(len(words))):
+            prefix.append(booking_id)
+    return (exact + prefix)[:limit]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+    cinema = Cinema("Customers", MAX_ROWS, MAX_SEATS_PER_ROW)
+
+    start_time = time.perf_counter()
+    customers = []
+    while cinema.available_seats:
+        customer = random_customer(rng, len(customers))
+        seats = cinema.allocate_default_seats(min(rng.choice((1, 1, 2)), cinema.available_seats))
+        cinema.book_seats(seats, cinema.generate_booking_id(), customer)
+        customers.append(customer)
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(cinema.bookings):,} bookings with customers in {elapsed * 1000:.0f}ms "
+          f"({elapsed / len(cinema.bookings) * 1e6:.1f}us per booking)")
+
+    queries = []
+    for _ in range(NUM_LOOKUPS):
+        customer = rng.choice(customers)
+        queries.append(rng.choice([customer.name, customer.email, customer.phone,
+                                   customer.name.split()[1][:3], customer.phone[:8]]))
+
+    timings = {}
+    for label, lookup in (("indexed", cinema.find_bookings), ("scan", lambda query: scan(cinema, query))):
+        start_time = time.perf_counter()
+        found = sum(len(lookup(query)) for query in queries)
+        timings[label] = time.perf_counter() - start_time
+        print(f"{label:>8}: {timings[label] / NUM_LOOKUPS * 1e6:9.1f}us per lookup ({found:,} matches)")
+    print(f"Indexed lookups are {timings['scan'] / timings['indexed']:.0f}x faster")
+
+    start_time = time.perf_counter()
+    booking_ids = list(cinema.bookings)
+    for booking_id in booking_ids:
+        cinema.cancel_booking(booking_id)
+    elapsed = time.perf_counter() - start_time
+    print(f"Cancelled every booking in {elapsed * 1000:.0f}ms, {len(cinema.customers)} customers left indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark booking throughput with 100 event stream subscribers attached.
+
+Usage: python benchmarks/bench_event_stream.py
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from event_stream import OVERFLOW_BLOCK, OVERFLOW_DISCONNECT, OVERFLOW_DROP_OLDEST, EventStream
+
+NUM_SUBSCRIBERS = 100
+NUM_OPERATIONS = 20000
+
+
+def publish(cinema):
+    # Book and cancel pairs of seats, two events per round
+    start_time = time.perf_counter()
+    for _ in range(NUM_OPERATIONS // 2):
+        seats = cinema.allocate_default_seats(2)
+        booking_id = cinema.book_seats(seats, cinema.generate_booking_id())
+        cinema.cancel_booking(booking_id)
+    return time.perf_counter() - start_time
+
+
+def drain(subscription):
+    for _ in subscription:
+        pass
+
+
+def run(name, policies, reading):
+    cinema = Cinema("Benchmark", MAX_ROWS, MAX_SEATS_PER_ROW)
+    stream = EventStream(cinema) if policies else None
+    subscriptions = [stream.subscribe(max_size=100, overflow=policies[index % len(policies)])
+                     for index in range(NUM_SUBSCRIBERS)] if policies else []
+    readers = [threading.Thread(target=drain, args=(subscription,)) for subscription in subscriptions
+               if reading]
+    for reader in readers:
+        reader.start()
+
+    publish_time = publish(cinema)
+    start_time = time.perf_counter()
+    if stream is not None:
+        stream.close()
+    for reader in readers:
+        reader.join()
+    delivery_time = time.perf_counter() - start_time
+
+    dropped = sum(subscription.dropped for subscription in subscriptions)
+    disconnected = sum(subscription.disconnected for subscription in subscriptions)
+    print(f"{name:<34} publish {NUM_OPERATIONS / publish_time:>8.0f} events/s, "
+          f"delivery backlog {delivery_time:5.2f}s, dropped {dropped}, disconnected {disconnected}")
+
+
+def main():
+    # Logging on every booking would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    print(f"{NUM_OPERATIONS} book/cancel events, {NUM_SUBSCRIBERS} subscribers with queues of 100")
+    run("no subscribers", None, False)
+    run("drop-oldest, readers", [OVERFLOW_DROP_OLDEST], True)
+    run("mixed policies, readers", [OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK, OVERFLOW_DISCONNECT], True)
+    run("drop-oldest/disconnect, no readers", [OVERFLOW_DROP_OLDEST, OVERFLOW_DISCONNECT], False)
+    run("block, no readers", [OVERFLOW_BLOCK], False)
+
+
+if __name__ == "__main__":
+    main()
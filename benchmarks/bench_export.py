@@ -0,0 +1,66 @@
+"""
+Benchmark streaming exports of a million bookings across many screenings.
+
+Usage: python benchmarks/bench_export.py
+"""
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from booking_export import BOOKING_FIELDS, export_bookings, iter_booking_records, write_parquet
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+
+NUM_SCREENINGS = 1000
+BOOKINGS_PER_SCREENING = 1000
+
+
+def full_screenings():
+    cinemas = []
+    for index in range(NUM_SCREENINGS):
+        cinema = Cinema(f"Screening {index + 1}", MAX_ROWS, MAX_SEATS_PER_ROW)
+        for seat_index in range(BOOKINGS_PER_SCREENING):
+            seat = divmod(seat_index, MAX_SEATS_PER_ROW)
+            cinema.book_seats([seat], cinema.generate_booking_id())
+        cinemas.append(cinema)
+    return cinemas
+
+
+def measure(name, export):
+    start_time = time.perf_counter()
+    count = export()
+    elapsed = time.perf_counter() - start_time
+    print(f"{name:>8}: {count} records in {elapsed:.2f}s ({count / elapsed:.0f} records/s)")
+
+
+def main():
+    # Logging on every booking would dominate the setup
+    logging.disable(logging.CRITICAL)
+
+    print(f"Building {NUM_SCREENINGS} screenings with {BOOKINGS_PER_SCREENING} bookings each...")
+    cinemas = full_screenings()
+    setup_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for output_format in ("csv", "jsonl"):
+            path = os.path.join(tmp, f"bookings.{output_format}")
+            with open(path, "w", newline="") as f:
+                measure(output_format, lambda: export_bookings(cinemas, f, output_format))
+
+        try:
+            measure("parquet", lambda: write_parquet(iter_booking_records(cinemas),
+                                                     os.path.join(tmp, "bookings.parquet"), BOOKING_FIELDS))
+        except ImportError as e:
+            print(f" parquet: skipped ({e})")
+
+    # Peak RSS only grows if an export held records in memory
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"Peak RSS growth during exports: {(peak_rss - setup_rss) / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
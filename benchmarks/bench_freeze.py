@@ -0,0 +1,62 @@
+"""
+Benchmark memory use of many idle screenings, live and frozen.
+
+Usage: python benchmarks/bench_freeze.py
+"""
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema
+
+NUM_SCREENINGS = 20000
+ROWS = 15
+SEATS_PER_ROW = 20
+
+
+def half_sold(seed):
+    # Random parties of 1-4 until about half the hall is booked
+    rng = random.Random(seed)
+    cinema = Cinema(f"Screening {seed}", ROWS, SEATS_PER_ROW)
+    while cinema.available_seats > ROWS * SEATS_PER_ROW // 2:
+        seats = cinema.allocate_default_seats(rng.randint(1, 4))
+        cinema.book_seats(seats, cinema.generate_booking_id())
+    return cinema
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+
+    sample = half_sold(0)
+    live_size = sample.memory_footprint()["total"]
+    frozen_size = sample.freeze().memory_footprint()["total"]
+    print(f"One half-sold {ROWS}x{SEATS_PER_ROW} screening: {live_size:,} bytes live, "
+          f"{frozen_size:,} bytes frozen ({live_size / frozen_size:.1f}x smaller)")
+
+    # 100 distinct sales, each frozen repeatedly into separate snapshots
+    screenings = [half_sold(seed) for seed in range(100)]
+    start_time = time.perf_counter()
+    frozen = [screenings[index % len(screenings)].freeze() for index in range(NUM_SCREENINGS)]
+    elapsed = time.perf_counter() - start_time
+    total = sum(screening.memory_footprint()["total"] for screening in frozen)
+    print(f"{NUM_SCREENINGS:,} frozen screenings: {total / 2 ** 20:.1f} MiB "
+          f"(vs {live_size * NUM_SCREENINGS / 2 ** 20:.1f} MiB live), frozen in {elapsed:.1f}s")
+
+    start_time = time.perf_counter()
+    lookups = sum(screening.is_seat_available(ROWS - 1, SEATS_PER_ROW // 2)
+                  + (screening.get_booking("BK0010") is not None) for screening in frozen)
+    elapsed = time.perf_counter() - start_time
+    print(f"{2 * NUM_SCREENINGS:,} frozen queries in {elapsed * 1000:.0f}ms ({lookups} hits)")
+
+    start_time = time.perf_counter()
+    for screening in frozen[:1000]:
+        screening.thaw()
+    print(f"Thaw: {(time.perf_counter() - start_time):.3f}ms per screening")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the group allocator against allocate_default_seats: rows spanned,
+blocks of adjacent seats and latency across group sizes.
+
+Usage: python benchmarks/bench_group_allocator.py
+"""
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema
+from group_allocator import count_blocks, plan_group_seats, rows_spanned
+
+ROWS = 20
+SEATS_PER_ROW = 30
+HALLS = 30
+GROUP_SIZES = (2, 4, 8, 12, 20, 30, 50)
+
+
+def partly_sold(seed):
+    # Parties of 1-6 booked at random positions until the fill level is reached
+    rng = random.Random(seed)
+    cinema = Cinema("Benchmark", ROWS, SEATS_PER_ROW)
+    target = cinema.total_seats * rng.choice((0.3, 0.6, 0.85))
+    while cinema.total_seats - cinema.available_seats < target:
+        seats = cinema.allocate_seats_from_position(rng.randint(1, 6), rng.randrange(ROWS),
+                                                    rng.randrange(SEATS_PER_ROW))
+        if seats:
+            cinema.book_seats(seats, cinema.generate_booking_id())
+    return cinema
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    halls = [partly_sold(seed) for seed in range(HALLS)]
+
+    print(f"{HALLS} halls of {ROWS}x{SEATS_PER_ROW}, 30-85% sold")
+    print(f"{'group':>6} | {'rows default':>12} {'rows group':>10} | {'blocks default':>14} {'blocks group':>12} | "
+          f"{'default ms':>10} {'group p50 ms':>12} {'group max ms':>12} {'fallbacks':>9}")
+    for num_tickets in GROUP_SIZES:
+        default_rows, default_blocks, default_times = [], [], []
+        group_rows, group_blocks, group_times = [], [], []
+        fallbacks = 0
+        for cinema in halls:
+            start_time = time.perf_counter()
+            default_seats = cinema.allocate_default_seats(num_tickets)
+            default_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            plan = plan_group_seats(cinema, num_tickets)
+            group_times.append(time.perf_counter() - start_time)
+            if default_seats is None or plan is None:
+                continue
+
+            default_rows.append(rows_spanned(default_seats))
+            default_blocks.append(count_blocks(default_seats))
+            group_rows.append(plan.rows_spanned)
+            group_blocks.append(plan.blocks)
+            fallbacks += plan.fallback
+
+        print(f"{num_tickets:>6} | {statistics.mean(default_rows):>12.2f} {statistics.mean(group_rows):>10.2f} | "
+              f"{statistics.mean(default_blocks):>14.2f} {statistics.mean(group_blocks):>12.2f} | "
+              f"{statistics.mean(default_times) * 1000:>10.3f} {statistics.median(group_times) * 1000:>12.3f} "
+              f"{max(group_times) * 1000:>12.3f} {fallbacks:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark idempotent retries and the idempotency cache under sustained load.
+
+Usage: python benchmarks/bench_idempotency.py
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from frozen_cinema import deep_sizeof
+from idempotency import IdempotencyCache
+
+NUM_REQUESTS = 200000
+MAX_KEYS = 10000
+PARTY_SIZE = 4
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    cinema = Cinema("Idempotency", MAX_ROWS, MAX_SEATS_PER_ROW)
+    cinema.idempotency = IdempotencyCache(max_keys=MAX_KEYS)
+
+    # Every request books a party and cancels it, each under its own key,
+    # then both are retried as a client would after a timeout
+    first_time = retry_time = 0.0
+    peak_keys = 0
+    for request in range(NUM_REQUESTS):
+        seats = cinema.allocate_default_seats(PARTY_SIZE)
+        booking_id = f"BK{request:07d}"
+
+        start_time = time.perf_counter()
+        cinema.book_seats(seats, booking_id, idempotency_key=f"book-{request}")
+        cinema.cancel_booking(booking_id, idempotency_key=f"cancel-{request}")
+        first_time += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        cinema.book_seats(seats, booking_id, idempotency_key=f"book-{request}")
+        cinema.cancel_booking(booking_id, idempotency_key=f"cancel-{request}")
+        retry_time += time.perf_counter() - start_time
+
+        peak_keys = max(peak_keys, len(cinema.idempotency))
+        if request in (MAX_KEYS, NUM_REQUESTS - 1):
+            print(f"after {request + 1:,} requests: {len(cinema.idempotency):,} keys, "
+                  f"{deep_sizeof(cinema.idempotency) / 2 ** 20:.1f} MiB")
+
+    operations = 2 * NUM_REQUESTS
+    print(f"first calls: {first_time / operations * 1e6:.1f}us per operation")
+    print(f"retries:     {retry_time / operations * 1e6:.1f}us per operation "
+          f"({first_time / retry_time:.1f}x faster), map untouched: {cinema.version == operations}")
+    print(f"peak keys {peak_keys:,} (limit {MAX_KEYS:,})")
+
+
+if __name__ == "__main__":
+    main()
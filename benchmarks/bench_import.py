@@ -0,0 +1,76 @@
+"""
+Benchmark bulk importing bookings against calling book_seats per booking.
+
+Usage: python benchmarks/bench_import.py
+"""
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+
+NUM_SCREENINGS = 200
+REPEATS = 3
+
+
+def season_tickets(seed):
+    # Parties of 1-4 adjacent seats filling the whole hall
+    rng = random.Random(seed)
+    bookings = []
+    for row_index in range(MAX_ROWS):
+        col_index = 0
+        while col_index < MAX_SEATS_PER_ROW:
+            size = min(rng.randint(1, 4), MAX_SEATS_PER_ROW - col_index)
+            seats = [(row_index, col) for col in range(col_index, col_index + size)]
+            bookings.append((f"BK{len(bookings) + 1:04d}", seats))
+            col_index += size
+    return bookings
+
+
+def run(load, cases):
+    # Best of a few runs, each into fresh cinemas
+    times = []
+    for _ in range(REPEATS):
+        cinemas = [Cinema("Benchmark", MAX_ROWS, MAX_SEATS_PER_ROW) for _ in cases]
+        start_time = time.perf_counter()
+        for cinema, bookings in zip(cinemas, cases):
+            load(cinema, bookings)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def book_each(cinema, bookings):
+    for booking_id, seats in bookings:
+        cinema.book_seats(seats, booking_id)
+
+
+def import_all(cinema, bookings):
+    cinema.import_bookings(bookings)
+
+
+def main():
+    cases = [season_tickets(seed) for seed in range(NUM_SCREENINGS)]
+    num_bookings = sum(len(bookings) for bookings in cases)
+    print(f"{NUM_SCREENINGS} screenings, {num_bookings} bookings filling {MAX_ROWS} x {MAX_SEATS_PER_ROW} halls")
+
+    # The main figure is with logging off, so it compares the booking work
+    # alone. Per-booking log lines add to the cost of the loop, so it is also
+    # measured with INFO logging as the CLI configures it, written to
+    # os.devnull here
+    Cinema("Setup", 1, 1)
+    with open(os.devnull, "w") as devnull:
+        for handler in logging.getLogger().handlers:
+            handler.setStream(devnull)
+
+        for label, level in (("logging off", logging.CRITICAL), ("logging on ", logging.NOTSET)):
+            logging.disable(level)
+            loop = run(book_each, cases)
+            bulk = run(import_all, cases)
+            print(f"{label}: book_seats loop {loop:.2f}s, import_bookings {bulk:.2f}s, speedup {loop / bulk:.1f}x")
+
+if __name__ == "__main__":
+    main()
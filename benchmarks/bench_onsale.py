@@ -0,0 +1,47 @@
+"""
+Simulate an on-sale rush of 50k virtual users against one full-size hall,
+then sweep arrival rate and think time.
+
+Usage: python benchmarks/bench_onsale.py [--users 50000] [--seed 0] [--no-sweep]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from onsale_simulator import SimulationConfig, format_report, simulate
+
+ARRIVAL_RATES = (100.0, 500.0, 2000.0)
+THINK_TIMES = (5.0, 20.0, 60.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="On-sale rush simulation")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-sweep", action="store_true", help="only run the default configuration")
+    args = parser.parse_args()
+
+    config = SimulationConfig(users=args.users)
+    print(format_report(simulate(config, args.seed)))
+    if args.no_sweep:
+        return
+
+    print(f"\n{'arrivals/s':>10} {'think s':>8} {'sold out s':>10} {'conflicts':>9} {'retries':>8} "
+          f"{'p50 book s':>10} {'p99 book s':>10} {'engine p99 us':>13} {'run s':>6}")
+    start_time = time.perf_counter()
+    for arrival_rate in ARRIVAL_RATES:
+        for think_time in THINK_TIMES:
+            report = simulate(config._replace(arrival_rate=arrival_rate, think_time=think_time), args.seed)
+            conflict_rate = report.conflicts / report.confirm_attempts if report.confirm_attempts else 0.0
+            sell_out = f"{report.sell_out_time:.1f}" if report.sell_out_time is not None else "-"
+            print(f"{arrival_rate:>10.0f} {think_time:>8.0f} {sell_out:>10} {conflict_rate:>9.1%} "
+                  f"{report.retries:>8} {report.session_percentiles[50]:>10.1f} {report.session_percentiles[99]:>10.1f} "
+                  f"{report.engine_percentiles[99] * 1e6:>13.0f} {report.wall_time:>6.2f}")
+    print(f"Sweep of {len(ARRIVAL_RATES) * len(THINK_TIMES)} runs took {time.perf_counter() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
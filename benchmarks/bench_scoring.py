@@ -0,0 +1,53 @@
+"""
+Benchmark the scoring allocator against allocate_default_seats on large halls.
+
+Usage: python benchmarks/bench_scoring.py
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from seat_scoring import PROFILE_DEFAULT, PROFILE_VIEWING, ScoringAllocator
+
+REPEATS = 2000
+
+
+def filled_cinema(fill_ratio, seed=1):
+    cinema = Cinema("Benchmark", MAX_ROWS, MAX_SEATS_PER_ROW)
+    rng = random.Random(seed)
+    seats = [(r, c) for r in range(cinema.rows) for c in range(cinema.seats_per_row)
+             if rng.random() < fill_ratio]
+    if seats:
+        cinema.book_seats(seats, cinema.generate_booking_id())
+    return cinema
+
+
+def main():
+    # Logging on every allocation would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    print(f"Hall: {MAX_ROWS} x {MAX_SEATS_PER_ROW}, {REPEATS} allocations per case")
+    print(f"{'fill':>6} {'tickets':>8} {'default us':>11} {'scored(default) us':>19} {'scored(viewing) us':>19}")
+    for fill_ratio in (0.0, 0.5, 0.9):
+        for num_tickets in (2, 8, 20):
+            cinema = filled_cinema(fill_ratio)
+            if num_tickets > cinema.available_seats:
+                continue
+            default_profile = ScoringAllocator(cinema, PROFILE_DEFAULT)
+            viewing_profile = ScoringAllocator(cinema, PROFILE_VIEWING)
+
+            baseline = timeit.timeit(lambda: cinema.allocate_default_seats(num_tickets), number=REPEATS)
+            scored_default = timeit.timeit(lambda: default_profile.allocate(num_tickets), number=REPEATS)
+            scored_viewing = timeit.timeit(lambda: viewing_profile.allocate(num_tickets), number=REPEATS)
+
+            print(f"{fill_ratio:>6.0%} {num_tickets:>8} {baseline / REPEATS * 1e6:>11.1f} "
+                  f"{scored_default / REPEATS * 1e6:>19.1f} {scored_viewing / REPEATS * 1e6:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
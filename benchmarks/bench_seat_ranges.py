@@ -0,0 +1,124 @@
+"""
+Benchmark booking memory and export size with seat ranges against one
+tuple per seat, on realistic booking mixes of a full-size hall.
+
+Usage: python benchmarks/bench_seat_ranges.py
+"""
+import gc
+import logging
+import os
+import random
+import sys
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from booking_export import export_bookings, write_jsonl
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from frozen_cinema import deep_sizeof
+from group_allocator import allocate_group_seats
+
+NUM_SCREENINGS = 20
+REPEATS = 9
+
+# Party sizes of each mix, and how seats are picked for them
+MIXES = {
+    "couples and families": ((1, 2, 2, 2, 3, 4, 4, 6), "default"),
+    "picked positions": ((1, 2, 2, 3, 4), "position"),
+    "school groups": ((8, 12, 20, 30), "group"),
+}
+
+
+def sold_out(rng, party_sizes, method):
+    cinema = Cinema("Ranges", MAX_ROWS, MAX_SEATS_PER_ROW)
+    while cinema.available_seats:
+        num_tickets = min(rng.choice(party_sizes), cinema.available_seats)
+        if method == "position":
+            seats = cinema.allocate_seats_from_position(num_tickets, rng.randrange(cinema.rows),
+                                                        rng.randrange(cinema.seats_per_row))
+        elif method == "group":
+            seats = allocate_group_seats(cinema, num_tickets)
+        else:
+            seats = cinema.allocate_default_seats(num_tickets)
+        if not seats:
+            seats = cinema.allocate_default_seats(num_tickets) or cinema.allocate_default_seats(1)
+        cinema.book_seats(seats, cinema.generate_booking_id())
+    return cinema
+
+
+def per_seat_bookings(cinemas):
+    # Each cinema's bookings as the seat lists they used to be stored as
+    return [(cinema, [(booking_id, list(seats)) for booking_id, seats in cinema.bookings.items()])
+            for cinema in cinemas]
+
+
+def iter_per_seat_records(screenings):
+    # The previous booking records, with one label per seat
+    for cinema, bookings in screenings:
+        row_letters = [cinema.get_row_letter(row_index) for row_index in range(cinema.rows)]
+        for booking_id, seats in bookings:
+            yield {
+                "screening": cinema.title,
+                "booking_id": booking_id,
+                "seats": [f"{row_letters[row_index]}{col_index + 1}" for row_index, col_index in seats],
+                "seat_count": len(seats),
+            }
+
+
+def best_exports(*writes):
+    # Best of a few runs of each writer, taking turns so noise hits them
+    # alike, returning each output and its time
+    outputs = [None] * len(writes)
+    times = [[] for _ in writes]
+    for _ in range(REPEATS):
+        for index, write in enumerate(writes):
+            gc.collect()
+            f = StringIO()
+            start_time = time.perf_counter()
+            write(f)
+            times[index].append(time.perf_counter() - start_time)
+            outputs[index] = f.getvalue()
+    return [(output, min(write_times)) for output, write_times in zip(outputs, times)]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+
+    print(f"{'mix':>22} {'bookings':>8} {'seats/run':>9} {'list KiB':>9} {'ranges KiB':>10} {'smaller':>7} "
+          f"{'per-seat JSONL KiB':>18} {'ranges JSONL KiB':>16} {'smaller':>7}")
+    for name, (party_sizes, method) in MIXES.items():
+        cinemas = [sold_out(rng, party_sizes, method) for _ in range(NUM_SCREENINGS)]
+        bookings = sum(len(cinema.bookings) for cinema in cinemas)
+        runs = sum(len(seats.ranges()) for cinema in cinemas for seats in cinema.bookings.values())
+        seats = sum(cinema.total_seats for cinema in cinemas)
+
+        ranges_size = sum(deep_sizeof(cinema.bookings) for cinema in cinemas)
+        list_size = sum(deep_sizeof({booking_id: list(seats) for booking_id, seats in cinema.bookings.items()})
+                        for cinema in cinemas)
+
+        screenings = per_seat_bookings(cinemas)
+        (ranges_export, ranges_time), (per_seat_export, per_seat_time) = best_exports(
+            lambda f: export_bookings(cinemas, f, "jsonl"),
+            lambda f: write_jsonl(iter_per_seat_records(screenings), f))
+        per_seat_size = len(per_seat_export)
+        ranges_size_export = len(ranges_export)
+
+        print(f"{name:>22} {bookings:>8} {seats / runs:>9.1f} {list_size / 1024:>9.0f} {ranges_size / 1024:>10.0f} "
+              f"{list_size / ranges_size:>6.1f}x {per_seat_size / 1024:>18.0f} {ranges_size_export / 1024:>16.0f} "
+              f"{per_seat_size / ranges_size_export:>6.1f}x  (export {per_seat_time * 1000:.0f}ms -> "
+              f"{ranges_time * 1000:.0f}ms)")
+
+    # Booking and cancelling a run at a time
+    cinema = Cinema("Ranges", MAX_ROWS, MAX_SEATS_PER_ROW)
+    start_time = time.perf_counter()
+    for _ in range(20000):
+        booking_id = cinema.book_seats(cinema.allocate_default_seats(4), cinema.generate_booking_id())
+        cinema.cancel_booking(booking_id)
+    elapsed = time.perf_counter() - start_time
+    print(f"\nBook and cancel 4 seats: {elapsed / 20000 * 1e6:.1f}us per pair")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark seat map reads from many processes: the shared memory view
+against copying the seating map over a pipe per request, while the writer
+keeps booking and cancelling.
+
+Usage: python benchmarks/bench_shared_availability.py
+"""
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cinema import Cinema, MAX_ROWS, MAX_SEATS_PER_ROW
+from shared_availability import SharedAvailability, SharedAvailabilityView
+
+READER_COUNTS = (1, 2, 4, 8)
+DURATION = 2.0
+
+
+def shared_reader(name, results):
+    # Whole-map snapshots; the writer only books pairs, so an odd number of
+    # free seats in a row would mean a torn read
+    view = SharedAvailabilityView(name)
+    reads = torn = 0
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        _, row_masks = view.snapshot()
+        torn += any(bin(row_mask).count("1") % 2 for row_mask in row_masks)
+        reads += 1
+    results.put((reads, torn, view.retries))
+    view.close()
+
+
+def pipe_reader(connection, results):
+    reads = 0
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        connection.send(None)
+        connection.recv()
+        reads += 1
+    connection.send("done")
+    results.put((reads, 0, 0))
+
+
+def serve_pipe(cinema, connection):
+    # One thread per reader, copying the seating map for every request
+    while connection.recv() != "done":
+        with cinema.lock:
+            connection.send(cinema.seating_map)
+
+
+def write(cinema, stop):
+    rng = random.Random(0)
+    writes = 0
+    while not stop.is_set():
+        row_index = rng.randrange(cinema.rows)
+        col_index = rng.randrange(0, cinema.seats_per_row, 2)
+        booking_id = f"BK{row_index:02d}{col_index:02d}"
+        if booking_id in cinema.bookings:
+            cinema.cancel_booking(booking_id)
+        else:
+            cinema.book_seats([(row_index, col_index), (row_index, col_index + 1)], booking_id)
+        writes += 1
+    return writes
+
+
+def run(readers, shared):
+    cinema = Cinema("Benchmark", MAX_ROWS, MAX_SEATS_PER_ROW)
+    publisher = SharedAvailability(cinema) if shared else None
+    results = multiprocessing.Queue()
+
+    processes, servers = [], []
+    for _ in range(readers):
+        if shared:
+            processes.append(multiprocessing.Process(target=shared_reader, args=(publisher.name, results)))
+        else:
+            parent_end, child_end = multiprocessing.Pipe()
+            processes.append(multiprocessing.Process(target=pipe_reader, args=(child_end, results)))
+            servers.append(threading.Thread(target=serve_pipe, args=(cinema, parent_end)))
+    for process in processes:
+        process.start()
+    for server in servers:
+        server.start()
+
+    stop = threading.Event()
+    writes = []
+    writer = threading.Thread(target=lambda: writes.append(write(cinema, stop)))
+    writer.start()
+
+    totals = [results.get() for _ in processes]
+    stop.set()
+    writer.join()
+    for process in processes:
+        process.join()
+    for server in servers:
+        server.join()
+    if publisher is not None:
+        publisher.close()
+
+    reads, torn, retries = (sum(column) for column in zip(*totals))
+    return reads / DURATION, torn, retries, writes[0] / DURATION
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"Hall: {MAX_ROWS} x {MAX_SEATS_PER_ROW}, {DURATION:.0f}s per run, {os.cpu_count()} CPUs")
+    print(f"{'readers':>7} {'mode':>7} {'map reads/s':>12} {'writes/s':>9} {'retries':>8} {'torn':>5}")
+    for readers in READER_COUNTS:
+        for shared in (True, False):
+            reads_per_second, torn, retries, writes_per_second = run(readers, shared)
+            print(f"{readers:>7} {'shared' if shared else 'pipe':>7} {reads_per_second:>12,.0f} "
+                  f"{writes_per_second:>9,.0f} {retries:>8} {torn:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark cold import time of the CLI and web entry points with
+`python -X importtime`, and fail when one exceeds its threshold.
+
+Usage: python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 7
+
+# Median cumulative import time allowed per entry point, in milliseconds.
+# app includes importing streamlit itself.
+THRESHOLDS_MS = {
+    "main": 60,
+    "app": 1500,
+}
+
+# Modules that must not be imported when an entry point loads
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy")
+
+
+def import_times(module):
+    """
+    Import `module` in a fresh interpreter and return `{name: (self_us, cumulative_us)}`,
+    or None if the import failed.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    failures = 0
+    for module, threshold_ms in THRESHOLDS_MS.items():
+        runs = [import_times(module) for _ in range(RUNS)]
+        if runs[0] is None:
+            print(f"{module}: skipped, import failed (missing dependencies?)")
+            continue
+
+        median_ms = statistics.median(times[module][1] for times in runs) / 1000
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[:5]
+        heavy = [name for name in HEAVY_MODULES if name in runs[-1]]
+
+        status = "OK" if median_ms <= threshold_ms and not heavy else "FAIL"
+        print(f"{module}: {median_ms:.1f}ms median over {RUNS} runs (threshold {threshold_ms}ms) {status}")
+        print("  slowest imports: " + ", ".join(f"{name} {self_us / 1000:.1f}ms" for name, (self_us, _) in slowest))
+        if heavy:
+            print(f"  heavy modules imported at startup: {', '.join(heavy)}")
+        if status == "FAIL":
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark an on-sale rush with and without a waiting room, and the cost of
+a queue check with 100k visitors waiting.
+
+Usage: python benchmarks/bench_waiting_room.py [--users 50000] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from onsale_simulator import SimulationConfig, simulate
+from waiting_room import WaitingRoom
+
+ADMISSION_RATES = (None, 50.0, 20.0, 5.0)
+MAX_ACTIVE = 100
+QUEUE_SIZE = 100000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="On-sale rush with a waiting room")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'admissions/s':>12} {'engine calls':>12} {'conflicts':>9} {'queue checks':>12} "
+          f"{'p50 wait s':>10} {'p99 wait s':>10} {'sold out s':>10} {'run s':>6}")
+    for admission_rate in ADMISSION_RATES:
+        config = SimulationConfig(users=args.users, admission_rate=admission_rate, max_active=MAX_ACTIVE)
+        report = simulate(config, args.seed)
+        conflict_rate = report.conflicts / report.confirm_attempts if report.confirm_attempts else 0.0
+        waits = report.wait_percentiles
+        label = "open" if admission_rate is None else f"{admission_rate:.0f}"
+        sell_out = f"{report.sell_out_time:.1f}" if report.sell_out_time is not None else "-"
+        print(f"{label:>12} {report.engine_calls:>12} {conflict_rate:>9.1%} "
+              f"{report.queue_checks:>12} {waits[50] or 0:>10.1f} {waits[99] or 0:>10.1f} {sell_out:>10} "
+              f"{report.wall_time:>6.2f}")
+
+    # Queue checks against a long queue, from the front, middle and back
+    room = WaitingRoom(rate=1.0, burst=1, max_active=1)
+    visitors = [f"visitor-{index}" for index in range(QUEUE_SIZE)]
+    for visitor_id in visitors:
+        room.enter(visitor_id)
+    start_time = time.perf_counter()
+    for visitor_id in visitors:
+        room.enter(visitor_id)
+    elapsed = time.perf_counter() - start_time
+    print(f"\n{QUEUE_SIZE:,} queue checks with {room.waiting:,} waiting: {elapsed / QUEUE_SIZE * 1e6:.2f}us per check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Streaming exports of bookings and seat states for one or more screenings.
+
+Records are produced by generators and written one at a time, reading
+bookings in chunks of `BOOKING_CHUNK_SIZE` and seats a row at a time, so
+memory use does not grow with the number of bookings. Exporting many
+screenings chains them into a single pass over all records.
+"""
+import csv
+import itertools
+import json
+import operator
+
+from hall_layout import NO_SEAT, SEAT_BLOCKED
+
+# Columns of each export, in output order
+BOOKING_FIELDS = ("screening", "booking_id", "seats", "seat_count")
+SEAT_FIELDS = ("screening", "seat", "row", "number", "seat_type", "zone", "status", "booking_id")
+
+SEAT_STATUS_FREE = "free"
+SEAT_STATUS_BOOKED = "booked"
+SEAT_STATUS_BLOCKED = "blocked"
+SEAT_STATUS_HELD = "held"
+
+# Bookings read from a cinema at a time while holding its lock
+BOOKING_CHUNK_SIZE = 1000
+
+# Rows handed to pandas at a time by the Parquet writer
+PARQUET_CHUNK_SIZE = 100000
+
+
+def iter_booking_chunks(cinema, chunk_size=BOOKING_CHUNK_SIZE):
+    """
+    Yield the `(booking_id, seats)` pairs of a cinema in booking order, in
+    lists of at most `chunk_size` copied under the cinema lock, so bookings
+    carry on between chunks.
+
+    Cancellations move later bookings forward and new bookings are added
+    at the end, so each chunk starts at the booking that followed the
+    previous chunk or, if that was cancelled, after the last booking of the
+    previous chunk still booked. Bookings made or cancelled while the export
+    runs may or may not be included, but none is repeated.
+    """
+    start = 0
+    previous_ids = []
+    next_id = None
+    while True:
+        with cinema.lock:
+            bookings = cinema.bookings
+            if next_id in bookings:
+                start = operator.indexOf(bookings, next_id)
+            else:
+                for booking_id in reversed(previous_ids):
+                    if booking_id in bookings:
+                        start = operator.indexOf(bookings, booking_id) + 1
+                        break
+            chunk = list(itertools.islice(bookings.items(), start, start + chunk_size + 1))
+        if not chunk:
+            return
+        # The extra booking only marks where the next chunk starts
+        next_id = chunk.pop()[0] if len(chunk) > chunk_size else None
+        yield chunk
+        if next_id is None:
+            return
+        previous_ids = [booking_id for booking_id, _ in chunk]
+
+
+def iter_booking_records(cinemas, chunk_size=BOOKING_CHUNK_SIZE):
+    """
+    Yield one record per booking of each cinema, in booking order. Seats
+    are labelled one run of adjacent seats at a time, such as `A4-A7`.
+    """
+    # Labels of runs by their packed bytes, shared by halls of the same size
+    # so each label is formatted once per export
+    run_labels_by_size = {}
+    for cinema in cinemas:
+        run_labels = run_labels_by_size.setdefault((cinema.rows, cinema.seats_per_row), {})
+        find_label = run_labels.get
+        row_letters = [cinema.get_row_letter(row_index) for row_index in range(cinema.rows)]
+        title = cinema.title
+        for chunk in iter_booking_chunks(cinema, chunk_size):
+            for booking_id, seats in chunk:
+                packed = seats.to_bytes()
+                if len(packed) == 3:
+                    # Most bookings are a single run
+                    labels = [find_label(packed) or _run_label(run_labels, row_letters, packed)]
+                    seat_count = packed[2]
+                else:
+                    labels = []
+                    for offset in range(0, len(packed), 3):
+                        run = packed[offset:offset + 3]
+                        labels.append(find_label(run) or _run_label(run_labels, row_letters, run))
+                    seat_count = sum(packed[2::3])
+                yield {
+                    "screening": title,
+                    "booking_id": booking_id,
+                    "seats": labels,
+                    "seat_count": seat_count,
+                }
+
+
+def _run_label(run_labels, row_letters, run):
+    # Format and remember the label of one packed run
+    row_index, start, length = run
+    row_letter = row_letters[row_index]
+    if length == 1:
+        label = f"{row_letter}{start + 1}"
+    else:
+        label = f"{row_letter}{start + 1}-{row_letter}{start + length}"
+    run_labels[run] = label
+    return label
+
+
+def iter_seat_records(cinemas):
+    """
+    Yield one record per seat of each cinema, front row first. Aisles and
+    gaps are not seats and are skipped.
+    """
+    for cinema in cinemas:
+        for row_index in range(cinema.rows):
+            with cinema.lock:
+                row_status = list(cinema.seating_map[row_index])
+                hold_ids = set(cinema.holds)
+
+            row_letter = cinema.get_row_letter(row_index)
+            for col_index, seat_status in enumerate(row_status):
+                seat_type = cinema.seat_type(row_index, col_index)
+                if seat_type == NO_SEAT:
+                    continue
+
+                if seat_type == SEAT_BLOCKED:
+                    status = SEAT_STATUS_BLOCKED
+                elif seat_status == '.':
+                    status = SEAT_STATUS_FREE
+                elif seat_status in hold_ids:
+                    status = SEAT_STATUS_HELD
+                else:
+                    status = SEAT_STATUS_BOOKED
+                yield {
+                    "screening": cinema.title,
+                    "seat": f"{row_letter}{col_index + 1}",
+                    "row": row_letter,
+                    "number": col_index + 1,
+                    "seat_type": seat_type,
+                    "zone": cinema.zones.zone_at(row_index, col_index),
+                    "status": status,
+                    "booking_id": seat_status if status in (SEAT_STATUS_BOOKED, SEAT_STATUS_HELD) else "",
+                }
+
+
+def write_csv(records, f, fields):
+    """
+    Write records as CSV with a header row and return the number of records.
+    List values are written space separated.
+    """
+    writer = csv.writer(f)
+    writer.writerow(fields)
+
+    count = 0
+    for record in records:
+        writer.writerow([" ".join(value) if isinstance(value, list) else value
+                         for value in (record[field] for field in fields)])
+        count += 1
+    return count
+
+
+def write_jsonl(records, f):
+    """
+    Write records as one JSON object per line and return the number of records.
+    """
+    count = 0
+    dumps = json.dumps
+    for record in records:
+        f.write(dumps(record))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_parquet(records, path, fields, chunk_size=PARQUET_CHUNK_SIZE):
+    """
+    Write records to a Parquet file in chunks of `chunk_size` rows and
+    return the number of records.
+
+    Needs pandas and its pyarrow Parquet engine, which are only imported
+    when this writer is used.
+    """
+    try:
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pandas with the pyarrow engine installed") from e
+
+    count = 0
+    writer = None
+    records = iter(records)
+    try:
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+
+            table = pa.Table.from_pandas(pd.DataFrame(chunk, columns=list(fields)), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def export_bookings(cinemas, f, output_format="csv"):
+    """
+    Export the bookings of all cinemas to an open text file in `csv` or
+    `jsonl` format and return the number of bookings written.
+    """
+    records = iter_booking_records(cinemas)
+    if output_format == "csv":
+        return write_csv(records, f, BOOKING_FIELDS)
+    if output_format == "jsonl":
+        return write_jsonl(records, f)
+    raise ValueError(f"Unknown export format '{output_format}'")
+
+
+def export_seats(cinemas, f, output_format="csv"):
+    """
+    Export the seat states of all cinemas to an open text file in `csv` or
+    `jsonl` format and return the number of seats written.
+    """
+    records = iter_seat_records(cinemas)
+    if output_format == "csv":
+        return write_csv(records, f, SEAT_FIELDS)
+    if output_format == "jsonl":
+        return write_jsonl(records, f)
+    raise ValueError(f"Unknown export format '{output_format}'")
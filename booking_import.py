@@ -0,0 +1,84 @@
+"""
+Bulk import of pre-existing bookings, such as season tickets, comps and
+group blocks, into a fresh cinema.
+
+The readers accept the booking formats written by `booking_export`, so an
+export of one screening can be loaded straight back into another.
+"""
+import csv
+import json
+
+from seat_ranges import SeatRanges, parse_range_label
+
+
+def read_bookings_csv(f):
+    """
+    Yield `(screening, booking_id, seat_labels)` from a bookings CSV file
+    with a header row and space separated seat or seat range labels.
+    """
+    for record in csv.DictReader(f):
+        yield record.get("screening"), record["booking_id"], record["seats"].split()
+
+
+def read_bookings_jsonl(f):
+    """
+    Yield `(screening, booking_id, seat_labels)` from a bookings JSONL file.
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        yield record.get("screening"), record["booking_id"], record["seats"]
+
+
+def parse_seat_label(cinema, label):
+    """
+    Convert a seat label such as `B5` to (row_index, col_index).
+    """
+    try:
+        col_number = int(label[1:])
+    except ValueError:
+        raise ValueError(f"Invalid seat label '{label}'") from None
+    return cinema.get_row_index(label[0]), col_number - 1
+
+
+def import_bookings(cinema, f, input_format="csv", screening=None):
+    """
+    Import the bookings in an open `csv` or `jsonl` bookings file into the
+    cinema and return the number imported. If `screening` is given, rows
+    of other screenings are skipped.
+    """
+    if input_format == "csv":
+        records = read_bookings_csv(f)
+    elif input_format == "jsonl":
+        records = read_bookings_jsonl(f)
+    else:
+        raise ValueError(f"Unknown import format '{input_format}'")
+
+    row_indexes = {cinema.get_row_letter(row_index): row_index for row_index in range(cinema.rows)}
+    bookings = []
+    for record_screening, booking_id, labels in records:
+        if screening is not None and record_screening != screening:
+            continue
+
+        # Runs of `(row_index, start, length)`, taken from range labels as
+        # they are rather than expanded to one seat at a time
+        runs = []
+        for label in labels:
+            row_index = row_indexes.get(label[:1].upper())
+            if row_index is not None and label[1:].isdigit():
+                runs.append((row_index, int(label[1:]) - 1, 1))
+            elif "-" in label:
+                # A run of adjacent seats such as A4-A7
+                row_letter, first_number, last_number = parse_range_label(label)
+                runs.append((cinema.get_row_index(row_letter), first_number - 1, last_number - first_number + 1))
+            else:
+                # Let the slow path produce the error message
+                runs.append(parse_seat_label(cinema, label) + (1,))
+        try:
+            seats = SeatRanges(runs)
+        except ValueError as e:
+            raise ValueError(f"Invalid seats in booking {booking_id}: {e}") from None
+        bookings.append((booking_id, seats))
+
+    return cinema.import_bookings(bookings)
@@ -0,0 +1,135 @@
+import bisect
+
+from cinema import EVENT_BOOK, EVENT_CANCEL
+from seat_ranges import range_labels
+
+
+class BookingsTable:
+    """
+    Bookings of a cinema in booking order, maintained incrementally.
+
+    Rows are appended when a booking is made and tombstoned when it is
+    cancelled, so nothing is rebuilt on a page render. A Fenwick tree over
+    the live rows finds the first row of any page in O(log n), and a sorted
+    list of booking ids answers prefix searches with a binary search.
+    """
+    def __init__(self, cinema):
+        self.cinema = cinema
+
+        self._rows = []
+        self._positions = {}
+        self._tree = [0]
+        self._sorted_ids = []
+        self.live_count = 0
+
+        for booking_id, seats in cinema.bookings.items():
+            self._append(booking_id, seats)
+
+        cinema.add_listener(self._on_seat_change)
+
+    def _on_seat_change(self, event, booking_id, seats):
+        if event == EVENT_BOOK:
+            self._append(booking_id, seats)
+        elif event == EVENT_CANCEL:
+            self._tombstone(booking_id)
+
+    def close(self):
+        """
+        Stop following bookings of the cinema.
+        """
+        self.cinema.remove_listener(self._on_seat_change)
+
+    def _append(self, booking_id, seats):
+        self._rows.append((booking_id, seats))
+        self._positions[booking_id] = len(self._rows) - 1
+
+        # Fenwick node i covers rows (i - lowbit(i), i]: the live rows already
+        # in that range plus the new one
+        i = len(self._rows)
+        self._tree.append(1 + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+
+        bisect.insort(self._sorted_ids, booking_id)
+        self.live_count += 1
+
+    def _tombstone(self, booking_id):
+        position = self._positions.pop(booking_id, None)
+        if position is None:
+            return
+        self._rows[position] = None
+
+        i = position + 1
+        while i < len(self._tree):
+            self._tree[i] -= 1
+            i += i & -i
+
+        del self._sorted_ids[bisect.bisect_left(self._sorted_ids, booking_id)]
+        self.live_count -= 1
+
+    def _prefix(self, i):
+        # Number of live rows among the first i rows
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _find_live(self, rank):
+        # Row position of the live row with the given 0-based rank
+        position = 0
+        remaining = rank + 1
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] < remaining:
+                position = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def page_count(self, page_size):
+        """
+        Return the number of pages of live bookings.
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        return max((self.live_count + page_size - 1) // page_size, 1)
+
+    def page(self, page_number, page_size):
+        """
+        Return the (booking_id, seats) rows of a 0-based page of live bookings,
+        in booking order.
+        """
+        if page_size <= 0:
+            raise ValueError("Page size must be positive")
+        if page_number < 0:
+            raise ValueError("Page number cannot be negative")
+
+        first_rank = page_number * page_size
+        if first_rank >= self.live_count:
+            return []
+
+        rows = []
+        position = self._find_live(first_rank)
+        while position < len(self._rows) and len(rows) < page_size:
+            if self._rows[position] is not None:
+                rows.append(self._rows[position])
+            position += 1
+        return rows
+
+    def search(self, prefix, limit=20):
+        """
+        Return up to `limit` live booking ids starting with `prefix`, in id order.
+        """
+        start = bisect.bisect_left(self._sorted_ids, prefix)
+        matches = []
+        for booking_id in self._sorted_ids[start:start + limit]:
+            if not booking_id.startswith(prefix):
+                break
+            matches.append(booking_id)
+        return matches
+
+    def seat_labels(self, seats):
+        """
+        Format seats as labels such as `A1-A4, B2`, one per run of adjacent seats.
+        """
+        return ", ".join(range_labels(self.cinema.get_row_letter, seats))
@@ -0,0 +1,57 @@
+from collections import deque
+
+# Number of seat deltas kept before the oldest are dropped
+DEFAULT_FEED_SIZE = 10000
+
+
+class ChangeFeed:
+    """
+    Bounded, ordered feed of seat-state deltas.
+
+    Each delta is a `(version, row_index, col_index, status)` tuple where
+    `status` is the new seating map value of the seat and `version` is the
+    cinema version the change produced. Versions never decrease, so readers
+    can ask for everything after the version they last saw.
+    """
+    def __init__(self, size=DEFAULT_FEED_SIZE):
+        self._deltas = deque(maxlen=size)
+
+        # Deltas up to and including this version may have been dropped
+        self.floor_version = 0
+
+    def record(self, version, seats, status):
+        """
+        Append one delta per seat, all tagged with the same version.
+        """
+        deltas = self._deltas
+        overflow = len(deltas) + len(seats) - deltas.maxlen
+        if overflow > 0:
+            # Version of the newest delta about to be dropped
+            self.floor_version = deltas[overflow - 1][0] if overflow <= len(deltas) else version
+        deltas.extend([(version, row_index, col_index, status) for row_index, col_index in seats])
+
+    def truncate(self, version):
+        """
+        Drop all deltas up to and including `version`, for changes too large
+        to be worth replaying. Readers behind it start over.
+        """
+        self._deltas.clear()
+        self.floor_version = version
+
+    def since(self, version):
+        """
+        Return the deltas with a version greater than `version`, oldest first.
+
+        Return None if some of them were already dropped, in which case the
+        reader has to start over from the full seating map.
+        """
+        if version < self.floor_version:
+            return None
+
+        changes = []
+        for delta in reversed(self._deltas):
+            if delta[0] <= version:
+                break
+            changes.append(delta)
+        changes.reverse()
+        return changes
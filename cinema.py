@@ -1,31 +1,179 @@
+import functools
 import logging
+import re
+import threading
+from operator import itemgetter
+
+from change_feed import ChangeFeed
+from customer_index import CustomerIndex
+from hall_layout import (FIXED_MARKERS, SEAT_COMPANION, SEAT_WHEELCHAIR, SEATING_MAP_MARKERS,
+                         HallLayout)
+from idempotency import IdempotencyCache
+from seat_index import FreeRunIndex
+from seat_ranges import SeatRanges
+from waitlist import Waitlist
+from zones import ZoneMap
 
 # Constants
 MAX_ROWS = 26
 MAX_SEATS_PER_ROW = 50
 ASCII_A = 65
 
+# Number of a `BKnnnn` booking id, in ids each preceded and followed by NUL
+BOOKING_NUMBER = re.compile(r"\0BK(\d+)(?=\0)")
+
+# Seat change events passed to listeners
+EVENT_BOOK = "book"
+EVENT_CANCEL = "cancel"
+EVENT_HOLD = "hold"
+EVENT_RELEASE = "release"
+
+
+class SeatConflictError(ValueError):
+    """
+    Raised when offered seats were taken by another booking before confirmation.
+    """
+    def __init__(self, seats, version):
+        super().__init__(f"{len(seats)} of the selected seats are no longer available")
+        self.seats = seats
+        self.version = version
+
+
+def synchronized(method):
+    """
+    Run a Cinema method while holding the cinema lock.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def idempotent(method):
+    """
+    Let callers pass an `idempotency_key` to a Cinema operation. The first
+    call runs the operation and stores its result, or the ValueError it
+    raised; retries with the same key get that outcome back without running
+    it again. Reusing a key with different arguments is an error.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, idempotency_key=None, **kwargs):
+        if idempotency_key is None:
+            return method(self, *args, **kwargs)
+
+        key = (method.__name__, idempotency_key)
+        request = (args, kwargs)
+        with self.lock:
+            stored = self.idempotency.get(key)
+            if stored is not None:
+                stored_request, (error, result) = stored
+                if stored_request != request:
+                    raise ValueError(f"Idempotency key {idempotency_key} was used for a different {method.__name__} request")
+                self.logger.info(f"Replayed {method.__name__} for idempotency key {idempotency_key}")
+                if error is not None:
+                    raise error
+                return result
+
+            try:
+                result = method(self, *args, **kwargs)
+            except ValueError as e:
+                self.idempotency.put(key, request, (e, None))
+                raise
+            self.idempotency.put(key, request, (None, result))
+            return result
+    return wrapper
+
+
 class Cinema:
     """
     Represents a cinema session with booking functionality and seating management.
+
+    The hall is a full rectangle of `rows` x `seats_per_row` seats unless a
+    `HallLayout` is given, in which case its dimensions and seat types are used.
+    Seats are split into pricing zones by `zones`, or the default tiers.
     """
-    def __init__(self, title, rows, seats_per_row):
+    def __init__(self, title, rows, seats_per_row, layout=None, zones=None):
         self.title = title
-        self.rows = min(rows, MAX_ROWS)
-        self.seats_per_row = min(seats_per_row, MAX_SEATS_PER_ROW)
 
-        self.total_seats = self.rows * self.seats_per_row
+        if layout is None:
+            layout = HallLayout.rectangle(min(rows, MAX_ROWS), min(seats_per_row, MAX_SEATS_PER_ROW))
+        elif layout.rows > MAX_ROWS or layout.seats_per_row > MAX_SEATS_PER_ROW:
+            raise ValueError(f"Layout exceeds the maximum of {MAX_ROWS} rows and {MAX_SEATS_PER_ROW} seats per row")
+
+        self.layout = layout
+        self.rows = layout.rows
+        self.seats_per_row = layout.seats_per_row
+
+        self.total_seats = layout.seat_count
         self.available_seats = self.total_seats
 
-        self.seating_map = [['.' for _ in range(self.seats_per_row)] for _ in range(self.rows)]
+        self.seating_map = [[SEATING_MAP_MARKERS.get(seat_type, '.') for seat_type in row] for row in layout.cells]
+
+        # Bit `col_index` of a row mask is set while that seat is free
+        self.free_masks = list(layout.seat_masks)
+        self.free_runs = FreeRunIndex(self.rows, self.seats_per_row, layout.general_masks)
+
+        if zones is None:
+            zones = ZoneMap.default_tiers(self.rows, self.seats_per_row)
+        elif zones.rows != self.rows or zones.seats_per_row > self.seats_per_row:
+            raise ValueError("Zones do not match the seating map")
+        # Seats beyond a narrower zone map are in no zone
+        self.zones = zones = zones.widened(self.seats_per_row)
+
+        # Free seats left per zone, kept up to date by booking and cancellation
+        self.zone_available = {
+            name: sum(bin(zone_mask & seat_mask).count("1")
+                      for zone_mask, seat_mask in zip(zones.masks[name], layout.seat_masks))
+            for name in zones.names
+        }
 
         self.booking_counter = 0
         self.bookings = {}
+        self.listeners = []
+
+        # Customer details of bookings, indexed by name, email and phone
+        self.customers = CustomerIndex()
+
+        # Seats held for waitlisted parties, by hold id: (entry_id, seats)
+        self.waitlist = Waitlist()
+        self.waitlist_counter = 0
+        self.hold_counter = 0
+        self.holds = {}
+        self.entry_holds = {}
+
+        # Bumped on every booking and cancellation, so sessions sharing the
+        # cinema can tell whether the seats they were offered may have changed
+        self.version = 0
+        self.lock = threading.RLock()
+        self.changes = ChangeFeed()
+
+        # Outcomes of operations by idempotency key, so client retries get
+        # the original outcome instead of running the operation again
+        self.idempotency = IdempotencyCache()
 
         # Configure logging
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
+    def add_listener(self, listener):
+        """
+        Register a callable that is notified as `listener(event, booking_id, seats)`
+        after seats are booked or cancelled.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregister a previously added listener.
+        """
+        self.listeners.remove(listener)
+
+    def _notify(self, event, booking_id, seats):
+        for listener in self.listeners:
+            listener(event, booking_id, seats)
+
+    @synchronized
     def generate_booking_id(self):
         """
         Generate a unique booking id.
@@ -66,14 +214,58 @@ class Cinema:
             return False
         return self.seating_map[row_index][col_index] == '.'
 
-    def _allocate_from_middle(self, row_index, remaining_tickets):
+    def is_seat_allocatable(self, row_index, col_index):
         """
-        Allocate seats from the middle of a row outwards.
+        Check if a seat is free and may be handed out by the general allocators,
+        which leave wheelchair spaces to `allocate_accessible_seats`.
+        """
+        if not (0 <= row_index < self.rows and 0 <= col_index < self.seats_per_row):
+            return False
+        return bool(self._allocatable_row(row_index) >> col_index & 1)
+
+    def seat_type(self, row_index, col_index):
+        """
+        Return the layout seat type at a position.
+        """
+        return self.layout.seat_type(row_index, col_index)
+
+    def seats_left(self, zone):
+        """
+        Return the number of free seats in a zone.
+        """
+        self._check_zone(zone)
+        return self.zone_available[zone]
+
+    def _check_zone(self, zone):
+        if zone is not None and zone not in self.zone_available:
+            raise ValueError(f"Unknown zone '{zone}'")
+
+    def _allocatable_row(self, row_index, zone=None):
+        """
+        Bitmask of the seats in a row the general allocators may hand out,
+        optionally restricted to a zone.
+        """
+        row_free = self.free_masks[row_index] & self.layout.general_masks[row_index]
+        if zone is not None:
+            row_free &= self.zones.masks[zone][row_index]
+        return row_free
+
+    def _middle_col(self):
+        """
+        Column index of the middle-most seat, leaning left on even rows.
         """
-        allocated_seats = []
         mid_col = (self.seats_per_row // 2)
         if self.seats_per_row % 2 == 0:
             mid_col -= 1
+        return mid_col
+
+    def _allocate_from_middle(self, row_index, remaining_tickets, zone=None):
+        """
+        Allocate seats from the middle of a row outwards.
+        """
+        allocated_seats = []
+        mid_col = self._middle_col()
+        row_free = self._allocatable_row(row_index, zone)
 
         left_offset = 0
         seats_allocated = 0
@@ -82,14 +274,14 @@ class Cinema:
         while (mid_col - left_offset >= 0 or mid_col + left_offset < self.seats_per_row) and seats_allocated < remaining_tickets:
             # Try right side of middle first
             right_col = mid_col + left_offset
-            if right_col < self.seats_per_row and self.is_seat_available(row_index, right_col):
+            if right_col < self.seats_per_row and row_free >> right_col & 1:
                 allocated_seats.append((row_index, right_col))
                 seats_allocated += 1
 
             # If we still need seats and left side is valid, allocate seat on left
             left_col = mid_col - left_offset
             if (seats_allocated < remaining_tickets and left_col >= 0 and 
-                left_col != right_col and self.is_seat_available(row_index, left_col)):
+                left_col != right_col and row_free >> left_col & 1):
                 allocated_seats.append((row_index, left_col))
                 seats_allocated += 1
 
@@ -97,7 +289,8 @@ class Cinema:
 
         return allocated_seats, seats_allocated
 
-    def allocate_default_seats(self, num_tickets):
+    @synchronized
+    def allocate_default_seats(self, num_tickets, zone=None):
         """
         Suggest default seats based on these rules:
         1. Start from the furthest row from the screen.
@@ -105,13 +298,17 @@ class Cinema:
         3. When a row is not enough to accommodate the number of tickets, 
            it should overflow to the next row closer to the screen.
 
+        When a zone is given, only seats in that zone are considered.
+
         Return None if there is not enough available seats left.
         """
         if num_tickets <= 0:
             raise ValueError("Number of tickets must be positive")
-            
-        if num_tickets > self.available_seats:
-            self.logger.warning(f"Cannot allocate {num_tickets} tickets - only {self.available_seats} available")
+
+        self._check_zone(zone)
+        available_seats = self.available_seats if zone is None else self.zone_available[zone]
+        if num_tickets > available_seats:
+            self.logger.warning(f"Cannot allocate {num_tickets} tickets - only {available_seats} available")
             return None
 
         remaining_tickets = num_tickets
@@ -122,7 +319,7 @@ class Cinema:
             if remaining_tickets <= 0:
                 break
 
-            row_seats, seats_in_row = self._allocate_from_middle(row_index, remaining_tickets)
+            row_seats, seats_in_row = self._allocate_from_middle(row_index, remaining_tickets, zone)
             allocated_seats.extend(row_seats)
             remaining_tickets -= seats_in_row
 
@@ -134,13 +331,106 @@ class Cinema:
         self.logger.info(f"Successfully allocated {num_tickets} seats")
         return allocated_seats
 
-    def allocate_seats_from_position(self, num_tickets, start_row, start_col):
+    @synchronized
+    def allocate_contiguous_seats(self, num_tickets):
+        """
+        Suggest a block of adjacent seats that keeps the party together:
+        1. Start from the furthest row from the screen.
+        2. Within a row, pick the block closest to the middle.
+        3. Never split the party across rows or gaps.
+
+        Return None if no row has a long enough run of free seats.
+        """
+        if num_tickets <= 0:
+            raise ValueError("Number of tickets must be positive")
+
+        if num_tickets > self.available_seats:
+            self.logger.warning(f"Cannot allocate {num_tickets} tickets - only {self.available_seats} available")
+            return None
+
+        # Block start that centres the party the same way as middle-out expansion
+        target_start = self._middle_col() - (num_tickets - 1) // 2
+
+        for row_index in range(self.rows - 1, -1, -1):
+            start_col = self.free_runs.find_block(row_index, num_tickets, target_start)
+            if start_col is not None:
+                self.logger.info(f"Successfully allocated {num_tickets} adjacent seats in row {row_index}")
+                return [(row_index, col_index) for col_index in range(start_col, start_col + num_tickets)]
+
+        self.logger.warning(f"Could not find {num_tickets} adjacent seats")
+        return None
+
+    @synchronized
+    def allocate_accessible_seats(self, num_spaces, num_companions=0):
+        """
+        Suggest wheelchair spaces plus companion seats next to them:
+        1. Start from the furthest row from the screen.
+        2. Take the middle-most free wheelchair spaces of a row. A row that
+           cannot seat the remaining companions leaves the last space for a
+           later row that can.
+        3. Seat companions in the same row, nearest to the spaces, preferring
+           companion seats over standard seats.
+
+        Return None if the spaces and companions cannot all be seated.
+        """
+        if num_spaces <= 0:
+            raise ValueError("Number of wheelchair spaces must be positive")
+        if num_companions < 0:
+            raise ValueError("Number of companions cannot be negative")
+
+        space_masks = self.layout.type_masks[SEAT_WHEELCHAIR]
+        mid_col = self._middle_col()
+
+        spaces = []
+        companions = []
+        for row_index in range(self.rows - 1, -1, -1):
+            if len(spaces) == num_spaces:
+                break
+
+            free_spaces = self.free_masks[row_index] & space_masks[row_index]
+            if not free_spaces:
+                continue
+
+            companion_free = self.free_masks[row_index] & self.layout.general_masks[row_index]
+            candidates = [col_index for col_index in range(self.seats_per_row) if companion_free >> col_index & 1]
+
+            # Companions sit in the row of the spaces they accompany, so a row
+            # that cannot seat the companions still to place leaves at least
+            # one space for a later row that can
+            wanted = num_companions - len(companions)
+            take = num_spaces - len(spaces)
+            if len(candidates) < wanted:
+                take -= 1
+                if take == 0:
+                    continue
+
+            row_spaces = sorted((col_index for col_index in range(self.seats_per_row) if free_spaces >> col_index & 1),
+                                key=lambda col_index: abs(col_index - mid_col))
+            row_spaces = row_spaces[:take]
+            spaces.extend((row_index, col_index) for col_index in row_spaces)
+
+            if wanted > 0:
+                candidates.sort(key=lambda col_index: (self.layout.seat_type(row_index, col_index) != SEAT_COMPANION,
+                                                       min(abs(col_index - space) for space in row_spaces)))
+                companions.extend((row_index, col_index) for col_index in candidates[:wanted])
+
+        if len(spaces) < num_spaces or len(companions) < num_companions:
+            self.logger.warning(f"Could not allocate {num_spaces} wheelchair spaces with {num_companions} companions")
+            return None
+
+        self.logger.info(f"Successfully allocated {num_spaces} wheelchair spaces with {num_companions} companions")
+        return spaces + companions
+
+    @synchronized
+    def allocate_seats_from_position(self, num_tickets, start_row, start_col, zone=None):
         """
         Allocate seats when user specifies a starting position:
         1. Starting from the specified position, fill up all empty seats in the same row all the way to the right.
         2. When there is not enough seats available, it should overflow to the next row closer to the screen.
         3. Seat allocation for overflow follows the rules for default seat selection (expand from middle).
 
+        When a zone is given, only seats in that zone are considered.
+
         Return None if there is not enough available seats left.
         """
         if num_tickets <= 0:
@@ -148,9 +438,11 @@ class Cinema:
             
         if not (0 <= start_row < self.rows and 0 <= start_col < self.seats_per_row):
             raise ValueError("Starting position is out of bounds")
-            
-        if num_tickets > self.available_seats:
-            self.logger.warning(f"Cannot allocate {num_tickets} tickets - only {self.available_seats} available")
+
+        self._check_zone(zone)
+        available_seats = self.available_seats if zone is None else self.zone_available[zone]
+        if num_tickets > available_seats:
+            self.logger.warning(f"Cannot allocate {num_tickets} tickets - only {available_seats} available")
             return None
 
         allocated_seats = []
@@ -160,8 +452,9 @@ class Cinema:
         col_index = start_col
         
         # Handle the starting row (fill from start_col to the right)
+        row_free = self._allocatable_row(row_index, zone)
         while col_index < self.seats_per_row and remaining_tickets > 0:
-            if self.is_seat_available(row_index, col_index):
+            if row_free >> col_index & 1:
                 allocated_seats.append((row_index, col_index))
                 remaining_tickets -= 1
             col_index += 1
@@ -171,7 +464,7 @@ class Cinema:
         
         # For overflow rows, use the default seat selection logic (middle-out)
         while remaining_tickets > 0 and row_index >= 0:
-            row_seats, seats_allocated = self._allocate_from_middle(row_index, remaining_tickets)
+            row_seats, seats_allocated = self._allocate_from_middle(row_index, remaining_tickets, zone)
             allocated_seats.extend(row_seats)
             remaining_tickets -= seats_allocated
             row_index -= 1
@@ -184,23 +477,212 @@ class Cinema:
         self.logger.info(f"Successfully allocated {num_tickets} seats from position ({start_row}, {start_col})")
         return allocated_seats
 
-    def book_seats(self, seats, booking_id):
+    @idempotent
+    @synchronized
+    def book_seats(self, seats, booking_id, customer=None):
         """
-        Mark seats as booked with the given booking_id.
+        Mark seats as booked with the given booking_id, for an optional
+        `Customer`.
         """
         if not seats:
             raise ValueError("No seats provided for booking")
-            
-        for row_index, col_index in seats:
-            if not self.is_seat_available(row_index, col_index):
-                raise ValueError(f"Seat ({row_index}, {col_index}) is not available")
-            self.seating_map[row_index][col_index] = booking_id
-
-        self.bookings[booking_id] = seats
-        self.available_seats -= len(seats)
+        if customer is not None:
+            self.customers.check(customer)
+
+        # Each run is checked against the free seat masks before touching the
+        # map, so a failed booking leaves no trace
+        try:
+            seat_ranges = SeatRanges.from_seats(seats)
+        except (TypeError, ValueError):
+            seat_ranges = None
+        if seat_ranges is None or not self._runs_free(seat_ranges):
+            self._check_seats(seats)
+            raise ValueError("Seats must be (row_index, col_index) pairs")
+
+        self._occupy(seat_ranges, booking_id)
+        self.bookings[booking_id] = seat_ranges
+        if customer is not None:
+            self.customers.add(booking_id, customer)
         self.logger.info(f"Booked {len(seats)} seats with booking ID: {booking_id}")
+        self._notify(EVENT_BOOK, booking_id, seats)
         return booking_id
 
+    @synchronized
+    def import_bookings(self, bookings):
+        """
+        Book many `(booking_id, seats)` pairs at once, such as season tickets
+        loaded before the public on-sale, and return the number imported.
+        Seats are lists of `(row_index, col_index)` tuples, as for `book_seats`,
+        or `SeatRanges`.
+
+        Each booking's seats are written to the map, and it is taken as one
+        run if the run its first seat starts then holds its id in every cell,
+        which fails for scattered, repeated and out of range seats; other
+        bookings are split into runs. Runs are checked against the seats the
+        import claimed so far as row masks, and the claimed masks against the
+        free seat masks once per row at the end, after which the masks, free
+        run index and zone counters are updated once per row. If any check
+        fails, the map is put back and the bookings are gone through one by
+        one to report the first invalid one, so nothing is booked. The
+        booking id sequence continues after the highest imported `BKnnnn` id.
+        """
+        bookings = list(bookings)
+        if not bookings:
+            return 0
+
+        booking_ids = {booking_id for booking_id, _ in bookings}
+        if (len(booking_ids) != len(bookings) or not booking_ids.isdisjoint(self.bookings)
+                or not booking_ids.isdisjoint(self.holds) or not booking_ids.isdisjoint(FIXED_MARKERS | {"."})):
+            self._check_import(bookings)
+
+        seating_map = self.seating_map
+        saved_rows = [row[:] for row in seating_map]
+        try:
+            packed_runs, claimed_masks = self._write_imported(bookings)
+        except (IndexError, TypeError, ValueError):
+            packed_runs = None
+        if packed_runs is None or any(claimed_mask & ~free_mask
+                                      for claimed_mask, free_mask in zip(claimed_masks, self.free_masks)):
+            for row, saved_row in zip(seating_map, saved_rows):
+                row[:] = saved_row
+            self._check_import(bookings)
+            raise ValueError("Seats must be (row_index, col_index) pairs")
+
+        self.bookings.update(zip(map(itemgetter(0), bookings), SeatRanges.from_packed_runs(packed_runs)))
+
+        # Row-level bookkeeping once per row rather than once per seat
+        general_masks = self.layout.general_masks
+        zone_masks = self.zones.masks
+        for row_index, claimed_mask in enumerate(claimed_masks):
+            if not claimed_mask:
+                continue
+            free_mask = self.free_masks[row_index] ^ claimed_mask
+            self.free_masks[row_index] = free_mask
+            free_mask &= general_masks[row_index]
+            self.free_runs.reset_row(row_index, [col_index for col_index in range(self.seats_per_row)
+                                                 if free_mask >> col_index & 1] if free_mask else [])
+            for zone, masks in zone_masks.items():
+                self.zone_available[zone] -= bin(claimed_mask & masks[row_index]).count("1")
+            self.available_seats -= bin(claimed_mask).count("1")
+
+        # Change feed readers redraw once instead of replaying every seat
+        self.version += 1
+        self.changes.truncate(self.version)
+
+        # Numbers of BKnnnn ids are found in one regular expression pass
+        numbers = BOOKING_NUMBER.findall("\0" + "\0".join(booking_ids) + "\0")
+        if numbers:
+            self.booking_counter = max(self.booking_counter, max(map(int, numbers)))
+
+        self.logger.info(f"Imported {len(bookings)} bookings")
+        if self.listeners:
+            for booking_id, seats in bookings:
+                self._notify(EVENT_BOOK, booking_id, seats)
+        return len(bookings)
+
+    def _write_imported(self, bookings):
+        """
+        Write the seats of imported bookings to the seating map and return
+        each booking's runs packed as for `SeatRanges.to_bytes()`, with the
+        seats claimed per row as masks, or `(None, None)` if a booking's
+        seats are not distinct seats of the hall clear of earlier bookings.
+        """
+        seating_map = self.seating_map
+        packed_runs = []
+        claimed_masks = [0] * self.rows
+        for booking_id, seats in bookings:
+            if not isinstance(seats, SeatRanges):
+                for row_index, col_index in seats:
+                    seating_map[row_index][col_index] = booking_id
+
+                # Seats listed as one run, as allocated or exported, fill the
+                # slice from their first seat; others are split into runs
+                row_index, start = seats[0]
+                length = len(seats)
+                mask = ((1 << length) - 1) << start
+                if (not claimed_masks[row_index] & mask
+                        and seating_map[row_index][start:start + length] == [booking_id] * length):
+                    packed_runs.append(bytes((row_index, start, length)))
+                    claimed_masks[row_index] |= mask
+                    continue
+                seats = SeatRanges.from_seats(seats)
+            if not seats:
+                return None, None
+
+            for row_index, start, length in seats.ranges():
+                mask = ((1 << length) - 1) << start
+                if row_index >= self.rows or start + length > self.seats_per_row or claimed_masks[row_index] & mask:
+                    return None, None
+                seating_map[row_index][start:start + length] = [booking_id] * length
+                claimed_masks[row_index] |= mask
+            packed_runs.append(seats.to_bytes())
+        return packed_runs, claimed_masks
+
+    def _check_import(self, bookings):
+        """
+        Raise a ValueError for the first invalid booking of an import.
+        """
+        seen = set()
+        for booking_id, _ in bookings:
+            if booking_id in self.bookings or booking_id in self.holds or booking_id in seen:
+                raise ValueError(f"Booking id {booking_id} already exists")
+            if booking_id == "." or booking_id in FIXED_MARKERS:
+                raise ValueError(f"Booking id '{booking_id}' is a seating map marker")
+            seen.add(booking_id)
+
+        free_masks = list(self.free_masks)
+        for booking_id, seats in bookings:
+            if not seats:
+                raise ValueError(f"No seats provided for booking {booking_id}")
+            try:
+                seat_ranges = SeatRanges.from_seats(seats)
+            except ValueError:
+                if len(set(seats)) != len(seats):
+                    raise ValueError(f"Seats must not be repeated in booking {booking_id}") from None
+                # A position that cannot be packed is outside any hall
+                row_index, col_index = min(seat for seat in seats
+                                           if not (0 <= seat[0] < self.rows and 0 <= seat[1] < self.seats_per_row))
+                raise ValueError(f"Seat ({row_index}, {col_index}) of booking {booking_id} is not available") from None
+
+            # Each run must still be free, and is taken out of the free masks
+            # so later bookings of the import cannot take it again
+            for row_index, start, length in seat_ranges.ranges():
+                mask = ((1 << length) - 1) << start
+                if row_index >= self.rows or free_masks[row_index] & mask != mask:
+                    taken = mask if row_index >= self.rows else mask & ~free_masks[row_index]
+                    col_index = (taken & -taken).bit_length() - 1
+                    raise ValueError(f"Seat ({row_index}, {col_index}) of booking {booking_id} is not available")
+                free_masks[row_index] ^= mask
+
+    @synchronized
+    def changes_since(self, version):
+        """
+        Return the seat deltas made after `version` as
+        `(version, row_index, col_index, status)` tuples, oldest first, or
+        None if they are no longer all available.
+        """
+        return self.changes.since(version)
+
+    @idempotent
+    @synchronized
+    def confirm_booking(self, seats, booking_id, expected_version, customer=None):
+        """
+        Book seats that were offered when the cinema was at `expected_version`.
+
+        If nothing changed since, the seats are still free. Otherwise each seat
+        is checked once and a SeatConflictError listing the taken seats is
+        raised, so the caller can offer new seats straight away.
+        """
+        if expected_version != self.version:
+            taken_seats = [seat for seat in seats if not self.is_seat_available(*seat)]
+            if taken_seats:
+                self.logger.warning(f"Booking {booking_id} conflicts on {len(taken_seats)} seats")
+                raise SeatConflictError(taken_seats, self.version)
+
+        return self.book_seats(seats, booking_id, customer)
+
+    @idempotent
+    @synchronized
     def cancel_booking(self, booking_id):
         """
         Cancel a booking and free up the seats.
@@ -209,15 +691,218 @@ class Cinema:
             self.logger.warning(f"Booking ID {booking_id} not found")
             return False
 
-        seats_count = len(self.bookings[booking_id])
-        for seat_row, seat_col in self.bookings[booking_id]:
-            self.seating_map[seat_row][seat_col] = "."
-            self.available_seats += 1
+        seats = self.bookings.pop(booking_id)
+        self.customers.remove(booking_id)
+        self._vacate(seats)
+        self.logger.info(f"Cancelled booking {booking_id} and freed {len(seats)} seats")
+        self._notify(EVENT_CANCEL, booking_id, seats)
 
-        del self.bookings[booking_id]
-        self.logger.info(f"Cancelled booking {booking_id} and freed {seats_count} seats")
+        # Freed seats go to waiting parties first
+        self.fill_from_waitlist()
         return True
 
+    @synchronized
+    def set_customer(self, booking_id, customer):
+        """
+        Attach a `Customer` to an existing booking, replacing any it had.
+        """
+        if booking_id not in self.bookings:
+            raise ValueError(f"Booking id {booking_id} not found")
+        self.customers.add(booking_id, customer)
+
+    @synchronized
+    def find_bookings(self, query, limit=20):
+        """
+        Return up to `limit` booking ids whose customer matches a name,
+        email or phone number, or the start of one, exact matches first.
+        """
+        return self.customers.lookup(query, limit)
+
+    def _runs_free(self, seat_ranges):
+        """
+        Return True if every run of seats is free, with one mask test per run.
+        """
+        for row_index, start, length in seat_ranges.ranges():
+            mask = ((1 << length) - 1) << start
+            if row_index >= self.rows or self.free_masks[row_index] & mask != mask:
+                return False
+        return True
+
+    def _check_seats(self, seats):
+        """
+        Raise a ValueError for the first repeated or unavailable seat.
+        """
+        if len(set(seats)) != len(seats):
+            raise ValueError("Seats must not be repeated in a booking")
+        for row_index, col_index in seats:
+            if not self.is_seat_available(row_index, col_index):
+                raise ValueError(f"Seat ({row_index}, {col_index}) is not available")
+
+    def _occupy(self, seat_ranges, status):
+        """
+        Mark free seats with a booking or hold id, a whole run at a time.
+        """
+        for row_index, start, length in seat_ranges.ranges():
+            self.seating_map[row_index][start:start + length] = [status] * length
+            mask = ((1 << length) - 1) << start
+            self.free_masks[row_index] &= ~mask
+            self.free_runs.occupy_range(row_index, start, start + length)
+            for zone, zone_masks in self.zones.masks.items():
+                self.zone_available[zone] -= bin(mask & zone_masks[row_index]).count("1")
+
+        self.available_seats -= len(seat_ranges)
+        self.version += 1
+        self.changes.record(self.version, seat_ranges, status)
+
+    def _vacate(self, seat_ranges):
+        """
+        Free seats taken by a booking or hold, a whole run at a time.
+        """
+        for row_index, start, length in seat_ranges.ranges():
+            self.seating_map[row_index][start:start + length] = ["."] * length
+            mask = ((1 << length) - 1) << start
+            self.free_masks[row_index] |= mask
+            self.free_runs.release_range(row_index, start, start + length)
+            for zone, zone_masks in self.zones.masks.items():
+                self.zone_available[zone] += bin(mask & zone_masks[row_index]).count("1")
+
+        self.available_seats += len(seat_ranges)
+        self.version += 1
+        self.changes.record(self.version, seat_ranges, '.')
+
+    @idempotent
+    @synchronized
+    def join_waitlist(self, party_size, priority=0):
+        """
+        Put a party on the waitlist and return its waitlist entry id. Lower
+        priority values are served first, then earlier arrivals.
+
+        If seats are free already, the party is offered a hold straight away.
+        """
+        self.waitlist_counter += 1
+        entry_id = f"WL{self.waitlist_counter:04d}"
+        self.waitlist.add(entry_id, party_size, priority)
+        self.logger.info(f"Waitlisted party of {party_size} as {entry_id}")
+        self.fill_from_waitlist()
+        return entry_id
+
+    @synchronized
+    def leave_waitlist(self, entry_id):
+        """
+        Take a party off the waitlist. Return False if it is not waiting.
+        """
+        return self.waitlist.remove(entry_id)
+
+    @synchronized
+    def fill_from_waitlist(self):
+        """
+        Hold free seats for waiting parties, in priority order, and return
+        the `(entry_id, hold_id)` pairs created.
+
+        A party too large for the free seats is passed over for smaller
+        parties behind it rather than leaving the seats empty.
+        """
+        filled = []
+        max_party_size = self.available_seats
+        while max_party_size > 0:
+            waiting = self.waitlist.first_fitting(max_party_size)
+            if waiting is None:
+                break
+
+            entry_id, party_size = waiting
+            seats = self.allocate_default_seats(party_size)
+            if not seats:
+                # Some of the free seats are wheelchair spaces, and too few of the
+                # rest are left for this party; scattered seats never stop it, as
+                # the default allocation spreads a party over as many rows as needed
+                max_party_size = party_size - 1
+                continue
+
+            self.waitlist.remove(entry_id)
+            self.hold_counter += 1
+            hold_id = f"HD{self.hold_counter:04d}"
+            self._occupy(SeatRanges.from_seats(seats), hold_id)
+            self.holds[hold_id] = (entry_id, seats)
+            self.entry_holds[entry_id] = hold_id
+            self.logger.info(f"Held {party_size} seats for waitlist entry {entry_id} as {hold_id}")
+            self._notify(EVENT_HOLD, hold_id, seats)
+
+            filled.append((entry_id, hold_id))
+            max_party_size = self.available_seats
+        return filled
+
+    @idempotent
+    @synchronized
+    def confirm_hold(self, hold_id, booking_id=None, customer=None):
+        """
+        Turn a hold into a booking, for an optional `Customer`, and return
+        the booking id.
+        """
+        if hold_id not in self.holds:
+            raise ValueError(f"Hold {hold_id} not found")
+        if customer is not None:
+            self.customers.check(customer)
+        if booking_id is None:
+            booking_id = self.generate_booking_id()
+        elif booking_id in self.bookings:
+            raise ValueError(f"Booking id {booking_id} already exists")
+
+        entry_id, seats = self.holds.pop(hold_id)
+        del self.entry_holds[entry_id]
+        seat_ranges = SeatRanges.from_seats(seats)
+        for row_index, start, length in seat_ranges.ranges():
+            self.seating_map[row_index][start:start + length] = [booking_id] * length
+        self.bookings[booking_id] = seat_ranges
+        if customer is not None:
+            self.customers.add(booking_id, customer)
+        self.version += 1
+        self.changes.record(self.version, seat_ranges, booking_id)
+        self.logger.info(f"Confirmed hold {hold_id} as booking ID: {booking_id}")
+        self._notify(EVENT_BOOK, booking_id, seats)
+        return booking_id
+
+    @idempotent
+    @synchronized
+    def release_hold(self, hold_id):
+        """
+        Give up a hold and offer its seats to the next waiting parties.
+        """
+        if hold_id not in self.holds:
+            self.logger.warning(f"Hold {hold_id} not found")
+            return False
+
+        entry_id, seats = self.holds.pop(hold_id)
+        del self.entry_holds[entry_id]
+        self._vacate(SeatRanges.from_seats(seats))
+        self.logger.info(f"Released hold {hold_id} and freed {len(seats)} seats")
+        self._notify(EVENT_RELEASE, hold_id, seats)
+
+        self.fill_from_waitlist()
+        return True
+
+    def freeze(self):
+        """
+        Pack the screening into a compact, read-only `FrozenCinema`, for
+        keeping many idle screenings in memory. `FrozenCinema.thaw()`
+        turns it back into a working cinema.
+        """
+        from frozen_cinema import FrozenCinema
+        return FrozenCinema(self)
+
+    @synchronized
+    def memory_footprint(self):
+        """
+        Return the bytes used by each part of the cinema's state and in total.
+        """
+        from frozen_cinema import deep_sizeof
+
+        seen = set()
+        footprint = {name: deep_sizeof(getattr(self, name), seen) for name in (
+            "layout", "zones", "seating_map", "free_masks", "free_runs", "zone_available",
+            "bookings", "customers", "holds", "entry_holds", "waitlist", "changes")}
+        footprint["total"] = sum(footprint.values())
+        return footprint
+
     def _format_screen_header(self):
         """Format the screen header section."""
         total_width = self.seats_per_row * 4
@@ -227,7 +912,21 @@ class Cinema:
         
         return f"\n{' ' * padding}{screen_text}\n{separator_line}"
 
-    def _format_seating_grid(self, current_booking=None):
+    def seat_marker(self, row_index, col_index, current_booking=None, preview=None):
+        """
+        Return the character a seat is drawn with on the seating map. Seats
+        of the current booking and of a `SeatPreview` are drawn as selected.
+        """
+        if preview is not None and (row_index, col_index) in preview:
+            return "o"
+        seat_status = self.seating_map[row_index][col_index]
+        if seat_status == '.' or seat_status in FIXED_MARKERS:
+            return seat_status
+        if current_booking and seat_status == current_booking:
+            return "o"
+        return "#"
+
+    def _format_seating_grid(self, current_booking=None, preview=None):
         """Format the main seating grid."""
         grid_lines = []
         
@@ -236,14 +935,7 @@ class Cinema:
             line = f"{row_letter} "
 
             for col_index in range(self.seats_per_row):
-                seat_status = self.seating_map[row_index][col_index]
-
-                if seat_status == '.':
-                    line += "."
-                elif current_booking and seat_status == current_booking:
-                    line += "o"
-                else:
-                    line += "#"
+                line += self.seat_marker(row_index, col_index, current_booking, preview)
                 line += "   "
             
             grid_lines.append(line)
@@ -260,22 +952,27 @@ class Cinema:
                 line += f"{col}  "
         return line
 
-    def display_seating_map(self, current_booking=None):
+    def format_seating_map(self, current_booking=None, preview=None):
         """
-        Display the seating map with current booking highlighted.
+        Return the seating map as text with current booking and preview highlighted.
         """
-        self.logger.info(f"Displaying seating map for '{self.title}'")
-        
-        # Build the complete seating map display
         display_parts = [
             self._format_screen_header(),
-            self._format_seating_grid(current_booking),
+            self._format_seating_grid(current_booking, preview),
             self._format_column_numbers(),
             ""  # Empty line at the end
         ]
+        return "\n".join(display_parts)
+
+    def display_seating_map(self, current_booking=None, preview=None):
+        """
+        Display the seating map with current booking and preview highlighted.
+        """
+        self.logger.info(f"Displaying seating map for '{self.title}'")
         
-        seating_display = "\n".join(display_parts)
+        # Build the complete seating map display
+        seating_display = self.format_seating_map(current_booking, preview)
         self.logger.info(f"Cinema seating map:\n{seating_display}")
         
         # Also print to console for user visibility
-        print(seating_display)
\ No newline at end of file
+        print(seating_display)
@@ -0,0 +1,181 @@
+"""
+Customer details of bookings, with secondary indexes for looking bookings
+up by name, email or phone.
+"""
+import bisect
+from collections import namedtuple
+
+# Fields a booking can be looked up by
+FIELD_NAME = "name"
+FIELD_EMAIL = "email"
+FIELD_PHONE = "phone"
+FIELDS = (FIELD_NAME, FIELD_EMAIL, FIELD_PHONE)
+
+# Customer details attached to a booking; any field may be None
+Customer = namedtuple("Customer", FIELDS)
+Customer.__new__.__defaults__ = (None, None, None)
+
+
+def normalize(field, value):
+    """
+    Return the form of a field value that is indexed and searched for:
+    names case-folded with single spaces, emails case-folded, and phone
+    numbers as their digits only.
+    """
+    if field == FIELD_NAME:
+        return " ".join(value.casefold().split())
+    if field == FIELD_EMAIL:
+        return value.strip().casefold()
+    if field == FIELD_PHONE:
+        return "".join(char for char in value if char.isdigit())
+    raise ValueError(f"Unknown customer field '{field}'")
+
+
+def guess_field(query):
+    """
+    Return the field a free-text query most likely refers to.
+    """
+    if "@" in query:
+        return FIELD_EMAIL
+    if any(char.isdigit() for char in query) and not any(char.isalpha() for char in query):
+        return FIELD_PHONE
+    return FIELD_NAME
+
+
+def format_customer(customer):
+    """
+    Format customer details on one line, skipping missing fields.
+    """
+    return ", ".join(value for value in customer if value)
+
+
+class CustomerIndex:
+    """
+    Customers of a cinema's bookings, by booking id.
+
+    Each field has a hash index from normalized value to booking ids, for
+    exact matches, and a sorted list of `(normalized value, booking id)`
+    for prefix matches with a binary search. Names are also indexed by
+    every word after the first, so a search for a surname finds them.
+    Bookings are added and removed along with the booking itself, so
+    lookups never scan the bookings.
+    """
+    def __init__(self):
+        self._customers = {}
+        self._exact = {field: {} for field in FIELDS}
+        self._sorted = {field: [] for field in FIELDS}
+
+    def __len__(self):
+        return len(self._customers)
+
+    def __contains__(self, booking_id):
+        return booking_id in self._customers
+
+    def items(self):
+        """
+        Return the `(booking_id, customer)` pairs in booking order.
+        """
+        return self._customers.items()
+
+    def get(self, booking_id):
+        """
+        Return the customer of a booking, or None if it has none.
+        """
+        return self._customers.get(booking_id)
+
+    @staticmethod
+    def _keys(field, value):
+        key = normalize(field, value)
+        if not key:
+            return key, []
+        if field == FIELD_NAME:
+            words = key.split(" ")
+            return key, [key] + [" ".join(words[start:]) for start in range(1, len(words))]
+        return key, [key]
+
+    @staticmethod
+    def check(customer):
+        """
+        Raise a ValueError if a customer has none of the looked up fields.
+        """
+        if not any(customer):
+            raise ValueError("Customer needs a name, email or phone")
+
+    def add(self, booking_id, customer):
+        """
+        Attach a customer to a booking, replacing any customer it had.
+        """
+        self.check(customer)
+        self.remove(booking_id)
+
+        self._customers[booking_id] = customer
+        for field, value in zip(FIELDS, customer):
+            if not value:
+                continue
+            key, prefix_keys = self._keys(field, value)
+            if key:
+                self._exact[field].setdefault(key, {})[booking_id] = None
+            for prefix_key in prefix_keys:
+                bisect.insort(self._sorted[field], (prefix_key, booking_id))
+
+    def remove(self, booking_id):
+        """
+        Drop the customer of a booking. Return False if it had none.
+        """
+        customer = self._customers.pop(booking_id, None)
+        if customer is None:
+            return False
+
+        for field, value in zip(FIELDS, customer):
+            if not value:
+                continue
+            key, prefix_keys = self._keys(field, value)
+            if key:
+                booking_ids = self._exact[field][key]
+                del booking_ids[booking_id]
+                if not booking_ids:
+                    del self._exact[field][key]
+            entries = self._sorted[field]
+            for prefix_key in prefix_keys:
+                del entries[bisect.bisect_left(entries, (prefix_key, booking_id))]
+        return True
+
+    def find(self, field, value):
+        """
+        Return the booking ids whose customer has exactly this field value,
+        after normalizing, in booking order.
+        """
+        return list(self._exact[field].get(normalize(field, value), ()))
+
+    def search(self, field, prefix, limit=20):
+        """
+        Return up to `limit` booking ids whose customer's field, or for
+        names any word onwards, starts with `prefix`, in value order.
+        """
+        prefix = normalize(field, prefix)
+        if not prefix:
+            return []
+
+        entries = self._sorted[field]
+        matches = {}
+        position = bisect.bisect_left(entries, (prefix,))
+        while position < len(entries) and len(matches) < limit:
+            key, booking_id = entries[position]
+            if not key.startswith(prefix):
+                break
+            matches[booking_id] = None
+            position += 1
+        return list(matches)
+
+    def lookup(self, query, limit=20):
+        """
+        Return up to `limit` booking ids matching a name, email or phone
+        number, or the start of one: exact matches first, in booking order.
+        """
+        field = guess_field(query)
+        matches = dict.fromkeys(self.find(field, query)[:limit])
+        for booking_id in self.search(field, query, limit):
+            if len(matches) >= limit:
+                break
+            matches[booking_id] = None
+        return list(matches)
@@ -0,0 +1,319 @@
+"""
+Stream of booking changes for downstream systems such as signage, CRM and
+analytics.
+"""
+import asyncio
+import collections
+import threading
+from itertools import islice
+
+# What a subscriber does when its queue is full
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK, OVERFLOW_DISCONNECT)
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BUFFER_SIZE = 100000
+
+# `sequence` numbers every event of a stream, so subscribers can spot gaps
+BookingEvent = collections.namedtuple("BookingEvent", ["sequence", "event", "booking_id", "seats", "version"])
+
+
+class SubscriptionClosed(Exception):
+    """
+    Raised when reading from a subscription that is closed and drained.
+    """
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Subscription:
+    """
+    Bounded queue of events for one subscriber, read with `get()`, a `for`
+    loop or an `async for` loop. Iteration ends once the subscription is
+    closed and its queued events are read.
+
+    When the queue is full, `drop-oldest` discards the oldest queued event,
+    `block` leaves further events with the stream until there is room, and
+    `disconnect` closes the subscription.
+    """
+    def __init__(self, stream, max_size, overflow):
+        if max_size <= 0:
+            raise ValueError("Queue size must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'")
+
+        self.stream = stream
+        self.max_size = max_size
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self.disconnected = False
+
+        # Sequence number of the next event the stream hands over
+        self._cursor = stream.sequence + 1
+
+        self._events = collections.deque()
+        self._condition = threading.Condition()
+        self._async_waiters = []
+
+    def _wake_async_waiters(self):
+        for loop, future in self._async_waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        self._async_waiters = []
+
+    def _offer(self, events, skipped=0, final=False):
+        # Called by the stream's delivery thread only, with a batch of events
+        # and the number of earlier ones that fell out of the stream's buffer.
+        # Return how many events were taken; a blocking subscriber leaves the
+        # rest with the stream until it reads, or drops them on shutdown
+        with self._condition:
+            self.dropped += skipped
+            if self.closed:
+                return len(events)
+
+            taken = len(events)
+            room = self.max_size - len(self._events)
+            if len(events) <= room:
+                self._events.extend(events)
+            elif self.overflow == OVERFLOW_DROP_OLDEST:
+                self._events.extend(events)
+                overflow = len(self._events) - self.max_size
+                for _ in range(overflow):
+                    self._events.popleft()
+                self.dropped += overflow
+            elif self.overflow == OVERFLOW_DISCONNECT:
+                self._events.extend(events[:room])
+                self.disconnected = True
+                self._finish()
+                return taken
+            else:
+                self._events.extend(events[:room])
+                if final:
+                    # The stream is shutting down, stop waiting for the reader
+                    self.dropped += len(events) - room
+                else:
+                    taken = room
+
+            self._condition.notify_all()
+            self._wake_async_waiters()
+            return taken
+
+    def _batch_limit(self):
+        # Most events worth handing over at once: a drop-oldest queue keeps
+        # only the newest `max_size`, the others take only what fits
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            return self.max_size
+        return self.max_size - len(self._events) + (self.overflow == OVERFLOW_DISCONNECT)
+
+    def _finish(self):
+        # Stop taking events; the queued ones can still be read
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+    def _pop(self):
+        event = self._events.popleft()
+        if self.overflow == OVERFLOW_BLOCK and self._cursor <= self.stream.sequence:
+            # Events waiting with the stream have room again
+            self.stream._wake()
+        return event
+
+    def get(self, timeout=None):
+        """
+        Return the next event, waiting up to `timeout` seconds (forever if
+        None). Raise TimeoutError if none arrives in time, or
+        SubscriptionClosed once the subscription is closed and drained.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._events or self.closed, timeout):
+                raise TimeoutError("No event received in time")
+            if self._events:
+                return self._pop()
+            raise SubscriptionClosed("Subscription is closed")
+
+    def pending(self):
+        """
+        Return the number of queued events.
+        """
+        with self._condition:
+            return len(self._events)
+
+    def close(self):
+        """
+        Unsubscribe and discard any queued events.
+        """
+        with self._condition:
+            self._events.clear()
+        self._finish()
+        self.stream._remove(self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self.get()
+        except SubscriptionClosed:
+            raise StopIteration from None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            with self._condition:
+                if self._events:
+                    return self._pop()
+                if self.closed:
+                    raise StopAsyncIteration
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            await future
+
+
+class EventStream:
+    """
+    Publishes the book, cancel, hold and release events of a cinema to
+    subscribers.
+
+    The cinema listener only appends the event to a buffer of the last
+    `buffer_size` events, and a delivery thread hands each subscriber the
+    events after its own cursor, so a slow or blocking subscriber never
+    stalls `book_seats` or the other subscribers. A `block` subscriber that
+    falls more than `buffer_size` events behind loses the oldest ones, which
+    are counted in its `dropped`.
+    """
+    def __init__(self, cinema, buffer_size=DEFAULT_BUFFER_SIZE):
+        if buffer_size <= 0:
+            raise ValueError("Buffer size must be positive")
+        self.cinema = cinema
+        self.sequence = 0
+        self.delivered_sequence = 0
+
+        self._subscriptions = []
+        self._buffer = collections.deque(maxlen=buffer_size)
+        self._ready = False
+        self._condition = threading.Condition()
+        self.closed = False
+
+        self._thread = threading.Thread(target=self._deliver, name="event-stream", daemon=True)
+        self._thread.start()
+        cinema.add_listener(self._on_seat_change)
+
+    def _on_seat_change(self, event, booking_id, seats):
+        with self._condition:
+            self.sequence += 1
+            self._buffer.append(BookingEvent(self.sequence, event, booking_id, tuple(seats), self.cinema.version))
+            self._ready = True
+            self._condition.notify_all()
+
+    def _wake(self):
+        # A blocking subscriber made room in its queue; nothing to do if a
+        # delivery pass is already due
+        if self._ready:
+            return
+        with self._condition:
+            self._ready = True
+            self._condition.notify_all()
+
+    def subscribe(self, max_size=DEFAULT_QUEUE_SIZE, overflow=OVERFLOW_DROP_OLDEST):
+        """
+        Return a new subscription receiving the events published from now on.
+        """
+        with self._condition:
+            if self.closed:
+                raise ValueError("Event stream is closed")
+            subscription = Subscription(self, max_size, overflow)
+            # Copied on write so delivery can iterate without the lock
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def _remove(self, subscription):
+        with self._condition:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def _buffered(self, start, end):
+        # Buffered events with sequence numbers in [start, end), walking the
+        # buffer from whichever end is nearer
+        first = self.sequence - len(self._buffer) + 1
+        if start - first <= self.sequence + 1 - end:
+            return list(islice(self._buffer, start - first, end - first))
+        events = list(islice(reversed(self._buffer), self.sequence + 1 - end, self.sequence + 1 - start))
+        events.reverse()
+        return events
+
+    def _deliver(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._ready or self.closed)
+                self._ready = False
+                final = self.closed
+
+                # The events after each subscriber's cursor still in the buffer,
+                # as many as it can use
+                first = self.sequence - len(self._buffer) + 1
+                batches = []
+                for subscription in self._subscriptions:
+                    start = max(subscription._cursor, first)
+                    end = self.sequence + 1
+                    if not final:
+                        limit = subscription._batch_limit()
+                        if subscription.overflow == OVERFLOW_DROP_OLDEST:
+                            start = max(start, end - limit)
+                        else:
+                            end = min(end, start + limit)
+                    if end > start:
+                        batches.append((subscription, self._buffered(start, end), start - subscription._cursor))
+
+            for subscription, events, skipped in batches:
+                subscription._cursor = events[0].sequence + subscription._offer(events, skipped, final)
+                if subscription.disconnected:
+                    self._remove(subscription)
+
+            with self._condition:
+                # Events every subscriber has taken are no longer needed
+                self.delivered_sequence = min((subscription._cursor for subscription in self._subscriptions),
+                                              default=self.sequence + 1) - 1
+                while self._buffer and self._buffer[0].sequence <= self.delivered_sequence:
+                    self._buffer.popleft()
+                self._condition.notify_all()
+            if final:
+                return
+
+    def flush(self, timeout=None):
+        """
+        Wait until every published event has been handed to the subscribers.
+        Return False if that did not happen within `timeout` seconds.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.delivered_sequence == self.sequence, timeout)
+
+    def close(self):
+        """
+        Stop following the cinema, deliver the events already published and
+        end every subscription once its queued events are read.
+        """
+        # Under the cinema lock no event can be published after closing
+        with self.cinema.lock, self._condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.cinema.remove_listener(self._on_seat_change)
+            self._condition.notify_all()
+        self._thread.join()
+
+        for subscription in self._subscriptions:
+            subscription._finish()
+        with self._condition:
+            self._subscriptions = []
@@ -0,0 +1,239 @@
+"""
+Compact, immutable snapshots of idle screenings.
+"""
+import json
+import sys
+from array import array
+
+from cinema import Cinema
+from customer_index import Customer
+from hall_layout import HallLayout
+from seat_ranges import SeatRanges
+from zones import ZoneMap
+
+# Seat states in the frozen state bytes
+STATE_FREE = 0
+STATE_BOOKED = 1
+STATE_HELD = 2
+STATE_NOT_FOR_SALE = 3
+
+NO_ZONE = 255
+
+# Layout and zone bytes shared by every snapshot with the same hall
+_shared_blobs = {}
+
+
+def _shared(blob):
+    return _shared_blobs.setdefault(blob, blob)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Return the size in bytes of an object and everything it refers to
+    through containers and instance attributes or slots, counting shared
+    objects once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+def _pack_ids(ids):
+    # Framed by newlines so `\nID\n` finds exactly one id
+    return b"\n" + "\n".join(ids).encode() + b"\n" if ids else b""
+
+
+def _unpack_ids(blob):
+    return blob[1:-1].decode().split("\n") if blob else []
+
+
+class FrozenCinema:
+    """
+    Snapshot of a cinema packed into a few bytes objects.
+
+    The hall layout and zones are stored once per distinct hall and shared
+    between snapshots. Every position has one state byte, bookings keep their
+    packed seat ranges and held seats are kept as flat arrays of cell
+    numbers, so a frozen screening costs a few kilobytes. Availability and booking lookups are answered from the
+    bytes directly; `thaw()` rebuilds a working `Cinema`. Listeners and the
+    change feed are not part of the snapshot.
+    """
+    __slots__ = ("title", "rows", "seats_per_row", "version", "counters", "available_seats",
+                 "_layout", "_zone_names", "_zones", "_state", "_booking_ids", "_booking_seats",
+                 "_booking_offsets", "_hold_ids", "_hold_entries", "_hold_seats", "_hold_offsets",
+                 "_waitlist", "_customers")
+
+    def __init__(self, cinema):
+        with cinema.lock:
+            spr = cinema.seats_per_row
+            self.title = cinema.title
+            self.rows = cinema.rows
+            self.seats_per_row = spr
+            self.version = cinema.version
+            self.counters = (cinema.booking_counter, cinema.hold_counter, cinema.waitlist_counter)
+            self.available_seats = cinema.available_seats
+
+            self._layout = _shared("".join("".join(row) for row in cinema.layout.cells).encode())
+            self._zone_names = tuple(cinema.zones.names)
+            zone_numbers = {name: number for number, name in enumerate(self._zone_names)}
+            zone_cells = cinema.zones.cells
+            self._zones = _shared(bytes(
+                NO_ZONE if row_index >= len(zone_cells) or col_index >= len(zone_cells[row_index])
+                or zone_cells[row_index][col_index] is None else zone_numbers[zone_cells[row_index][col_index]]
+                for row_index in range(self.rows) for col_index in range(spr)))
+
+            state = bytearray(STATE_FREE if seat_status == '.' else STATE_NOT_FOR_SALE
+                              for row in cinema.seating_map for seat_status in row)
+            self._booking_ids, self._booking_seats, self._booking_offsets = self._pack_ranges(
+                cinema.bookings.items(), state)
+            self._hold_ids, self._hold_seats, self._hold_offsets = self._pack_seats(
+                ((hold_id, seats) for hold_id, (_, seats) in cinema.holds.items()), state, STATE_HELD)
+            self._hold_entries = _pack_ids([entry_id for entry_id, _ in cinema.holds.values()])
+            self._state = bytes(state)
+
+            entries = cinema.waitlist.entries()
+            self._waitlist = json.dumps(entries, separators=(",", ":")).encode() if entries else b""
+            customers = [[booking_id, *customer] for booking_id, customer in cinema.customers.items()]
+            self._customers = json.dumps(customers, separators=(",", ":")).encode() if customers else b""
+
+    def _pack_seats(self, items, state, seat_state):
+        ids = []
+        cells = array("H")
+        offsets = array("H", [0])
+        for item_id, seats in items:
+            ids.append(item_id)
+            for row_index, col_index in seats:
+                cell = row_index * self.seats_per_row + col_index
+                cells.append(cell)
+                state[cell] = seat_state
+            offsets.append(len(cells))
+        return _pack_ids(ids), cells.tobytes(), offsets.tobytes()
+
+    def _pack_ranges(self, items, state):
+        # Bookings keep their packed seat ranges, three bytes per run
+        ids = []
+        packed = bytearray()
+        offsets = array("H", [0])
+        for item_id, seat_ranges in items:
+            ids.append(item_id)
+            for row_index, start, length in seat_ranges.ranges():
+                cell = row_index * self.seats_per_row + start
+                state[cell:cell + length] = bytes([STATE_BOOKED]) * length
+            packed += seat_ranges.to_bytes()
+            offsets.append(len(packed))
+        return _pack_ids(ids), bytes(packed), offsets.tobytes()
+
+    @staticmethod
+    def _index_of(ids_blob, item_id):
+        position = ids_blob.find(b"\n" + item_id.encode() + b"\n")
+        if position < 0 or "\n" in item_id:
+            return None
+        return ids_blob.count(b"\n", 0, position)
+
+    def _seats_of(self, ids_blob, cells_blob, offsets_blob, item_id):
+        index = self._index_of(ids_blob, item_id)
+        if index is None:
+            return None
+
+        offsets = memoryview(offsets_blob).cast("H")
+        cells = memoryview(cells_blob).cast("H")[offsets[index]:offsets[index + 1]]
+        return [divmod(cell, self.seats_per_row) for cell in cells]
+
+    def _booking_ranges(self, index):
+        offsets = memoryview(self._booking_offsets).cast("H")
+        return SeatRanges.from_bytes(self._booking_seats[offsets[index]:offsets[index + 1]])
+
+    def is_seat_available(self, row_index, col_index):
+        """
+        Check if a seat is available.
+        """
+        if not (0 <= row_index < self.rows and 0 <= col_index < self.seats_per_row):
+            return False
+        return self._state[row_index * self.seats_per_row + col_index] == STATE_FREE
+
+    def seats_left(self, zone):
+        """
+        Return the number of free seats in a zone.
+        """
+        if zone not in self._zone_names:
+            raise ValueError(f"Unknown zone '{zone}'")
+        zone_number = self._zone_names.index(zone)
+        return sum(1 for state, cell_zone in zip(self._state, self._zones)
+                   if state == STATE_FREE and cell_zone == zone_number)
+
+    def booking_ids(self):
+        """
+        Return the booking ids in booking order.
+        """
+        return _unpack_ids(self._booking_ids)
+
+    def get_booking(self, booking_id):
+        """
+        Return the SeatRanges of a booking, or None if there is no such booking.
+        """
+        index = self._index_of(self._booking_ids, booking_id)
+        return self._booking_ranges(index) if index is not None else None
+
+    def get_hold(self, hold_id):
+        """
+        Return the seats of a hold, or None if there is no such hold.
+        """
+        return self._seats_of(self._hold_ids, self._hold_seats, self._hold_offsets, hold_id)
+
+    def memory_footprint(self):
+        """
+        Return the bytes used by each part of the snapshot and in total.
+        Shared layout and zone bytes are reported but not counted in the total.
+        """
+        footprint = {name: sys.getsizeof(getattr(self, name)) for name in self.__slots__
+                     if name not in ("_layout", "_zones")}
+        footprint["shared"] = sys.getsizeof(self._layout) + sys.getsizeof(self._zones)
+        footprint["total"] = sys.getsizeof(self) + sum(size for name, size in footprint.items() if name != "shared")
+        return footprint
+
+    def thaw(self):
+        """
+        Rebuild a working Cinema from the snapshot.
+        """
+        spr = self.seats_per_row
+        layout_cells = self._layout.decode()
+        layout = HallLayout([list(layout_cells[row_index * spr:(row_index + 1) * spr])
+                             for row_index in range(self.rows)])
+        zones = ZoneMap([[None if zone_number == NO_ZONE else self._zone_names[zone_number]
+                          for zone_number in self._zones[row_index * spr:(row_index + 1) * spr]]
+                         for row_index in range(self.rows)])
+        cinema = Cinema(self.title, self.rows, spr, layout, zones)
+
+        cinema.import_bookings((booking_id, self._booking_ranges(index))
+                               for index, booking_id in enumerate(self.booking_ids()))
+
+        hold_offsets = memoryview(self._hold_offsets).cast("H")
+        hold_cells = memoryview(self._hold_seats).cast("H")
+        for index, (hold_id, entry_id) in enumerate(zip(_unpack_ids(self._hold_ids), _unpack_ids(self._hold_entries))):
+            seats = [divmod(cell, spr) for cell in hold_cells[hold_offsets[index]:hold_offsets[index + 1]]]
+            cinema._occupy(SeatRanges.from_seats(seats), hold_id)
+            cinema.holds[hold_id] = (entry_id, seats)
+            cinema.entry_holds[entry_id] = hold_id
+
+        for entry_id, priority, arrival, party_size in json.loads(self._waitlist) if self._waitlist else ():
+            cinema.waitlist.add(entry_id, party_size, priority, arrival)
+        for booking_id, *customer in json.loads(self._customers) if self._customers else ():
+            cinema.customers.add(booking_id, Customer(*customer))
+
+        cinema.booking_counter, cinema.hold_counter, cinema.waitlist_counter = self.counters
+        cinema.version = self.version
+        cinema.changes.truncate(self.version)
+        return cinema
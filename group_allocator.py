@@ -0,0 +1,169 @@
+"""
+Seat allocation for large parties that keeps the group in as few rows as
+possible.
+"""
+import time
+from collections import namedtuple
+
+# Seconds a search may take before falling back to the default allocation
+DEFAULT_TIME_BUDGET = 0.05
+
+# Result of a group search: the seats, rows from first to last, number of
+# blocks of adjacent seats, whether the search finished within its budget,
+# and whether the default allocation had to be used
+GroupPlan = namedtuple("GroupPlan", ["seats", "rows_spanned", "blocks", "optimal", "fallback"])
+
+
+def count_blocks(seats):
+    """
+    Return the number of blocks of adjacent seats, in any row, that make up `seats`.
+    """
+    taken = set(seats)
+    return sum(1 for row_index, col_index in taken if (row_index, col_index - 1) not in taken)
+
+
+def rows_spanned(seats):
+    """
+    Return the number of rows from the first to the last row of `seats`.
+    """
+    row_indexes = [row_index for row_index, _ in seats]
+    return max(row_indexes) - min(row_indexes) + 1 if row_indexes else 0
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class _RowRuns:
+    """
+    Free runs of one row, longest first, with the fewest blocks needed to
+    seat any number of people in the row.
+    """
+    def __init__(self, runs, centre):
+        self.runs = sorted(runs, key=lambda run: (run[0] - run[1], abs((run[0] + run[1] - 1) / 2 - centre)))
+        self.capacity = sum(end - start for start, end in runs)
+
+        # min_blocks[k]: fewest runs whose seats add up to at least k
+        self.min_blocks = [0]
+        covered = 0
+        for block_count, (start, end) in enumerate(self.runs, 1):
+            covered_before, covered = covered, covered + end - start
+            self.min_blocks.extend([block_count] * (covered - covered_before))
+
+
+def _window_plan(row_runs, window, num_tickets, best_blocks, deadline):
+    """
+    Fewest blocks seating `num_tickets` in a window of rows, as
+    `(blocks, seats per row)`, or None if it cannot beat `best_blocks`.
+    """
+    # Lower bound: the longest runs of the whole window, taken in order
+    lengths = sorted((end - start for row_index in window for start, end in row_runs[row_index].runs), reverse=True)
+    covered = 0
+    for lower_bound, length in enumerate(lengths, 1):
+        covered += length
+        if covered >= num_tickets:
+            break
+    else:
+        return None
+    if best_blocks is not None and lower_bound >= best_blocks:
+        return None
+
+    # Knapsack over the rows, back row first: best[s] is the fewest blocks
+    # seating s people in the rows so far, with the seats given to each row
+    best = {0: (0, ())}
+    for row_index in window:
+        if time.perf_counter() > deadline:
+            raise _OutOfTime()
+        runs = row_runs[row_index]
+        next_best = dict(best)
+        for seated, (blocks, counts) in best.items():
+            for count in range(1, min(runs.capacity, num_tickets - seated) + 1):
+                candidate = (blocks + runs.min_blocks[count], counts + ((row_index, count),))
+                if seated + count not in next_best or candidate[0] < next_best[seated + count][0]:
+                    next_best[seated + count] = candidate
+        best = next_best
+
+    if num_tickets not in best:
+        return None
+    blocks, counts = best[num_tickets]
+    if best_blocks is not None and blocks >= best_blocks:
+        return None
+    return blocks, counts
+
+
+def _row_seats(runs, row_index, count, seats_per_row):
+    # Seat `count` people in as few of the row's runs as possible, filling
+    # the most central runs first and centring each block within its run
+    centre = (seats_per_row - 1) / 2
+    chosen = runs.runs[:runs.min_blocks[count]]
+    chosen.sort(key=lambda run: abs((run[0] + run[1] - 1) / 2 - centre))
+
+    seats = []
+    for start, end in chosen:
+        size = min(end - start, count - len(seats))
+        block_start = min(max(round(centre - (size - 1) / 2), start), end - size)
+        seats.extend((row_index, col_index) for col_index in range(block_start, block_start + size))
+    return seats
+
+
+def plan_group_seats(cinema, num_tickets, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Find seats for a party that span the fewest rows, then form the fewest
+    blocks of adjacent seats. Among equally good windows of rows the one
+    furthest from the screen wins, as with the default allocation, and
+    blocks are centred within their runs.
+
+    Windows of rows are tried from one row up; within a window a knapsack
+    over its rows finds the fewest blocks, skipping windows whose longest
+    runs alone cannot beat the best so far. If the search runs out of
+    `time_budget` seconds, the best plan found is returned, or else the
+    seats of `allocate_default_seats`.
+
+    Return a GroupPlan, or None if there are not enough seats left.
+    """
+    if num_tickets <= 0:
+        raise ValueError("Number of tickets must be positive")
+
+    deadline = time.perf_counter() + time_budget
+    with cinema.lock:
+        centre = (cinema.seats_per_row - 1) / 2
+        row_runs = [_RowRuns(cinema.free_runs.runs(row_index), centre) for row_index in range(cinema.rows)]
+        if sum(runs.capacity for runs in row_runs) < num_tickets:
+            return None
+
+        best = None
+        try:
+            for height in range(1, cinema.rows + 1):
+                for last_row in range(cinema.rows - 1, height - 2, -1):
+                    window = range(last_row, last_row - height, -1)
+                    if sum(row_runs[row_index].capacity for row_index in window) < num_tickets:
+                        continue
+                    plan = _window_plan(row_runs, window, num_tickets, best[0] if best else None, deadline)
+                    if plan is not None:
+                        best = plan
+                if best is not None:
+                    break
+        except _OutOfTime:
+            if best is None:
+                seats = cinema.allocate_default_seats(num_tickets)
+                if seats is None:
+                    return None
+                return GroupPlan(seats, rows_spanned(seats), count_blocks(seats), False, True)
+            optimal = False
+        else:
+            optimal = True
+
+        blocks, counts = best
+        seats = []
+        for row_index, count in counts:
+            seats.extend(_row_seats(row_runs[row_index], row_index, count, cinema.seats_per_row))
+    return GroupPlan(seats, rows_spanned(seats), blocks, optimal, False)
+
+
+def allocate_group_seats(cinema, num_tickets, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Suggest seats for a party that keep it in as few rows and blocks as
+    possible. Return None if there are not enough seats left.
+    """
+    plan = plan_group_seats(cinema, num_tickets, time_budget)
+    return plan.seats if plan is not None else None
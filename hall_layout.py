@@ -0,0 +1,113 @@
+"""
+Hall layout definitions for cinemas that are not a full rectangle of seats.
+
+A layout file draws the hall the same way the seating map is displayed, with
+the row nearest the screen first and one character per position:
+
+    .   standard seat
+    C   companion seat (next to a wheelchair space)
+    W   wheelchair space
+    X   blocked seat, not for sale
+    _   aisle or gap (a space works too)
+
+Blank lines and lines starting with `#` are ignored. Short rows are padded
+with gaps on the right, so staggered rows only need leading gaps.
+"""
+
+# Seat types
+SEAT_STANDARD = "."
+SEAT_COMPANION = "C"
+SEAT_WHEELCHAIR = "W"
+SEAT_BLOCKED = "X"
+NO_SEAT = "_"
+
+SEAT_TYPES = (SEAT_STANDARD, SEAT_COMPANION, SEAT_WHEELCHAIR, SEAT_BLOCKED, NO_SEAT)
+
+# Seat types that can be sold
+SELLABLE_TYPES = (SEAT_STANDARD, SEAT_COMPANION, SEAT_WHEELCHAIR)
+
+# Seat types handed out by the general allocators
+GENERAL_TYPES = (SEAT_STANDARD, SEAT_COMPANION)
+
+# Seating map markers for positions that can never be booked
+SEATING_MAP_MARKERS = {
+    SEAT_BLOCKED: "X",
+    NO_SEAT: " ",
+}
+FIXED_MARKERS = frozenset(SEATING_MAP_MARKERS.values())
+
+
+class HallLayout:
+    """
+    A compiled hall layout: seat types per position plus per-row bitmasks,
+    where bit `col_index` of a row mask is set when that position matches.
+    """
+    def __init__(self, cells):
+        if not cells:
+            raise ValueError("Layout must have at least one row")
+
+        self.rows = len(cells)
+        self.seats_per_row = max(len(row) for row in cells)
+        if self.seats_per_row == 0:
+            raise ValueError("Layout must have at least one seat")
+
+        self.cells = []
+        for row in cells:
+            row = list(row) + [NO_SEAT] * (self.seats_per_row - len(row))
+            for seat_type in row:
+                if seat_type not in SEAT_TYPES:
+                    raise ValueError(f"Unknown seat type '{seat_type}' in layout")
+            self.cells.append(row)
+
+        self.type_masks = {seat_type: [0] * self.rows for seat_type in SEAT_TYPES}
+        for row_index, row in enumerate(self.cells):
+            for col_index, seat_type in enumerate(row):
+                self.type_masks[seat_type][row_index] |= 1 << col_index
+
+        self.seat_masks = self.masks_for(SELLABLE_TYPES)
+        self.general_masks = self.masks_for(GENERAL_TYPES)
+        self.seat_count = sum(bin(mask).count("1") for mask in self.seat_masks)
+
+    @classmethod
+    def rectangle(cls, rows, seats_per_row):
+        """
+        Layout of a full rectangle of standard seats.
+        """
+        return cls([[SEAT_STANDARD] * seats_per_row for _ in range(rows)])
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Parse a layout drawn in the layout file format.
+        """
+        cells = []
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.lstrip().startswith("#"):
+                continue
+            cells.append([NO_SEAT if char == " " else char.upper() for char in line])
+        return cls(cells)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load a layout from a layout file.
+        """
+        with open(path, "r") as f:
+            return cls.from_string(f.read())
+
+    def masks_for(self, seat_types):
+        """
+        Combine the row masks of several seat types.
+        """
+        masks = [0] * self.rows
+        for seat_type in seat_types:
+            for row_index, mask in enumerate(self.type_masks[seat_type]):
+                masks[row_index] |= mask
+        return masks
+
+    def seat_type(self, row_index, col_index):
+        """
+        Return the seat type at a position.
+        """
+        return self.cells[row_index][col_index]
@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+
+# Defaults for a cinema's idempotency cache
+DEFAULT_MAX_KEYS = 10000
+DEFAULT_TTL = 600.0
+
+
+class IdempotencyCache:
+    """
+    Outcomes of operations by idempotency key, kept for `ttl` seconds and
+    for at most `max_keys` keys.
+
+    Entries are kept in the order they were stored, which with a single TTL
+    is also the order they expire in, so expired entries are always at the
+    front and are dropped from there on every store. When the cache is
+    full the oldest entries go first, so memory stays bounded however many
+    keys clients send.
+    """
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS, ttl=DEFAULT_TTL, clock=time.monotonic):
+        if max_keys <= 0:
+            raise ValueError("Idempotency cache must hold at least one key")
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the `(request, outcome)` stored for a key, or None if there is
+        none or it has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, request, outcome = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        return request, outcome
+
+    def put(self, key, request, outcome):
+        """
+        Store the outcome of a request under a key.
+        """
+        now = self.clock()
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, request, outcome)
+
+        entries = self._entries
+        while entries and next(iter(entries.values()))[0] <= now:
+            entries.popitem(last=False)
+        while len(entries) > self.max_keys:
+            entries.popitem(last=False)
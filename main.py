@@ -1,10 +1,30 @@
+import argparse
+import logging
+import sys
+import time
+
 from cinema import Cinema
+from customer_index import Customer, format_customer
+from hall_layout import HallLayout
+from seat_preview import SeatPreview
+from seat_ranges import range_labels
+from terminal_renderer import TerminalRenderer
 
 
-def initialize_cinema():
+def initialize_cinema(layout=None):
     """
     Initialize a Cinema object based on user input.
+
+    When a hall layout is given, only the movie title is asked for.
     """
+    if layout is not None:
+        print("Please define movie title:")
+        while True:
+            title = input("> ").strip()
+            if title:
+                return Cinema(title, layout.rows, layout.seats_per_row, layout)
+            print("Movie title cannot be empty.")
+
     print("Please define movie title and seating map in [Title] [Row] [SeatsPerRow] format:")
 
     while True:
@@ -38,10 +58,13 @@ def initialize_cinema():
             print("Invalid format. Please use [Title] [Row] [SeatsPerRow] format with numeric values for rows and seats.")
 
 
-def book_tickets(cinema):
+def book_tickets(cinema, renderer=None):
     """
     Handle the ticket booking process including seat selection.
     """
+    if renderer is None:
+        renderer = TerminalRenderer(cinema)
+
     while True:
         print("\nEnter number of tickets to book, or enter blank to go back to main menu:")
         num_tickets_str = input("> ")
@@ -69,27 +92,20 @@ def book_tickets(cinema):
                 print("Could not allocate seats. Please try again with a different number of tickets.")
                 continue
 
+            # Proposed seats are drawn over the seating map without booking them
+            preview = SeatPreview(cinema, allocated_seats)
             is_selecting_seats = True
 
             while is_selecting_seats:
-                # Create a temporary booking to display seats
-                temp_booking_id = "TEMP_BOOKING_ID"
-                for row_index, col_index in allocated_seats:
-                    cinema.seating_map[row_index][col_index] = temp_booking_id
-
                 print(f"\nSuccessfully reserved {num_tickets} {cinema.title} tickets.")
                 print(f"Booking id: {booking_id}")
                 print("Selected seats:")
-                cinema.display_seating_map(temp_booking_id)
+                renderer.render(preview=preview)
 
                 # Prompt for seat selection change
                 print("Enter blank to accept seat selection, or enter new seating position")
                 seating_position = input("> ")
 
-                # Reset temporary booking
-                for row_index, col_index in allocated_seats:
-                    cinema.seating_map[row_index][col_index] = '.'
-
                 if not seating_position:
                     # User accepted the current selection
                     is_selecting_seats = False
@@ -113,14 +129,14 @@ def book_tickets(cinema):
                         print("Could not allocate seats from that position. Please try another position.")
                         continue
 
-                    # Update allocated seats with the new selection
-                    allocated_seats = new_seats
+                    # Update the preview with the new selection
+                    preview = preview.moved_to(new_seats)
 
                 except (ValueError, IndexError):
                     print("Invalid seating position format. Please use format like 'A1', 'B5', etc.")
 
             # Book the final seat selection
-            cinema.book_seats(allocated_seats, booking_id)
+            cinema.book_seats(list(preview.seats), booking_id)
             print(f"\nBooking id: {booking_id} confirmed.")
             break
 
@@ -128,25 +144,39 @@ def book_tickets(cinema):
             print("Invalid number. Please enter a valid number of tickets.")
 
 
-def check_bookings(cinema):
+def check_bookings(cinema, renderer=None):
     """
-    Display seats for a specific booking id.
+    Display seats for a booking, found by booking id or by customer name,
+    email or phone.
     """
+    if renderer is None:
+        renderer = TerminalRenderer(cinema)
+
     while True:
-        print("\nEnter booking id, or enter blank to go back to main menu:")
+        print("\nEnter booking id, customer name, email or phone, or enter blank to go back to main menu:")
         booking_id = input("> ")
 
         if not booking_id:
             return
 
         if booking_id not in cinema.bookings:
-            print(f"Booking id {booking_id} not found.")
-            return
+            matches = cinema.find_bookings(booking_id)
+            if not matches:
+                print(f"Booking id {booking_id} not found.")
+                return
+            if len(matches) > 1:
+                print(f"\nBookings matching {booking_id}:")
+                for match in matches:
+                    print(f"{match}: {format_customer(cinema.customers.get(match))}")
+                continue
+            booking_id = matches[0]
 
+        customer = cinema.customers.get(booking_id)
         print(f"\nBooking id: {booking_id}"
-              f"\nSelected seats:")
+              + (f"\nCustomer: {format_customer(customer)}" if customer is not None else "")
+              + "\nSelected seats:")
 
-        cinema.display_seating_map(booking_id)
+        renderer.render(booking_id)
 
         print("\nPress C to cancel this booking or enter blank to proceed:")
         is_cancel = input("> ")
@@ -162,14 +192,10 @@ def check_bookings(cinema):
         print(f"\nInvalid selection")
 
 
-def main():
+def main_menu(cinema, renderer):
     """
-    Main application entry point.
+    Run the main menu loop until the user exits.
     """
-    # Initialize the cinema
-    cinema = initialize_cinema()
-    
-    # Main menu loop
     while True:
         print(f"\nWelcome to Cinemas"
               f"\n[1] Book tickets for {cinema.title} ({cinema.available_seats} seats available)"
@@ -180,10 +206,10 @@ def main():
         selection = input("> ")
         
         if selection == "1":
-            book_tickets(cinema)
+            book_tickets(cinema, renderer)
 
         elif selection == "2":
-            check_bookings(cinema)
+            check_bookings(cinema, renderer)
 
         elif selection == "3":
             print("\nThank you for using Cinemas system. Bye.")
@@ -193,11 +219,198 @@ def main():
             print("Invalid selection. Please try again.")
 
 
+def main(layout=None):
+    """
+    Main application entry point.
+    """
+    # Initialize the cinema
+    cinema = initialize_cinema(layout)
+    renderer = TerminalRenderer(cinema)
+    try:
+        main_menu(cinema, renderer)
+    finally:
+        renderer.close()
+
+
+def parse_seat_position(cinema, position):
+    """
+    Convert a seat position such as `B5` to (row_index, col_index).
+    """
+    if len(position) < 2:
+        raise ValueError(f"Invalid seating position '{position}'")
+
+    row_index = cinema.get_row_index(position[0])
+    col_number = int(position[1:])
+    if not (1 <= col_number <= cinema.seats_per_row):
+        raise ValueError(f"Seat number {col_number} is out of range")
+    return row_index, col_number - 1
+
+
+def format_seats(cinema, seats):
+    """
+    Format seats as comma separated labels such as `A1-A4,B2`, one per run
+    of adjacent seats.
+    """
+    return ",".join(range_labels(cinema.get_row_letter, seats))
+
+
+def run_batch_command(cinema, command, args, layout=None):
+    """
+    Run one batch command and return (cinema, result line).
+    Raise ValueError if the command fails.
+    """
+    if command == "create":
+        if layout is not None:
+            if not args:
+                raise ValueError("Usage: create [Title]")
+            return Cinema(" ".join(args), layout.rows, layout.seats_per_row, layout), "ok"
+
+        if len(args) < 3:
+            raise ValueError("Usage: create [Title] [Row] [SeatsPerRow]")
+        rows = int(args[-2])
+        seats_per_row = int(args[-1])
+        if rows <= 0 or seats_per_row <= 0:
+            raise ValueError("Rows and seats per row must be positive numbers")
+        if rows > 26:
+            raise ValueError("Maximum number of rows is 26")
+        if seats_per_row > 50:
+            raise ValueError("Maximum number of seats per row is 50")
+        return Cinema(" ".join(args[:-2]), rows, seats_per_row), "ok"
+
+    if cinema is None:
+        raise ValueError("No cinema created yet")
+
+    if command in ("book", "book-from"):
+        expected_args = 1 if command == "book" else 2
+        if len(args) != expected_args:
+            raise ValueError("Usage: book [Tickets]" if command == "book" else "Usage: book-from [Tickets] [Position]")
+
+        num_tickets = int(args[0])
+        if command == "book":
+            seats = cinema.allocate_default_seats(num_tickets)
+        else:
+            row_index, col_index = parse_seat_position(cinema, args[1])
+            seats = cinema.allocate_seats_from_position(num_tickets, row_index, col_index)
+        if not seats:
+            raise ValueError(f"Only {cinema.available_seats} seats available")
+
+        booking_id = cinema.book_seats(seats, cinema.generate_booking_id())
+        return cinema, f"ok {booking_id} {format_seats(cinema, seats)}"
+
+    if command in ("cancel", "lookup"):
+        if len(args) != 1:
+            raise ValueError(f"Usage: {command} [BookingId]")
+
+        booking_id = args[0]
+        if booking_id not in cinema.bookings:
+            raise ValueError(f"Booking id {booking_id} not found")
+        if command == "lookup":
+            return cinema, f"ok {booking_id} {format_seats(cinema, cinema.bookings[booking_id])}"
+        cinema.cancel_booking(booking_id)
+        return cinema, f"ok {booking_id}"
+
+    if command == "customer":
+        if len(args) < 4:
+            raise ValueError("Usage: customer [BookingId] [Email|-] [Phone|-] [Name]")
+
+        email, phone = (None if value == "-" else value for value in args[1:3])
+        cinema.set_customer(args[0], Customer(" ".join(args[3:]), email, phone))
+        return cinema, f"ok {args[0]}"
+
+    if command == "find":
+        if not args:
+            raise ValueError("Usage: find [Name|Email|Phone]")
+
+        query = " ".join(args)
+        booking_ids = cinema.find_bookings(query)
+        if not booking_ids:
+            raise ValueError(f"No bookings found for {query}")
+        return cinema, f"ok {','.join(booking_ids)}"
+
+    raise ValueError(f"Unknown command '{command}'")
+
+
+def run_batch(lines, out=sys.stdout, layout=None):
+    """
+    Run batch commands without rendering or prompts, one command per line:
+
+        create [Title] [Row] [SeatsPerRow]
+        book [Tickets]
+        book-from [Tickets] [Position]
+        cancel [BookingId]
+        lookup [BookingId]
+        customer [BookingId] [Email|-] [Phone|-] [Name]
+        find [Name|Email|Phone]
+
+    Blank lines and lines starting with `#` are skipped. Each command prints
+    one `ok ...` or `error ...` line, followed by a throughput summary.
+    Return the number of failed commands.
+    """
+    # Results are reported per command, and per-operation log lines would
+    # dominate the run time
+    cinema_logger = logging.getLogger("cinema")
+    previous_level = cinema_logger.level
+    cinema_logger.setLevel(logging.CRITICAL)
+
+    cinema = None
+    commands = 0
+    errors = 0
+    results = []
+    start_time = time.perf_counter()
+    try:
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+
+            commands += 1
+            try:
+                cinema, result = run_batch_command(cinema, parts[0].lower(), parts[1:], layout)
+            except (ValueError, IndexError) as e:
+                errors += 1
+                result = f"error {e}"
+            results.append(result)
+
+            # Write in chunks to keep memory flat on large batches
+            if len(results) >= 1000:
+                out.write("\n".join(results) + "\n")
+                results = []
+    finally:
+        cinema_logger.setLevel(previous_level)
+
+    if results:
+        out.write("\n".join(results) + "\n")
+
+    elapsed = time.perf_counter() - start_time
+    rate = commands / elapsed if elapsed > 0 else float("inf")
+    out.write(f"{commands} commands, {errors} errors in {elapsed:.2f}s ({rate:.0f} commands/s)\n")
+    return errors
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Cinemas booking system")
+    parser.add_argument("--layout", help="hall layout file for irregular halls")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) without prompts")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
     # cinema = Cinema("Friends", 8, 10)
     # seats = cinema.allocate_default_seats(4)
     # cinema.book_seats(seats, "0001")
     # print(cinema.seating_map[-1])
-    main()
+    args = parse_args()
+    layout = HallLayout.from_file(args.layout) if args.layout else None
+    if args.batch == "-":
+        sys.exit(1 if run_batch(sys.stdin, layout=layout) else 0)
+    elif args.batch:
+        with open(args.batch, "r") as f:
+            sys.exit(1 if run_batch(f, layout=layout) else 0)
+    else:
+        main(layout)
 
 
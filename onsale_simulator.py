@@ -0,0 +1,280 @@
+"""
+Deterministic discrete-event simulation of an on-sale rush against one hall.
+
+Virtual users follow the booking loop of `main.book_tickets`: they ask for
+tickets, look at the proposed seats, may move them a few times, and confirm
+or walk away. The engine itself is the real `Cinema`, so conflicts between
+users holding overlapping proposals happen exactly as they would live. Time
+is simulated, so 50k users run in seconds; everything except the measured
+wall-clock latency of engine calls is reproducible from the seed.
+"""
+import heapq
+import logging
+import random
+import time
+from collections import namedtuple
+
+from cinema import Cinema, SeatConflictError
+from seat_preview import SeatPreview
+from waiting_room import WaitingRoom
+
+# Event kinds
+EVENT_ARRIVE = "arrive"
+EVENT_DECIDE = "decide"
+EVENT_CANCEL = "cancel"
+EVENT_RECHECK = "recheck"
+
+SimulationConfig = namedtuple("SimulationConfig", [
+    "users",                # virtual users arriving over the on-sale
+    "arrival_rate",         # mean arrivals per simulated second
+    "party_sizes",          # party sizes, drawn uniformly
+    "think_time",           # mean seconds spent looking at proposed seats
+    "change_probability",   # chance of moving the seats at each look
+    "max_seat_changes",     # seat moves before a user confirms anyway
+    "abandon_probability",  # chance of walking away at each look
+    "max_retries",          # new offers after conflicts before giving up
+    "cancel_probability",   # chance a booking is cancelled later
+    "cancel_delay",         # mean seconds from booking to cancellation
+    "rows",
+    "seats_per_row",
+    "admission_rate",       # waiting room admissions per second, None for no waiting room
+    "max_active",           # booking sessions the waiting room lets run at once
+])
+SimulationConfig.__new__.__defaults__ = (
+    50000, 500.0, (1, 2, 2, 2, 3, 4, 4, 6), 20.0, 0.3, 3, 0.05, 3, 0.02, 300.0, 26, 50, None, 100)
+
+SimulationReport = namedtuple("SimulationReport", [
+    "seed", "users", "bookings", "seats_sold", "cancellations", "abandoned", "turned_away", "gave_up",
+    "confirm_attempts", "conflicts", "retries", "sell_out_time", "simulated_time",
+    "session_percentiles", "engine_calls", "engine_percentiles", "wall_time",
+    "queue_checks", "wait_percentiles",
+])
+
+# Percentiles reported for session durations and engine call latencies
+PERCENTILES = (50, 90, 99)
+
+
+class _Session:
+    __slots__ = ("user", "party_size", "arrival", "preview", "seat_changes", "retries")
+
+    def __init__(self, user, party_size, arrival):
+        self.user = user
+        self.party_size = party_size
+        self.arrival = arrival
+        self.preview = None
+        self.seat_changes = 0
+        self.retries = 0
+
+
+def percentiles(values, points=PERCENTILES):
+    """
+    Return `{point: value}` for the given percentiles of a list of numbers,
+    using the nearest rank.
+    """
+    values = sorted(values)
+    if not values:
+        return {point: None for point in points}
+    return {point: values[min(len(values) - 1, max(0, -(-point * len(values) // 100) - 1))] for point in points}
+
+
+class OnSaleSimulator:
+    """
+    One simulated on-sale: a hall, a seeded random source and an event queue
+    ordered by simulated time, with arrival order breaking ties.
+    """
+    def __init__(self, config=SimulationConfig(), seed=0):
+        self.config = config
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.cinema = Cinema("On-sale", config.rows, config.seats_per_row)
+
+        self._events = []
+        self._sequence = 0
+        self.now = 0.0
+
+        self.bookings = 0
+        self.seats_sold = 0
+        self.cancellations = 0
+        self.abandoned = 0
+        self.turned_away = 0
+        self.gave_up = 0
+        self.confirm_attempts = 0
+        self.conflicts = 0
+        self.retries = 0
+        self.sell_out_time = None
+        self.session_times = []
+        self.engine_times = []
+
+        # Users queue in a waiting room before booking, if the config has one
+        self.waiting_room = None
+        if config.admission_rate is not None:
+            self.waiting_room = WaitingRoom(rate=config.admission_rate, burst=1, max_active=config.max_active,
+                                            session_timeout=float("inf"), queue_timeout=float("inf"),
+                                            clock=lambda: self.now)
+        self.queue_checks = 0
+        self.wait_times = []
+
+    def _schedule(self, delay, kind, payload):
+        self._sequence += 1
+        heapq.heappush(self._events, (self.now + delay, self._sequence, kind, payload))
+
+    def _engine(self, call, *args):
+        # Time one call into the real cinema
+        start_time = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            self.engine_times.append(time.perf_counter() - start_time)
+
+    def _think(self):
+        return self.rng.expovariate(1 / self.config.think_time)
+
+    def _offer(self, session):
+        # Propose default seats, as `book_tickets` does after asking for a number
+        seats = self._engine(self.cinema.allocate_default_seats, session.party_size)
+        if seats is None:
+            self.turned_away += 1
+            self._leave(session)
+            return
+        session.preview = SeatPreview(self.cinema, seats)
+        self._schedule(self._think(), EVENT_DECIDE, session)
+
+    def _leave(self, session):
+        if self.waiting_room is not None:
+            self.waiting_room.leave(session.user)
+
+    def _recheck(self, session):
+        # Ask the waiting room for admission, and come back when the
+        # estimated wait is over if not let in yet
+        self.queue_checks += 1
+        if self.cinema.available_seats == 0:
+            # Sold out: the booking page says so without queueing
+            self.turned_away += 1
+            self.waiting_room.leave(session.user)
+            return
+        admission = self.waiting_room.enter(session.user)
+        if admission.admitted:
+            self.wait_times.append(self.now - session.arrival)
+            self._offer(session)
+        else:
+            self._schedule(max(admission.eta, 1.0 / self.config.admission_rate), EVENT_RECHECK, session)
+
+    def _arrive(self, user):
+        config = self.config
+        session = _Session(user, self.rng.choice(config.party_sizes), self.now)
+        if user + 1 < config.users:
+            self._schedule(self.rng.expovariate(config.arrival_rate), EVENT_ARRIVE, user + 1)
+        if self.waiting_room is not None:
+            self._recheck(session)
+        else:
+            self._offer(session)
+
+    def _decide(self, session):
+        config = self.config
+        roll = self.rng.random()
+        if roll < config.abandon_probability:
+            self.abandoned += 1
+            self._leave(session)
+            return
+
+        if roll < config.abandon_probability + config.change_probability and session.seat_changes < config.max_seat_changes:
+            # Ask for seats from another position, keeping the old ones if that fails
+            session.seat_changes += 1
+            seats = self._engine(self.cinema.allocate_seats_from_position, session.party_size,
+                                 self.rng.randrange(self.cinema.rows), self.rng.randrange(self.cinema.seats_per_row))
+            if seats is not None:
+                session.preview = session.preview.moved_to(seats)
+            self._schedule(self._think(), EVENT_DECIDE, session)
+            return
+
+        self.confirm_attempts += 1
+        booking_id = self.cinema.generate_booking_id()
+        try:
+            self._engine(session.preview.confirm, booking_id)
+        except SeatConflictError:
+            self.conflicts += 1
+            if session.retries >= config.max_retries:
+                self.gave_up += 1
+                self._leave(session)
+                return
+            session.retries += 1
+            self.retries += 1
+            self._offer(session)
+            return
+
+        self._leave(session)
+        self.bookings += 1
+        self.seats_sold += session.party_size
+        self.session_times.append(self.now - session.arrival)
+        if self.sell_out_time is None and self.cinema.available_seats == 0:
+            self.sell_out_time = self.now
+        if self.rng.random() < config.cancel_probability:
+            self._schedule(self.rng.expovariate(1 / config.cancel_delay), EVENT_CANCEL, booking_id)
+
+    def _cancel(self, booking_id):
+        seats = self.cinema.bookings[booking_id]
+        if self._engine(self.cinema.cancel_booking, booking_id):
+            self.cancellations += 1
+            self.seats_sold -= len(seats)
+
+    def run(self):
+        """
+        Run the on-sale until no events are left and return a SimulationReport.
+        """
+        cinema_logger = logging.getLogger("cinema")
+        previous_level = cinema_logger.level
+        cinema_logger.setLevel(logging.CRITICAL)
+
+        handlers = {EVENT_ARRIVE: self._arrive, EVENT_DECIDE: self._decide, EVENT_CANCEL: self._cancel,
+                    EVENT_RECHECK: self._recheck}
+        start_time = time.perf_counter()
+        try:
+            if self.config.users > 0:
+                self._schedule(0.0, EVENT_ARRIVE, 0)
+            while self._events:
+                self.now, _, kind, payload = heapq.heappop(self._events)
+                handlers[kind](payload)
+        finally:
+            cinema_logger.setLevel(previous_level)
+        wall_time = time.perf_counter() - start_time
+
+        return SimulationReport(
+            self.seed, self.config.users, self.bookings, self.seats_sold, self.cancellations, self.abandoned,
+            self.turned_away, self.gave_up, self.confirm_attempts, self.conflicts, self.retries,
+            self.sell_out_time, self.now, percentiles(self.session_times), len(self.engine_times),
+            percentiles(self.engine_times), wall_time, self.queue_checks, percentiles(self.wait_times))
+
+
+def simulate(config=SimulationConfig(), seed=0):
+    """
+    Run one on-sale simulation and return its SimulationReport.
+    """
+    return OnSaleSimulator(config, seed).run()
+
+
+def format_report(report):
+    """
+    Return a report as readable lines of text.
+    """
+    sessions = ", ".join(f"p{point} {value:.1f}s" for point, value in report.session_percentiles.items()
+                         if value is not None)
+    engine = ", ".join(f"p{point} {value * 1e6:.0f}us" for point, value in report.engine_percentiles.items()
+                       if value is not None)
+    sell_out = f"{report.sell_out_time:.1f}s" if report.sell_out_time is not None else "not sold out"
+    conflict_rate = report.conflicts / report.confirm_attempts if report.confirm_attempts else 0.0
+    return "\n".join([
+        f"seed {report.seed}: {report.users} users, {report.bookings} bookings, {report.seats_sold} seats sold, "
+        f"{report.cancellations} cancelled",
+        f"  sold out at {sell_out}, last event at {report.simulated_time:.1f}s; "
+        f"{report.bookings / report.simulated_time if report.simulated_time else 0:.1f} bookings per simulated second",
+        f"  conflicts {report.conflicts}/{report.confirm_attempts} confirmations ({conflict_rate:.1%}), "
+        f"{report.retries} retries, {report.gave_up} gave up, {report.abandoned} abandoned, "
+        f"{report.turned_away} turned away",
+        f"  time to book: {sessions}",
+        *([f"  waiting room: {report.queue_checks} queue checks, waited " +
+           ", ".join(f"p{point} {value:.1f}s" for point, value in report.wait_percentiles.items())]
+          if report.queue_checks else []),
+        f"  engine: {report.engine_calls} calls, {engine}; "
+        f"{report.engine_calls / report.wall_time if report.wall_time else 0:.0f} calls/s, "
+        f"run took {report.wall_time:.2f}s",
+    ])
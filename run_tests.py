@@ -2,7 +2,33 @@ import unittest
 import sys
 
 from tests.unit_tests.test_cinema import TestCinema
+from tests.unit_tests.test_seat_index import TestFreeRunIndex
+from tests.unit_tests.test_seat_scoring import TestSeatScoring
+from tests.unit_tests.test_hall_layout import TestHallLayout
+from tests.unit_tests.test_zones import TestZoneMap
+from tests.unit_tests.test_concurrency import TestConcurrentSessions
+from tests.unit_tests.test_bookings_table import TestBookingsTable
+from tests.unit_tests.test_change_feed import TestChangeFeed
+from tests.unit_tests.test_seat_map_view import TestSeatMapView
+from tests.unit_tests.test_terminal_renderer import TestTerminalRenderer
+from tests.unit_tests.test_booking_export import TestBookingExport
+from tests.unit_tests.test_booking_import import TestBookingImport
+from tests.unit_tests.test_event_stream import TestEventStream
+from tests.unit_tests.test_seat_preview import TestSeatPreview
+from tests.unit_tests.test_waitlist import TestWaitlist
+from tests.unit_tests.test_frozen_cinema import TestFrozenCinema
+from tests.unit_tests.test_startup import TestStartup
+from tests.unit_tests.test_allocator_diff import TestAllocatorDiff
+from tests.unit_tests.test_availability_index import TestAvailabilityIndex
+from tests.unit_tests.test_group_allocator import TestGroupAllocator
+from tests.unit_tests.test_onsale_simulator import TestOnSaleSimulator
+from tests.unit_tests.test_shared_availability import TestSharedAvailability
+from tests.unit_tests.test_idempotency import TestIdempotency
+from tests.unit_tests.test_waiting_room import TestWaitingRoom
+from tests.unit_tests.test_customer_index import TestCustomerIndex
+from tests.unit_tests.test_seat_ranges import TestSeatRanges
 from tests.e2e_tests.test_booking_flow import TestBookingFlow
+from tests.e2e_tests.test_batch_mode import TestBatchMode
 
 def run_all_tests():
     # Create test suite
@@ -11,7 +37,33 @@ def run_all_tests():
     
     # Add test cases
     suite.addTests(loader.loadTestsFromTestCase(TestCinema))
+    suite.addTests(loader.loadTestsFromTestCase(TestFreeRunIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestSeatScoring))
+    suite.addTests(loader.loadTestsFromTestCase(TestHallLayout))
+    suite.addTests(loader.loadTestsFromTestCase(TestZoneMap))
+    suite.addTests(loader.loadTestsFromTestCase(TestConcurrentSessions))
+    suite.addTests(loader.loadTestsFromTestCase(TestBookingsTable))
+    suite.addTests(loader.loadTestsFromTestCase(TestChangeFeed))
+    suite.addTests(loader.loadTestsFromTestCase(TestSeatMapView))
+    suite.addTests(loader.loadTestsFromTestCase(TestTerminalRenderer))
+    suite.addTests(loader.loadTestsFromTestCase(TestBookingExport))
+    suite.addTests(loader.loadTestsFromTestCase(TestBookingImport))
+    suite.addTests(loader.loadTestsFromTestCase(TestEventStream))
+    suite.addTests(loader.loadTestsFromTestCase(TestSeatPreview))
+    suite.addTests(loader.loadTestsFromTestCase(TestWaitlist))
+    suite.addTests(loader.loadTestsFromTestCase(TestFrozenCinema))
+    suite.addTests(loader.loadTestsFromTestCase(TestStartup))
+    suite.addTests(loader.loadTestsFromTestCase(TestAllocatorDiff))
+    suite.addTests(loader.loadTestsFromTestCase(TestAvailabilityIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestGroupAllocator))
+    suite.addTests(loader.loadTestsFromTestCase(TestOnSaleSimulator))
+    suite.addTests(loader.loadTestsFromTestCase(TestSharedAvailability))
+    suite.addTests(loader.loadTestsFromTestCase(TestIdempotency))
+    suite.addTests(loader.loadTestsFromTestCase(TestWaitingRoom))
+    suite.addTests(loader.loadTestsFromTestCase(TestCustomerIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestSeatRanges))
     suite.addTests(loader.loadTestsFromTestCase(TestBookingFlow))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchMode))
     
     # Run tests
     test_runner = unittest.TextTestRunner(verbosity=2)
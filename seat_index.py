@@ -0,0 +1,207 @@
+import bisect
+
+
+class FreeRunIndex:
+    """
+    Index of the maximal runs of free seats in every row of a cinema.
+
+    Each row keeps its runs as sorted, non-overlapping half-open intervals
+    ``[start, end)`` together with a sorted list of run lengths, so that the
+    largest run of a row is known in O(1) and a block can be located with a
+    binary search instead of a scan over the seats.
+    """
+    def __init__(self, rows, seats_per_row, seat_masks=None):
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+
+        # Bit `col_index` of a row mask is set for positions the index tracks
+        full_row = (1 << seats_per_row) - 1
+        self.seat_masks = list(seat_masks) if seat_masks is not None else [full_row] * rows
+
+        self._starts = [[] for _ in range(rows)]
+        self._ends = [[] for _ in range(rows)]
+        self._lengths = [[] for _ in range(rows)]
+
+        for row_index in range(rows):
+            self.reset_row(row_index, [col_index for col_index in range(seats_per_row)
+                                       if self.seat_masks[row_index] >> col_index & 1])
+
+    def reset_row(self, row_index, free_cols):
+        """
+        Rebuild the runs of a row from the given free column indexes.
+        """
+        starts, ends = [], []
+        for col_index in sorted(free_cols):
+            if ends and ends[-1] == col_index:
+                ends[-1] = col_index + 1
+            else:
+                starts.append(col_index)
+                ends.append(col_index + 1)
+
+        self._starts[row_index] = starts
+        self._ends[row_index] = ends
+        self._lengths[row_index] = sorted(end - start for start, end in zip(starts, ends))
+
+    def runs(self, row_index):
+        """
+        Return the free runs of a row as a list of (start, end) tuples.
+        """
+        return list(zip(self._starts[row_index], self._ends[row_index]))
+
+    def largest_run(self, row_index):
+        """
+        Return the length of the longest free run in a row.
+        """
+        lengths = self._lengths[row_index]
+        return lengths[-1] if lengths else 0
+
+    def _remove_length(self, row_index, length):
+        lengths = self._lengths[row_index]
+        del lengths[bisect.bisect_left(lengths, length)]
+
+    def occupy(self, row_index, col_index):
+        """
+        Mark a seat as taken, splitting the free run that contains it.
+        """
+        starts, ends = self._starts[row_index], self._ends[row_index]
+        i = bisect.bisect_right(starts, col_index) - 1
+        if i < 0 or col_index >= ends[i]:
+            return
+
+        start, end = starts[i], ends[i]
+        self._remove_length(row_index, end - start)
+        del starts[i], ends[i]
+
+        # Re-insert the pieces either side of the taken seat
+        if col_index + 1 < end:
+            starts.insert(i, col_index + 1)
+            ends.insert(i, end)
+            bisect.insort(self._lengths[row_index], end - col_index - 1)
+        if start < col_index:
+            starts.insert(i, start)
+            ends.insert(i, col_index)
+            bisect.insort(self._lengths[row_index], col_index - start)
+
+    def release(self, row_index, col_index):
+        """
+        Mark a seat as free, merging it with the neighbouring free runs.
+        """
+        if not self.seat_masks[row_index] >> col_index & 1:
+            return
+
+        starts, ends = self._starts[row_index], self._ends[row_index]
+        i = bisect.bisect_right(starts, col_index) - 1
+        if i >= 0 and col_index < ends[i]:
+            return
+
+        start, end = col_index, col_index + 1
+
+        # Merge with the run ending right before this seat
+        if i >= 0 and ends[i] == col_index:
+            start = starts[i]
+            self._remove_length(row_index, ends[i] - starts[i])
+            del starts[i], ends[i]
+            i -= 1
+
+        # Merge with the run starting right after this seat
+        if i + 1 < len(starts) and starts[i + 1] == col_index + 1:
+            end = ends[i + 1]
+            self._remove_length(row_index, ends[i + 1] - starts[i + 1])
+            del starts[i + 1], ends[i + 1]
+
+        starts.insert(i + 1, start)
+        ends.insert(i + 1, end)
+        bisect.insort(self._lengths[row_index], end - start)
+
+    def occupy_range(self, row_index, start, end):
+        """
+        Mark seats `start` to `end - 1` as taken, trimming or splitting the
+        free runs they fall in with one list update.
+        """
+        starts, ends = self._starts[row_index], self._ends[row_index]
+        first = bisect.bisect_right(ends, start)
+        last = bisect.bisect_left(starts, end)
+        if first >= last:
+            return
+
+        # Only the ends of the first and last runs can stay free
+        pieces = []
+        if starts[first] < start:
+            pieces.append((starts[first], start))
+        if ends[last - 1] > end:
+            pieces.append((end, ends[last - 1]))
+        for i in range(first, last):
+            self._remove_length(row_index, ends[i] - starts[i])
+        starts[first:last] = [piece_start for piece_start, _ in pieces]
+        ends[first:last] = [piece_end for _, piece_end in pieces]
+        for piece_start, piece_end in pieces:
+            bisect.insort(self._lengths[row_index], piece_end - piece_start)
+
+    def release_range(self, row_index, start, end):
+        """
+        Mark seats `start` to `end - 1` as free, merging them with the free
+        runs they touch. Positions the index does not track are left out.
+        """
+        range_mask = ((1 << (end - start)) - 1) << start
+        tracked = self.seat_masks[row_index] & range_mask
+        if tracked != range_mask:
+            # Free each tracked piece of the range on its own
+            while tracked:
+                piece_start = (tracked & -tracked).bit_length() - 1
+                piece_end = piece_start
+                while tracked >> piece_end & 1:
+                    piece_end += 1
+                tracked &= ~(((1 << (piece_end - piece_start)) - 1) << piece_start)
+                self.release_range(row_index, piece_start, piece_end)
+            return
+
+        starts, ends = self._starts[row_index], self._ends[row_index]
+        first = bisect.bisect_left(ends, start)
+        last = bisect.bisect_right(starts, end)
+        if first < last:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+            for i in range(first, last):
+                self._remove_length(row_index, ends[i] - starts[i])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+        bisect.insort(self._lengths[row_index], end - start)
+
+    def find_block(self, row_index, length, target_start):
+        """
+        Find the start column of a free block of `length` seats in a row whose
+        start is closest to `target_start`. Ties go to the right, matching the
+        right-first expansion of the default allocation.
+
+        Return None if the row has no free run long enough.
+        """
+        if self.largest_run(row_index) < length:
+            return None
+
+        starts, ends = self._starts[row_index], self._ends[row_index]
+        best_start = None
+        best_distance = None
+
+        # Walk left from the run at or before the target, then right of it;
+        # distances only grow as we move away so each walk stops early.
+        pivot = bisect.bisect_right(starts, target_start) - 1
+        for i in range(pivot, -1, -1):
+            if best_distance is not None and target_start - (ends[i] - length) > best_distance:
+                break
+            if ends[i] - starts[i] < length:
+                continue
+            start = min(max(target_start, starts[i]), ends[i] - length)
+            distance = abs(start - target_start)
+            if best_distance is None or distance < best_distance:
+                best_start, best_distance = start, distance
+
+        for i in range(pivot + 1, len(starts)):
+            if best_distance is not None and starts[i] - target_start > best_distance:
+                break
+            if ends[i] - starts[i] < length:
+                continue
+            distance = starts[i] - target_start
+            if best_distance is None or distance <= best_distance:
+                best_start, best_distance = starts[i], distance
+
+        return best_start
@@ -0,0 +1,116 @@
+"""
+HTML seat map for the web interface that redraws only what changed.
+"""
+from hall_layout import NO_SEAT, SEAT_BLOCKED, SEAT_COMPANION, SEAT_STANDARD, SEAT_WHEELCHAIR
+
+# Free seats are coloured by seat type, non-seats by their layout type
+FREE_SEAT_SPANS = {
+    SEAT_STANDARD: '<span style="color: #90EE90;">●</span>',  # Available - green
+    SEAT_COMPANION: '<span style="color: #90EE90;">●</span>',  # Available - green
+    SEAT_WHEELCHAIR: '<span style="color: #87CEFA;">♿</span>',  # Wheelchair space - blue
+}
+NON_SEAT_SPANS = {
+    SEAT_BLOCKED: '<span style="color: #666666;">●</span>',  # Blocked - grey
+    NO_SEAT: ' ',  # Aisle or gap
+}
+SELECTED_SPAN = '<span style="color: #FFD700;">●</span>'  # Selected - gold
+BOOKED_SPAN = '<span style="color: #FF6B6B;">●</span>'  # Booked - red
+
+SEAT_SPACING = "   "
+
+
+class SeatMapView:
+    """
+    Seat map of one cinema rendered as HTML, kept in step with the cinema's
+    change feed.
+
+    The view remembers the cinema version it last drew. On the next render it
+    applies only the seat deltas since that version and rebuilds the rows they
+    touch, falling back to a full redraw when the feed no longer reaches back
+    far enough.
+    """
+    def __init__(self, cinema):
+        self.cinema = cinema
+        self.version = None
+        self.full_redraws = 0
+        self.seats_redrawn = 0
+
+        self._cells = []
+        self._rows = []
+        self._row_labels = [f'<span style="color: #ffd700; font-weight: bold;">{cinema.get_row_letter(row_index)}</span>   '
+                            for row_index in range(cinema.rows)]
+
+        # Screen header - let CSS handle the centering
+        separator_length = cinema.seats_per_row * 4
+        self._header = (f'<div class="screen-header">S C R E E N</div>\n'
+                        f'<div style="color: #ffd700; text-align: center; margin-bottom: 20px;">{"═" * separator_length}</div>\n')
+
+        # Column numbers, matching the spacing after row letters
+        footer = "    "
+        for col in range(1, cinema.seats_per_row + 1):
+            footer += f'<span style="color: #ffd700;">{col}</span>' + ("   " if col < 10 else "  ")
+        self._footer = footer
+
+    def _cell(self, row_index, col_index, seat_status):
+        seat_type = self.cinema.seat_type(row_index, col_index)
+        if seat_status == '.':
+            return FREE_SEAT_SPANS[seat_type] + SEAT_SPACING
+        if seat_type in NON_SEAT_SPANS:
+            return NON_SEAT_SPANS[seat_type] + SEAT_SPACING
+        return BOOKED_SPAN + SEAT_SPACING
+
+    def _build_row(self, row_index, cells):
+        return self._row_labels[row_index] + "".join(cells) + "\n"
+
+    def _redraw(self):
+        cinema = self.cinema
+        self._cells = [[self._cell(row_index, col_index, seat_status)
+                        for col_index, seat_status in enumerate(cinema.seating_map[row_index])]
+                       for row_index in range(cinema.rows)]
+        self._rows = [self._build_row(row_index, cells) for row_index, cells in enumerate(self._cells)]
+        self.full_redraws += 1
+
+    def sync(self):
+        """
+        Bring the view up to the cinema's current version and return the
+        number of seats redrawn.
+        """
+        with self.cinema.lock:
+            changes = None if self.version is None else self.cinema.changes_since(self.version)
+            if changes is None:
+                self._redraw()
+                redrawn = self.cinema.rows * self.cinema.seats_per_row
+            else:
+                dirty_rows = set()
+                for _, row_index, col_index, seat_status in changes:
+                    self._cells[row_index][col_index] = self._cell(row_index, col_index, seat_status)
+                    dirty_rows.add(row_index)
+                for row_index in dirty_rows:
+                    self._rows[row_index] = self._build_row(row_index, self._cells[row_index])
+                redrawn = len(changes)
+            self.version = self.cinema.version
+
+        self.seats_redrawn += redrawn
+        return redrawn
+
+    def render(self, highlight_seats=()):
+        """
+        Return the seat map HTML with `highlight_seats` shown as selected.
+        Highlighting is drawn over a copy of the affected rows only.
+        """
+        self.sync()
+
+        rows = list(self._rows)
+        highlights_by_row = {}
+        for row_index, col_index in highlight_seats:
+            highlights_by_row.setdefault(row_index, []).append(col_index)
+        for row_index, col_indexes in highlights_by_row.items():
+            cells = list(self._cells[row_index])
+            for col_index in col_indexes:
+                cells[col_index] = SELECTED_SPAN + SEAT_SPACING
+            rows[row_index] = self._build_row(row_index, cells)
+
+        seating_display = self._header + "".join(rows) + self._footer
+
+        # Wrap in HTML for proper formatting
+        return f'<div style="font-family: monospace; line-height: 1.8; text-align: center;">{seating_display}</div>'
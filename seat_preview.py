@@ -0,0 +1,50 @@
+"""
+Previews of proposed seats drawn over a cinema's seating map.
+"""
+
+
+class SeatPreview:
+    """
+    Overlay of the seats proposed to one customer.
+
+    The cinema's seating map is never written to: renderers draw the overlay
+    on top of it, and allocators keep reading the map itself, so preview
+    seats stay free for everyone else until they are booked. A preview is
+    immutable and private to its session, so any number can be shown at the
+    same time.
+    """
+    def __init__(self, cinema, seats):
+        self.cinema = cinema
+        self.seats = tuple(seats)
+        self._seat_set = frozenset(self.seats)
+
+        # Cinema version the seats were proposed at
+        self.version = cinema.version
+
+    def __contains__(self, seat):
+        return seat in self._seat_set
+
+    def __iter__(self):
+        return iter(self.seats)
+
+    def __len__(self):
+        return len(self.seats)
+
+    def moved_to(self, seats):
+        """
+        Return a preview of other seats for the same customer.
+        """
+        return SeatPreview(self.cinema, seats)
+
+    def conflicts(self):
+        """
+        Return the preview seats that are no longer available.
+        """
+        return [seat for seat in self.seats if not self.cinema.is_seat_available(*seat)]
+
+    def confirm(self, booking_id):
+        """
+        Book the previewed seats, raising SeatConflictError if some were
+        taken since the preview was made.
+        """
+        return self.cinema.confirm_booking(list(self.seats), booking_id, self.version)
@@ -0,0 +1,187 @@
+"""
+Run-length seat ranges, the compact form bookings are stored in.
+
+Allocations are mostly runs of adjacent seats, so a booking is kept as
+`(row_index, start, length)` runs packed three bytes each, instead of one
+`(row_index, col_index)` tuple per seat.
+"""
+from collections import deque
+from itertools import chain, repeat
+from operator import itemgetter
+
+
+class SeatRanges:
+    """
+    Immutable set of seats stored as runs of adjacent seats in a row.
+
+    Runs are kept in label order: row A first, then by seat number, with
+    adjacent runs merged. Iterating yields `(row_index, col_index)` seats in
+    that order, so a SeatRanges can be used wherever a list of seats was.
+    It compares equal to any list or tuple of the same seats, in any order,
+    since a booking's seats have no order of their own. Like those lists it
+    is not hashable, as equal objects must hash alike; use `to_bytes()` as
+    a key instead.
+    """
+    __slots__ = ("_packed",)
+
+    def __init__(self, ranges=()):
+        runs = [(row_index, start, length) for row_index, start, length in ranges if length > 0]
+        if len(runs) > 1:
+            # Label order: rows from A, then by seat number, merging adjacent runs
+            runs.sort(key=itemgetter(1))
+            runs.sort(key=itemgetter(0), reverse=True)
+            merged = [list(runs[0])]
+            for row_index, start, length in runs[1:]:
+                last = merged[-1]
+                if last[0] == row_index and start <= last[1] + last[2]:
+                    if start < last[1] + last[2]:
+                        raise ValueError("Seat ranges must not overlap")
+                    last[2] += length
+                else:
+                    merged.append([row_index, start, length])
+            runs = merged
+        try:
+            self._packed = bytes(chain.from_iterable(runs))
+        except ValueError:
+            raise ValueError("Seat ranges must fit in rows and seats below 256") from None
+
+    @classmethod
+    def from_seats(cls, seats):
+        """
+        Build seat ranges from `(row_index, col_index)` seats, which must
+        not be repeated.
+        """
+        if isinstance(seats, cls):
+            return seats
+
+        if isinstance(seats, (list, tuple)) and seats:
+            # Seats already in one run, as allocated or imported, are checked
+            # against that run in one comparison
+            row_index, start = seats[0]
+            length = len(seats)
+            if seats[-1] == (row_index, start + length - 1) and (
+                    length <= 2 or list(seats) == list(zip(repeat(row_index, length), range(start, start + length)))):
+                seat_ranges = cls.__new__(cls)
+                seat_ranges._packed = bytes((row_index, start, length))
+                return seat_ranges
+
+        # Runs are where the row stays the same and the seat number goes up
+        # by one; rows are then put in label order, keeping seat order
+        runs = []
+        previous_row = previous_col = None
+        for row_index, col_index in sorted(seats):
+            if row_index == previous_row and col_index == previous_col + 1:
+                runs[-1][2] += 1
+            elif row_index == previous_row and col_index == previous_col:
+                raise ValueError("Seats must not be repeated")
+            else:
+                runs.append([row_index, col_index, 1])
+            previous_row, previous_col = row_index, col_index
+        runs.sort(key=itemgetter(0), reverse=True)
+
+        seat_ranges = cls.__new__(cls)
+        seat_ranges._packed = bytes(chain.from_iterable(runs))
+        return seat_ranges
+
+    @classmethod
+    def from_packed_runs(cls, packed_runs):
+        """
+        Return one SeatRanges per `to_bytes()` value of runs that are already
+        merged and in label order, without checking them. The objects are
+        made and filled by `map`, so bulk imports pay no Python call per
+        booking.
+        """
+        seat_ranges = list(map(object.__new__, repeat(cls, len(packed_runs))))
+        deque(map(cls._packed.__set__, seat_ranges, packed_runs), maxlen=0)
+        return seat_ranges
+
+    def ranges(self):
+        """
+        Return the runs as `(row_index, start, length)` tuples.
+        """
+        packed = self._packed
+        if len(packed) == 3:
+            return [tuple(packed)]
+        return list(zip(packed[0::3], packed[1::3], packed[2::3]))
+
+    def row_masks(self):
+        """
+        Return `{row_index: mask}` with bit `col_index` set for each seat.
+        """
+        masks = {}
+        for row_index, start, length in self.ranges():
+            masks[row_index] = masks.get(row_index, 0) | ((1 << length) - 1) << start
+        return masks
+
+    def __iter__(self):
+        for row_index, start, length in self.ranges():
+            for col_index in range(start, start + length):
+                yield row_index, col_index
+
+    def __len__(self):
+        return sum(self._packed[2::3])
+
+    def __contains__(self, seat):
+        row_index, col_index = seat
+        return any(row == row_index and start <= col_index < start + length for row, start, length in self.ranges())
+
+    def __eq__(self, other):
+        if isinstance(other, SeatRanges):
+            return self._packed == other._packed
+        if isinstance(other, (list, tuple)):
+            try:
+                return self == SeatRanges.from_seats(other)
+            except (TypeError, ValueError):
+                return False
+        return NotImplemented
+
+    def __repr__(self):
+        return f"SeatRanges({self.ranges()!r})"
+
+    def to_bytes(self):
+        """
+        Return the packed runs, three bytes per run.
+        """
+        return self._packed
+
+    @classmethod
+    def from_bytes(cls, packed):
+        """
+        Rebuild seat ranges from `to_bytes()` output.
+        """
+        packed = bytes(packed)
+        if len(packed) % 3:
+            raise ValueError("Packed seat ranges must be three bytes per run")
+        return cls((packed[offset], packed[offset + 1], packed[offset + 2]) for offset in range(0, len(packed), 3))
+
+
+def range_labels(get_row_letter, seats):
+    """
+    Return labels for seats, one per run: `A4-A7` for a run and `B5` for a
+    single seat. `get_row_letter` maps a row index to its letter.
+    """
+    labels = []
+    for row_index, start, length in SeatRanges.from_seats(seats).ranges():
+        row_letter = get_row_letter(row_index)
+        if length == 1:
+            labels.append(f"{row_letter}{start + 1}")
+        else:
+            labels.append(f"{row_letter}{start + 1}-{row_letter}{start + length}")
+    return labels
+
+
+def parse_range_label(label):
+    """
+    Split a label such as `A4-A7` or `B5` into `(row_letter, first_number,
+    last_number)`.
+    """
+    first, separator, last = label.partition("-")
+    if not separator:
+        last = first
+    try:
+        row_letter, first_number, last_number = first[0].upper(), int(first[1:]), int(last[1:])
+    except (IndexError, ValueError):
+        raise ValueError(f"Invalid seat label '{label}'") from None
+    if last[0].upper() != row_letter or not 1 <= first_number <= last_number:
+        raise ValueError(f"Invalid seat label '{label}'")
+    return row_letter, first_number, last_number
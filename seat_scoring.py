@@ -0,0 +1,154 @@
+import heapq
+import math
+
+from cinema import EVENT_CANCEL, EVENT_RELEASE
+
+# Scoring profiles
+PROFILE_DEFAULT = "default"
+PROFILE_VIEWING = "viewing"
+
+# Weights of the viewing profile terms
+CENTRE_LINE_WEIGHT = 0.5
+VIEWING_ANGLE_WEIGHT = 0.5
+
+
+def middle_out_rank(seats_per_row, col_index):
+    """
+    Rank of a column in the middle-out order of the default allocation:
+    middle seat first, then alternating right and left of it.
+    """
+    mid_col = seats_per_row // 2
+    if seats_per_row % 2 == 0:
+        mid_col -= 1
+
+    offset = col_index - mid_col
+    if offset > 0:
+        return 2 * offset - 1
+    return -2 * offset
+
+
+def default_score(rows, seats_per_row, row_index, col_index):
+    """
+    Score reproducing the default allocation rule: furthest row from the
+    screen first, then middle-out within the row.
+    """
+    return row_index * 2 * seats_per_row - middle_out_rank(seats_per_row, col_index)
+
+
+def viewing_score(rows, seats_per_row, row_index, col_index):
+    """
+    Score a seat between 0 and 1 from its distance to the screen centre line
+    and its viewing angle to the centre of the screen.
+    """
+    centre_offset = abs(col_index - (seats_per_row - 1) / 2)
+    half_width = max(seats_per_row / 2, 1)
+
+    # Row 0 is the closest to the screen
+    depth = row_index + 1
+    viewing_angle = math.atan2(centre_offset, depth)
+
+    centre_line_score = 1 - centre_offset / half_width
+    viewing_angle_score = 1 - viewing_angle / (math.pi / 2)
+    return CENTRE_LINE_WEIGHT * centre_line_score + VIEWING_ANGLE_WEIGHT * viewing_angle_score
+
+
+PROFILES = {
+    PROFILE_DEFAULT: default_score,
+    PROFILE_VIEWING: viewing_score,
+}
+
+
+def build_score_matrix(rows, seats_per_row, profile=PROFILE_VIEWING):
+    """
+    Precompute the score of every seat for the given profile.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown scoring profile '{profile}'")
+
+    score = PROFILES[profile]
+    return [[score(rows, seats_per_row, row_index, col_index) for col_index in range(seats_per_row)]
+            for row_index in range(rows)]
+
+
+class ScoringAllocator:
+    """
+    Allocate the top-scoring free seats of a cinema.
+
+    Free seats are kept in a max-heap ordered by their precomputed score.
+    Booked seats are dropped lazily when they reach the top of the heap, and
+    cancelled seats are pushed back through a cinema listener, so the scores
+    are never recomputed after construction.
+    """
+    def __init__(self, cinema, profile=PROFILE_VIEWING):
+        self.cinema = cinema
+        self.profile = profile
+        self.scores = build_score_matrix(cinema.rows, cinema.seats_per_row, profile)
+
+        self._heap = []
+        self._in_heap = set()
+        # Keep the lock until the listener is added, so no cancellation is missed
+        with cinema.lock:
+            for row_index in range(cinema.rows):
+                for col_index in range(cinema.seats_per_row):
+                    if cinema.is_seat_allocatable(row_index, col_index):
+                        self._heap.append(self._entry(row_index, col_index))
+                        self._in_heap.add((row_index, col_index))
+            heapq.heapify(self._heap)
+            cinema.add_listener(self._on_seat_change)
+
+    def _entry(self, row_index, col_index):
+        # Ties are broken by the default rule so results are deterministic
+        return (-self.scores[row_index][col_index],
+                -row_index,
+                middle_out_rank(self.cinema.seats_per_row, col_index),
+                row_index,
+                col_index)
+
+    def _on_seat_change(self, event, booking_id, seats):
+        # Seats come back when a booking is cancelled or a hold released
+        if event not in (EVENT_CANCEL, EVENT_RELEASE):
+            return
+        for seat in seats:
+            if seat not in self._in_heap and self.cinema.is_seat_allocatable(*seat):
+                heapq.heappush(self._heap, self._entry(*seat))
+                self._in_heap.add(seat)
+
+    def close(self):
+        """
+        Stop following seat changes of the cinema.
+        """
+        self.cinema.remove_listener(self._on_seat_change)
+
+    def allocate(self, num_tickets):
+        """
+        Suggest the `num_tickets` highest-scoring free seats, best first.
+
+        Return None if there is not enough available seats left.
+        """
+        if num_tickets <= 0:
+            raise ValueError("Number of tickets must be positive")
+
+        # Bookings and the cancel listener change seats and the heap under the same lock
+        with self.cinema.lock:
+            if num_tickets > self.cinema.available_seats:
+                return None
+
+            popped = []
+            allocated_seats = []
+            while self._heap and len(allocated_seats) < num_tickets:
+                entry = heapq.heappop(self._heap)
+                seat = entry[-2:]
+                if self.cinema.is_seat_allocatable(*seat):
+                    popped.append(entry)
+                    allocated_seats.append(seat)
+                else:
+                    # Booked since it was pushed - drop it for good
+                    self._in_heap.discard(seat)
+
+            # Allocation is only a suggestion, so the seats stay in the heap
+            for entry in popped:
+                heapq.heappush(self._heap, entry)
+
+        if len(allocated_seats) < num_tickets:
+            return None
+        return allocated_seats
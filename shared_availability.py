@@ -0,0 +1,218 @@
+"""
+Seat availability of a screening published in shared memory, so worker
+processes can read it without any IPC per request.
+
+The segment holds a header, the hall layout (one seat type byte per
+position) and one availability bitmap per row, with bit `col_index` set
+while the seat is free - the cinema's own `free_masks`, as little-endian
+bytes. A sequence number in the header works as a seqlock: the writer makes
+it odd before changing the bitmaps and even again afterwards, and readers
+retry any read that saw an odd number or a number that changed under them.
+"""
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from cinema import Cinema
+from hall_layout import SEATING_MAP_MARKERS
+
+# Sequence number, rows, seats per row, bytes per bitmap row, title
+HEADER = struct.Struct("<QHHH2x64s")
+SEQUENCE = struct.Struct("<Q")
+
+
+def _segment_size(rows, seats_per_row):
+    return HEADER.size + rows * seats_per_row + rows * ((seats_per_row + 7) // 8)
+
+
+class SharedAvailability:
+    """
+    Writer side: publishes a cinema's availability to a shared memory segment
+    and keeps it current through a cinema listener. Only the rows touched by
+    a change are rewritten. `close()` stops publishing and frees the segment.
+    """
+    def __init__(self, cinema, name=None):
+        self.cinema = cinema
+        self.row_bytes = (cinema.seats_per_row + 7) // 8
+        self._bitmaps = HEADER.size + cinema.rows * cinema.seats_per_row
+
+        self._memory = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=_segment_size(cinema.rows, cinema.seats_per_row))
+        self._sequence = 0
+        # Titles are cut to 64 bytes on a character boundary
+        title = cinema.title.encode()[:64].decode("utf-8", "ignore").encode()
+        with cinema.lock:
+            HEADER.pack_into(self._memory.buf, 0, self._sequence, cinema.rows, cinema.seats_per_row,
+                             self.row_bytes, title)
+            layout = "".join("".join(row) for row in cinema.layout.cells).encode()
+            self._memory.buf[HEADER.size:self._bitmaps] = layout
+            self._write_rows(range(cinema.rows))
+            cinema.add_listener(self._on_seat_change)
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    def _write_rows(self, row_indexes):
+        # Seqlock write: odd while the bitmaps are being changed
+        buf = self._memory.buf
+        SEQUENCE.pack_into(buf, 0, self._sequence + 1)
+        for row_index in row_indexes:
+            offset = self._bitmaps + row_index * self.row_bytes
+            buf[offset:offset + self.row_bytes] = self.cinema.free_masks[row_index].to_bytes(self.row_bytes, "little")
+        self._sequence += 2
+        SEQUENCE.pack_into(buf, 0, self._sequence)
+
+    def _on_seat_change(self, event, booking_id, seats):
+        self._write_rows({row_index for row_index, _ in seats})
+
+    def close(self):
+        """
+        Stop publishing and remove the shared memory segment.
+        """
+        with self.cinema.lock:
+            self.cinema.remove_listener(self._on_seat_change)
+        self._memory.close()
+        self._memory.unlink()
+
+
+class _ConsistentRead:
+    """
+    Context manager pinning one consistent snapshot of a view for the
+    current thread, so a whole frame is drawn from a single version.
+    """
+    def __init__(self, view):
+        self._view = view
+
+    def __enter__(self):
+        pinned = self._view._pinned
+        if getattr(pinned, "depth", 0) == 0:
+            pinned.snapshot = self._view.snapshot()
+        pinned.depth = getattr(pinned, "depth", 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pinned = self._view._pinned
+        pinned.depth -= 1
+        if pinned.depth == 0:
+            pinned.snapshot = None
+
+
+class SharedAvailabilityView:
+    """
+    Reader side: a read-only view of a published screening, attached by name.
+
+    Single-seat checks read straight from shared memory. Holding `view.lock`
+    pins one consistent snapshot of all row bitmaps for the thread, which is
+    how `TerminalRenderer` reads a whole frame, so the view can be rendered
+    like a cinema. Booked and held seats look the same from here, so a
+    current booking is drawn like any other taken seat.
+
+    Python before 3.13 tracks attached segments per resource tracker, so
+    readers there should be started from the writer process (for example
+    with `multiprocessing`) to share its tracker.
+    """
+    # Seating map text is formatted exactly as the cinema does
+    get_row_letter = Cinema.get_row_letter
+    format_seating_map = Cinema.format_seating_map
+    _format_screen_header = Cinema._format_screen_header
+    _format_seating_grid = Cinema._format_seating_grid
+    _format_column_numbers = Cinema._format_column_numbers
+
+    def __init__(self, name):
+        try:
+            self._memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            self._memory = shared_memory.SharedMemory(name=name)
+
+        _, self.rows, self.seats_per_row, self.row_bytes, title = HEADER.unpack_from(self._memory.buf, 0)
+        self.title = title.rstrip(b"\0").decode("utf-8", "ignore")
+        layout_end = HEADER.size + self.rows * self.seats_per_row
+        self._layout = bytes(self._memory.buf[HEADER.size:layout_end]).decode()
+        self._bitmaps = layout_end
+        self._bitmaps_end = layout_end + self.rows * self.row_bytes
+
+        self._pinned = threading.local()
+        self.lock = _ConsistentRead(self)
+        self.retries = 0
+
+    def _read(self, read):
+        # Seqlock read: retry until the sequence was even and unchanged,
+        # yielding the CPU while a write is in progress
+        buf = self._memory.buf
+        while True:
+            before = SEQUENCE.unpack_from(buf, 0)[0]
+            if before & 1 == 0:
+                value = read(buf)
+                if SEQUENCE.unpack_from(buf, 0)[0] == before:
+                    return before, value
+            else:
+                time.sleep(0)
+            self.retries += 1
+
+    def snapshot(self):
+        """
+        Return `(version, row_masks)` from one consistent read, where bit
+        `col_index` of a row mask is set while that seat is free.
+        """
+        pinned = getattr(self._pinned, "snapshot", None)
+        if pinned is not None:
+            return pinned
+
+        row_bytes = self.row_bytes
+        sequence, bitmaps = self._read(lambda buf: bytes(buf[self._bitmaps:self._bitmaps_end]))
+        row_masks = [int.from_bytes(bitmaps[offset:offset + row_bytes], "little")
+                     for offset in range(0, len(bitmaps), row_bytes)]
+        return sequence // 2, row_masks
+
+    @property
+    def version(self):
+        """
+        Number of changes published so far.
+        """
+        return self.snapshot()[0]
+
+    def seat_type(self, row_index, col_index):
+        """
+        Return the layout seat type at a position.
+        """
+        return self._layout[row_index * self.seats_per_row + col_index]
+
+    def is_seat_available(self, row_index, col_index):
+        """
+        Check if a seat is available.
+        """
+        if not (0 <= row_index < self.rows and 0 <= col_index < self.seats_per_row):
+            return False
+        pinned = getattr(self._pinned, "snapshot", None)
+        if pinned is not None:
+            return bool(pinned[1][row_index] >> col_index & 1)
+
+        offset = self._bitmaps + row_index * self.row_bytes + col_index // 8
+        _, byte = self._read(lambda buf: buf[offset])
+        return bool(byte >> (col_index % 8) & 1)
+
+    def seat_marker(self, row_index, col_index, current_booking=None, preview=None):
+        """
+        Return the character a seat is drawn with on the seating map.
+        """
+        if preview is not None and (row_index, col_index) in preview:
+            return "o"
+        seat_type = self.seat_type(row_index, col_index)
+        if seat_type in SEATING_MAP_MARKERS:
+            return SEATING_MAP_MARKERS[seat_type]
+        return "." if self.is_seat_available(row_index, col_index) else "#"
+
+    @property
+    def available_seats(self):
+        """
+        Number of free seats, as on a cinema.
+        """
+        return sum(bin(row_mask).count("1") for row_mask in self.snapshot()[1])
+
+    def close(self):
+        """
+        Detach from the shared memory segment.
+        """
+        self._memory.close()
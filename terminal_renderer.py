@@ -0,0 +1,158 @@
+"""
+Seating map renderer for the command line that redraws only what changed.
+"""
+import logging
+import os
+import shutil
+import sys
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\033[2J\033[H"
+SAVE_CURSOR = "\0337"
+RESTORE_CURSOR = "\0338"
+RESET_SCROLL_REGION = "\033[r"
+
+# Terminal position of the first seat: the map starts with a blank line,
+# the screen text and the separator, and every row starts with "A "
+FIRST_SEAT_LINE = 4
+FIRST_SEAT_COLUMN = 3
+SEAT_WIDTH = 4
+
+
+def supports_ansi(out):
+    """
+    Return True if `out` is a terminal that understands ANSI escapes.
+    """
+    isatty = getattr(out, "isatty", None)
+    if isatty is None or not isatty():
+        return False
+    return os.environ.get("TERM", "") != "dumb"
+
+
+def move_cursor(line, column):
+    return f"\033[{line};{column}H"
+
+
+class TerminalRenderer:
+    """
+    Seating map of one cinema drawn on the terminal, one buffered write per
+    frame.
+
+    On an ANSI terminal the first frame clears the screen and pins the map
+    to the top, with prompts scrolling in the region below it. Later frames
+    only rewrite the seats whose marker changed. When output is not a
+    terminal, or the terminal is too short to pin the map, every frame is
+    written in full in the plain layout of `Cinema.display_seating_map`.
+    """
+    def __init__(self, cinema, out=None, ansi=None):
+        self.cinema = cinema
+        self.logger = logging.getLogger(__name__)
+
+        # Resolved on each render so redirected stdout is picked up
+        self._out = out
+        self._ansi = ansi
+
+        # Markers on screen, and the markers under the preview overlay
+        self._markers = None
+        self._base_markers = None
+        self._base_key = None
+        self._overlay = frozenset()
+        self._terminal_size = None
+        self.full_redraws = 0
+        self.seats_redrawn = 0
+
+    @property
+    def out(self):
+        return self._out if self._out is not None else sys.stdout
+
+    def _frame_markers(self, current_booking):
+        cinema = self.cinema
+        return [[cinema.seat_marker(row_index, col_index, current_booking)
+                 for col_index in range(cinema.seats_per_row)]
+                for row_index in range(cinema.rows)]
+
+    def _full_frame(self, seating_display, terminal_size):
+        # Map lines, plus the blank line written after the map
+        map_lines = seating_display.count("\n") + 1
+        prompt_line = map_lines + 1
+        return (CLEAR_SCREEN + seating_display + "\n"
+                + f"\033[{prompt_line};{terminal_size.lines}r" + move_cursor(prompt_line, 1))
+
+    def _diff_frame(self, cells, overlay):
+        # Rewrite the given cells whose marker differs from what is shown
+        parts = []
+        for row_index, col_index in cells:
+            marker = "o" if (row_index, col_index) in overlay else self._base_markers[row_index][col_index]
+            if marker != self._markers[row_index][col_index]:
+                self._markers[row_index][col_index] = marker
+                parts.append(move_cursor(FIRST_SEAT_LINE + row_index,
+                                         FIRST_SEAT_COLUMN + col_index * SEAT_WIDTH) + marker)
+        if not parts:
+            return "", 0
+        return SAVE_CURSOR + "".join(parts) + RESTORE_CURSOR, len(parts)
+
+    def render(self, current_booking=None, preview=None):
+        """
+        Draw the seating map with current booking and `preview` seats
+        highlighted and return the number of seats redrawn.
+
+        The map under the preview is only rebuilt when the cinema or the
+        current booking changed, so moving a preview around only revisits
+        the seats of the old and new preview.
+        """
+        cinema = self.cinema
+        out = self.out
+        ansi = supports_ansi(out) if self._ansi is None else self._ansi
+        overlay = frozenset(preview or ())
+
+        with cinema.lock:
+            if not ansi:
+                frame = cinema.format_seating_map(current_booking, preview) + "\n"
+                redrawn = cinema.rows * cinema.seats_per_row
+                self.full_redraws += 1
+            else:
+                base_key = (cinema.version, current_booking)
+                base_changed = base_key != self._base_key
+                if base_changed:
+                    self._base_markers = self._frame_markers(current_booking)
+                    self._base_key = base_key
+
+                terminal_size = shutil.get_terminal_size()
+                if self._markers is None or terminal_size != self._terminal_size:
+                    seating_display = cinema.format_seating_map(current_booking, preview)
+                    if seating_display.count("\n") + 3 > terminal_size.lines:
+                        # Too short to pin the map above the prompts
+                        frame = seating_display + "\n"
+                        self._markers = None
+                    else:
+                        frame = self._full_frame(seating_display, terminal_size)
+                        self._markers = [["o" if (row_index, col_index) in overlay else marker
+                                          for col_index, marker in enumerate(row_markers)]
+                                         for row_index, row_markers in enumerate(self._base_markers)]
+                    self._terminal_size = terminal_size
+                    redrawn = cinema.rows * cinema.seats_per_row
+                    self.full_redraws += 1
+                else:
+                    if base_changed:
+                        cells = [(row_index, col_index) for row_index in range(cinema.rows)
+                                 for col_index in range(cinema.seats_per_row)]
+                    else:
+                        cells = sorted(self._overlay | overlay)
+                    frame, redrawn = self._diff_frame(cells, overlay)
+                self._overlay = overlay
+
+        if frame:
+            out.write(frame)
+            out.flush()
+        self.seats_redrawn += redrawn
+        self.logger.debug(f"Rendered seating map for '{cinema.title}', {redrawn} seats redrawn")
+        return redrawn
+
+    def close(self):
+        """
+        Release the pinned map area so the terminal scrolls normally again.
+        """
+        if self._markers is not None:
+            self.out.write(RESET_SCROLL_REGION + move_cursor(self._terminal_size.lines, 1) + "\n")
+            self.out.flush()
+            self._markers = None
@@ -0,0 +1,133 @@
+import unittest
+from io import StringIO
+
+from main import parse_args, run_batch
+from hall_layout import HallLayout
+from seat_ranges import parse_range_label
+
+class TestBatchMode(unittest.TestCase):
+    def run_commands(self, text, layout=None):
+        out = StringIO()
+        errors = run_batch(StringIO(text), out, layout)
+        return errors, out.getvalue().splitlines()
+
+    def test_batch_commands(self):
+        """
+        Test each batch command prints one compact result line.
+        """
+        errors, lines = self.run_commands(
+            "# comment lines and blank lines are skipped\n"
+            "create Inception 8 10\n"
+            "\n"
+            "book 4\n"
+            "book-from 2 B5\n"
+            "lookup BK0002\n"
+            "cancel BK0001\n"
+            "book 1\n"
+        )
+
+        self.assertEqual(errors, 0)
+        self.assertEqual(lines[:6], [
+            "ok",
+            "ok BK0001 A4-A7",
+            "ok BK0002 B5-B6",
+            "ok BK0002 B5-B6",
+            "ok BK0001",
+            "ok BK0003 A5",
+        ])
+        self.assertTrue(lines[6].startswith("6 commands, 0 errors in "))
+
+    def test_batch_errors(self):
+        """
+        Test failing commands report an error and the batch carries on.
+        """
+        errors, lines = self.run_commands(
+            "book 2\n"
+            "create Tenet 30 50\n"
+            "create Tenet 3 3\n"
+            "book 10\n"
+            "book-from 2 Z1\n"
+            "book two\n"
+            "cancel BK0009\n"
+            "refund BK0001\n"
+            "book 9\n"
+        )
+
+        self.assertEqual(errors, 7)
+        self.assertEqual(lines[0], "error No cinema created yet")
+        self.assertEqual(lines[1], "error Maximum number of rows is 26")
+        self.assertEqual(lines[2], "ok")
+        self.assertEqual(lines[3], "error Only 9 seats available")
+        self.assertTrue(lines[4].startswith("error "))
+        self.assertTrue(lines[5].startswith("error "))
+        self.assertEqual(lines[6], "error Booking id BK0009 not found")
+        self.assertEqual(lines[7], "error Unknown command 'refund'")
+        self.assertTrue(lines[8].startswith("ok BK0001 "))
+        self.assertTrue(lines[9].startswith("9 commands, 7 errors in "))
+
+    def test_batch_customers(self):
+        """
+        Test customers attached in a batch can be found by name, email or phone.
+        """
+        errors, lines = self.run_commands(
+            "create Inception 8 10\n"
+            "book 2\n"
+            "book 3\n"
+            "customer BK0001 jane@example.com - Jane Doe\n"
+            "customer BK0002 - 020-7946-0018 John Doe\n"
+            "find doe\n"
+            "find JANE@example.com\n"
+            "find 0207946\n"
+            "cancel BK0001\n"
+            "find jane\n"
+            "customer BK0009 - - Nobody\n"
+        )
+
+        self.assertEqual(errors, 2)
+        self.assertEqual(lines[3:10], [
+            "ok BK0001",
+            "ok BK0002",
+            "ok BK0001,BK0002",
+            "ok BK0001",
+            "ok BK0002",
+            "ok BK0001",
+            "error No bookings found for jane",
+        ])
+        self.assertEqual(lines[10], "error Booking id BK0009 not found")
+
+    def test_batch_with_hall_layout(self):
+        """
+        Test a batch run against a hall layout only takes a title.
+        """
+        layout = HallLayout.from_string("..._..\n..W_..\n")
+        errors, lines = self.run_commands("create Dune Part Two\nbook 4\n", layout)
+
+        self.assertEqual(errors, 0)
+        self.assertEqual(lines[0], "ok")
+        runs = [parse_range_label(label) for label in lines[1].split()[2].split(",")]
+        self.assertEqual(sum(last - first + 1 for _, first, last in runs), 4)
+
+    def test_many_commands(self):
+        """
+        Test a large batch of bookings and cancellations stays consistent.
+        """
+        commands = ["create Oppenheimer 26 50"]
+        for i in range(1, 2001):
+            commands.append("book 3")
+            commands.append(f"cancel BK{i:04d}")
+        errors, lines = self.run_commands("\n".join(commands))
+
+        self.assertEqual(errors, 0)
+        self.assertEqual(len(lines), len(commands) + 1)
+
+    def test_parse_batch_argument(self):
+        """
+        Test the --batch command line option.
+        """
+        self.assertEqual(parse_args(["--batch", "commands.txt"]).batch, "commands.txt")
+        self.assertEqual(parse_args(["--batch", "-"]).batch, "-")
+        self.assertIsNone(parse_args([]).batch)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@ from unittest.mock import patch
 from io import StringIO
 import sys
 
-from main import Cinema, main, book_tickets
+from main import Cinema, main, book_tickets, check_bookings
+from customer_index import Customer
+from hall_layout import HallLayout
 
 class TestBookingFlow(unittest.TestCase):
     def setUp(self):
@@ -234,6 +236,20 @@ class TestBookingFlow(unittest.TestCase):
         output = self.held_output.getvalue()
         self.assertIn("Booking id BK9999 not found", output)
     
+    @patch('builtins.input')
+    def test_check_booking_by_customer(self, mock_input):
+        cinema = Cinema("Following", 5, 10)
+        cinema.book_seats(cinema.allocate_default_seats(2), "BK0001", Customer("Jane Doe", "jane@example.com"))
+        cinema.book_seats(cinema.allocate_default_seats(2), "BK0002", Customer("John Doe"))
+        mock_input.side_effect = ["doe", "jane@example.com", ""]
+
+        check_bookings(cinema)
+
+        output = self.held_output.getvalue()
+        self.assertIn("Bookings matching doe:", output)
+        self.assertIn("BK0002: John Doe", output)
+        self.assertIn("Booking id: BK0001\nCustomer: Jane Doe, jane@example.com", output)
+    
     @patch('builtins.input')
     def test_invalid_menu_option(self, mock_input):
         mock_input.side_effect = [
@@ -317,5 +333,25 @@ class TestBookingFlow(unittest.TestCase):
         self.assertIn("Successfully reserved 3", output)
         self.assertIn("Booking id: BK0002 confirmed", output)
 
+    @patch('builtins.input')
+    def test_booking_with_hall_layout(self, mock_input):
+        layout = HallLayout.from_string("..._..\n..._..\nWC_..")
+        mock_input.side_effect = [
+            "",
+            "Parasite",
+            "1",
+            "3",
+            "",
+            "3"
+        ]
+
+        main(layout)
+
+        output = self.held_output.getvalue()
+        self.assertIn("Movie title cannot be empty", output)
+        self.assertIn("(14 seats available)", output)
+        self.assertIn("Booking id: BK0001 confirmed", output)
+        self.assertIn("(11 seats available)", output)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
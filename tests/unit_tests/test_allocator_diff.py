@@ -0,0 +1,61 @@
+import unittest
+
+from allocator_diff import (REQUEST_DEFAULT, UNSUPPORTED, Case, Hall, Request, build_cinema, diverges,
+                            format_reproduction, naive_engine, reference_engine, run_differential)
+
+class TestAllocatorDiff(unittest.TestCase):
+    def test_naive_engine_matches_reference(self):
+        """
+        Test the plain reading of the allocation rules agrees with the allocators.
+        """
+        result = run_differential(naive_engine, 3000, seed=7)
+
+        self.assertEqual(result.cases, 3000)
+        self.assertEqual(result.skipped, 0)
+        self.assertIsNone(result.divergence)
+        self.assertGreater(result.reference_time, 0)
+        self.assertGreater(result.candidate_time, 0)
+
+    def test_divergence_is_minimized(self):
+        """
+        Test a wrong engine is caught and shrunk to a small reproduction.
+        """
+        def reversed_engine(cinema, request):
+            seats = reference_engine(cinema, request)
+            return seats[::-1] if seats else seats
+
+        result = run_differential(reversed_engine, 3000, seed=7)
+        divergence = result.divergence
+        self.assertIsNotNone(divergence)
+        self.assertNotEqual(divergence.expected, divergence.actual)
+
+        minimized = divergence.minimized
+        self.assertEqual(minimized.request.num_tickets, 2)
+        self.assertEqual(minimized.hall.cells, ("..",))
+        self.assertEqual(minimized.hall.taken, ())
+
+        expected, actual = diverges(minimized, reversed_engine)
+        reproduction = format_reproduction(minimized, expected, actual)
+        namespace = {}
+        exec(reproduction, namespace)
+        self.assertEqual(("seats", tuple(namespace["cinema"].allocate_default_seats(2))), expected)
+
+    def test_unsupported_requests_are_skipped(self):
+        """
+        Test requests an engine declines are counted but not compared.
+        """
+        def default_only(cinema, request):
+            if request.kind != REQUEST_DEFAULT:
+                return UNSUPPORTED
+            return naive_engine(cinema, request)
+
+        result = run_differential(default_only, 500, seed=3)
+        self.assertGreater(result.skipped, 0)
+        self.assertIsNone(result.divergence)
+
+        case = Case(Hall(("..W.",), None, ((0, 1),)), Request(REQUEST_DEFAULT, 2, 0, 0, None))
+        self.assertEqual(build_cinema(case.hall).available_seats, 3)
+        self.assertIsNone(diverges(case, naive_engine))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import random
+import unittest
+
+from availability_index import AvailabilityIndex
+from cinema import Cinema
+from hall_layout import HallLayout
+from zones import ZONE_PREMIUM, ZONE_STANDARD
+
+class TestAvailabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.early = Cinema("Dune", 3, 8)
+        self.late = Cinema("Dune", 3, 8)
+        self.index = AvailabilityIndex()
+        self.index.add(self.early, "Dune 18:00")
+        self.index.add(self.late, "Dune 21:00")
+
+    def test_summaries_follow_bookings(self):
+        """
+        Test free count, largest block and zone counts follow book, cancel and holds.
+        """
+        self.assertEqual(self.index.summary("Dune 18:00").free, 24)
+        self.assertEqual(self.index.summary("Dune 18:00").largest_block, 8)
+
+        self.early.book_seats([(row_index, 3) for row_index in range(3)], "BK0001")
+        summary = self.index.summary("Dune 18:00")
+        self.assertEqual(summary.free, 21)
+        self.assertEqual(summary.largest_block, 4)
+        self.assertEqual(summary.zone_free, self.early.zone_available)
+
+        self.early.cancel_booking("BK0001")
+        self.assertEqual(self.index.summary("Dune 18:00").largest_block, 8)
+
+        self.early.book_seats(self.early.allocate_default_seats(24), "BK0002")
+        self.early.join_waitlist(2)
+        self.early.cancel_booking("BK0002")
+        self.assertEqual(self.index.summary("Dune 18:00").free, 22)
+        self.assertEqual(self.index.summary("Dune 18:00").free, self.early.available_seats)
+
+    def test_search(self):
+        """
+        Test searches find screenings that can seat a party, together or in a zone.
+        """
+        self.early.book_seats([(row_index, 4) for row_index in range(3)], "BK0001")
+        self.late.book_seats([(2, col_index) for col_index in range(8)], "BK0001")
+
+        self.assertEqual(self.index.search(6), ["Dune 18:00", "Dune 21:00"])
+        self.assertEqual(self.index.search(6, together=True), ["Dune 21:00"])
+        self.assertEqual(self.index.search(4, together=True), ["Dune 18:00", "Dune 21:00"])
+        self.assertEqual(self.index.search(8, zone=ZONE_PREMIUM), [])
+        self.assertEqual(self.index.search(7, zone=ZONE_PREMIUM), ["Dune 18:00"])
+        self.assertEqual(self.index.search(8, zone=ZONE_STANDARD), ["Dune 21:00"])
+        self.assertEqual(self.index.search(2, zone="balcony"), [])
+
+        with self.assertRaises(ValueError):
+            self.index.search(0)
+        with self.assertRaises(ValueError):
+            self.index.search(2, together=True, zone=ZONE_PREMIUM)
+
+    def test_wheelchair_spaces_not_counted(self):
+        """
+        Test wheelchair spaces are left out of the summaries, like the allocators do.
+        """
+        cinema = Cinema("Dune", 1, 4, HallLayout.from_string("..WW"))
+        self.index.add(cinema, "Dune 23:00")
+
+        self.assertEqual(self.index.summary("Dune 23:00").free, 2)
+        self.assertNotIn("Dune 23:00", self.index.search(3))
+        self.assertIn("Dune 23:00", self.index.search(2))
+
+    def test_summaries_match_a_full_recount(self):
+        """
+        Test incremental summaries equal a recount after random bookings and cancellations.
+        """
+        rng = random.Random(5)
+        cinema = Cinema("Dune", 5, 9, HallLayout.from_string("W..._...C\n....X....\n.........\n..W...W..\n_........"))
+        self.index.add(cinema, "Dune 23:00")
+
+        for step in range(200):
+            if cinema.bookings and rng.random() < 0.4:
+                cinema.cancel_booking(rng.choice(list(cinema.bookings)))
+            else:
+                seats = cinema.allocate_seats_from_position(rng.randint(1, 4), rng.randrange(5), rng.randrange(9))
+                if seats:
+                    cinema.book_seats(seats, f"BK{step:04d}")
+
+            allocatable = [(row_index, col_index) for row_index in range(cinema.rows)
+                           for col_index in range(cinema.seats_per_row)
+                           if cinema.is_seat_allocatable(row_index, col_index)]
+            summary = self.index.summary("Dune 23:00")
+            self.assertEqual(summary.free, len(allocatable))
+            self.assertEqual(summary.largest_block,
+                             max(cinema.free_runs.largest_run(row_index) for row_index in range(cinema.rows)))
+            for zone in cinema.zones.names:
+                self.assertEqual(summary.zone_free[zone],
+                                 sum(1 for seat in allocatable if cinema.zones.zone_at(*seat) == zone))
+
+    def test_screenings_of_one_title_kept_apart(self):
+        """
+        Test two showings of the same film keep their own keys and summaries.
+        """
+        with self.assertRaises(ValueError):
+            self.index.add(Cinema("Dune", 1, 2), "Dune 21:00")
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.summary("Dune 21:00").free, 24)
+
+        self.early.book_seats([(2, col_index) for col_index in range(8)], "BK0001")
+        self.late.book_seats([(0, 0)], "BK0001")
+        self.assertEqual(self.index.summary("Dune 18:00").free, 16)
+        self.assertEqual(self.index.summary("Dune 21:00").free, 23)
+        self.assertEqual(self.index.summary("Dune 18:00").largest_block, 8)
+        self.assertEqual(self.index.summary("Dune 21:00").largest_block, 8)
+        self.assertEqual(self.index.search(20), ["Dune 21:00"])
+
+        self.late.cancel_booking("BK0001")
+        self.assertEqual(self.index.summary("Dune 18:00").free, 16)
+        self.assertEqual(self.index.summary("Dune 21:00").free, 24)
+
+    def test_add_and_remove(self):
+        """
+        Test screenings can be added once and stop being followed when removed.
+        """
+        with self.assertRaises(ValueError):
+            self.index.add(self.early, "Dune 18:00")
+        with self.assertRaises(TypeError):
+            self.index.add(Cinema("Dune", 3, 8))
+        self.assertEqual(self.early.title, self.late.title)
+        self.assertEqual(len(self.index), 2)
+
+        self.assertTrue(self.index.remove("Dune 18:00"))
+        self.assertFalse(self.index.remove("Dune 18:00"))
+        self.assertNotIn("Dune 18:00", self.index)
+        self.assertEqual(self.early.listeners, [])
+
+        self.early.book_seats([(0, 0)], "BK0001")
+        self.assertEqual(self.index.search(24), ["Dune 21:00"])
+
+        self.index.close()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.late.listeners, [])
+
+if __name__ == '__main__':
+    unittest.main()
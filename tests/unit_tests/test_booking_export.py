@@ -0,0 +1,138 @@
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+
+from booking_export import (BOOKING_FIELDS, export_bookings, export_seats, iter_booking_chunks, iter_booking_records,
+                            iter_seat_records, write_parquet)
+from cinema import Cinema
+from hall_layout import HallLayout
+
+HAS_PARQUET = all(importlib.util.find_spec(name) for name in ("pandas", "pyarrow"))
+
+class TestBookingExport(unittest.TestCase):
+    def setUp(self):
+        self.first = Cinema("Interstellar", 3, 4)
+        self.first.book_seats([(2, 1), (2, 2)], "BK0001")
+        self.first.book_seats([(0, 0)], "BK0002")
+        self.second = Cinema("Tenet", 0, 0, HallLayout.from_string("._X.\n.W.."))
+        self.second.book_seats([(1, 0)], "BK0001")
+
+    def test_booking_records(self):
+        """
+        Test booking records of several screenings come out in one pass.
+        """
+        records = iter_booking_records([self.first, self.second])
+        self.assertEqual(next(records), {"screening": "Interstellar", "booking_id": "BK0001",
+                                         "seats": ["A2-A3"], "seat_count": 2})
+        self.assertEqual([(r["screening"], r["booking_id"]) for r in records],
+                         [("Interstellar", "BK0002"), ("Tenet", "BK0001")])
+
+    def test_seat_records(self):
+        """
+        Test seat records skip gaps and report blocked and booked seats.
+        """
+        records = list(iter_seat_records([self.second]))
+        self.assertEqual([r["seat"] for r in records], ["B1", "B3", "B4", "A1", "A2", "A3", "A4"])
+
+        by_seat = {r["seat"]: r for r in records}
+        self.assertEqual(by_seat["B3"]["status"], "blocked")
+        self.assertEqual(by_seat["A1"]["status"], "booked")
+        self.assertEqual(by_seat["A1"]["booking_id"], "BK0001")
+        self.assertEqual(by_seat["A2"]["seat_type"], "W")
+        self.assertEqual(by_seat["A2"]["status"], "free")
+        self.assertEqual(by_seat["A2"]["booking_id"], "")
+
+    def test_export_csv(self):
+        """
+        Test CSV exports have a header and space separated seat labels.
+        """
+        f = StringIO()
+        self.assertEqual(export_bookings([self.first, self.second], f), 3)
+        rows = list(csv.reader(StringIO(f.getvalue())))
+        self.assertEqual(rows[0], list(BOOKING_FIELDS))
+        self.assertEqual(rows[1], ["Interstellar", "BK0001", "A2-A3", "2"])
+
+        f = StringIO()
+        self.assertEqual(export_seats([self.first], f), 12)
+        self.assertEqual(len(f.getvalue().splitlines()), 13)
+
+    def test_export_jsonl(self):
+        """
+        Test JSONL exports write one object per line.
+        """
+        f = StringIO()
+        self.assertEqual(export_bookings([self.first, self.second], f, "jsonl"), 3)
+        records = [json.loads(line) for line in f.getvalue().splitlines()]
+        self.assertEqual(records[2], {"screening": "Tenet", "booking_id": "BK0001",
+                                      "seats": ["A1"], "seat_count": 1})
+
+        f = StringIO()
+        self.assertEqual(export_seats([self.second], f, "jsonl"), 7)
+
+        with self.assertRaises(ValueError):
+            export_bookings([self.first], StringIO(), "xml")
+
+    def test_export_follows_bookings(self):
+        """
+        Test an export reflects cancellations made before it runs.
+        """
+        self.first.cancel_booking("BK0001")
+        f = StringIO()
+        export_bookings([self.first], f, "jsonl")
+        self.assertEqual([json.loads(line)["booking_id"] for line in f.getvalue().splitlines()], ["BK0002"])
+
+    def test_bookings_in_chunks(self):
+        """
+        Test bookings read in chunks carry on past cancellations without repeats.
+        """
+        cinema = Cinema("Interstellar", 2, 5)
+        for col_index in range(5):
+            cinema.book_seats([(0, col_index)], f"BK{col_index + 1:04d}")
+
+        chunks = iter_booking_chunks(cinema, chunk_size=2)
+        self.assertEqual([booking_id for booking_id, _ in next(chunks)], ["BK0001", "BK0002"])
+        cinema.cancel_booking("BK0002")
+        cinema.book_seats([(1, 0)], "BK0006")
+        self.assertEqual([booking_id for booking_id, _ in next(chunks)], ["BK0003", "BK0004"])
+        cinema.cancel_booking("BK0003")
+        cinema.cancel_booking("BK0004")
+        cinema.cancel_booking("BK0001")
+        self.assertEqual([[booking_id for booking_id, _ in chunk] for chunk in chunks], [["BK0005", "BK0006"]])
+
+        records = iter_booking_records([self.first, self.second], chunk_size=1)
+        self.assertEqual([(r["screening"], r["booking_id"]) for r in records],
+                         [("Interstellar", "BK0001"), ("Interstellar", "BK0002"), ("Tenet", "BK0001")])
+
+    @unittest.skipIf(HAS_PARQUET, "pandas and pyarrow are installed")
+    def test_export_parquet_needs_pyarrow(self):
+        """
+        Test the Parquet writer reports its missing dependencies before writing anything.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bookings.parquet")
+            with self.assertRaisesRegex(ImportError, "pyarrow"):
+                write_parquet(iter_booking_records([self.first]), path, BOOKING_FIELDS)
+            self.assertFalse(os.path.exists(path))
+
+    @unittest.skipUnless(HAS_PARQUET, "pandas and pyarrow are not installed")
+    def test_export_parquet(self):
+        """
+        Test the Parquet writer writes every record across chunks.
+        """
+        import pandas as pd
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bookings.parquet")
+            count = write_parquet(iter_booking_records([self.first, self.second]), path, BOOKING_FIELDS,
+                                  chunk_size=2)
+            self.assertEqual(count, 3)
+            frame = pd.read_parquet(path)
+            self.assertEqual(list(frame["booking_id"]), ["BK0001", "BK0002", "BK0001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
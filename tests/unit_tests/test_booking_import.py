@@ -0,0 +1,135 @@
+import unittest
+from io import StringIO
+
+from booking_export import export_bookings
+from booking_import import import_bookings
+from bookings_table import BookingsTable
+from cinema import Cinema
+from hall_layout import HallLayout
+from seat_map_view import SeatMapView
+from seat_ranges import SeatRanges
+
+class TestBookingImport(unittest.TestCase):
+    def test_import_bookings(self):
+        """
+        Test imported bookings update the map, counters and booking id sequence.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        table = BookingsTable(cinema)
+        view = SeatMapView(cinema)
+        view.render()
+
+        count = cinema.import_bookings([("BK0007", [(2, 0), (2, 1)]), ("COMP01", [(0, 4)])])
+
+        self.assertEqual(count, 2)
+        self.assertEqual(cinema.seating_map[2][:2], ["BK0007", "BK0007"])
+        self.assertEqual(cinema.seating_map[0][4], "COMP01")
+        self.assertEqual(cinema.available_seats, 12)
+        self.assertEqual(sum(cinema.zone_available.values()), 12)
+        self.assertEqual(cinema.free_runs.runs(2), [(2, 5)])
+        self.assertEqual(cinema.version, 1)
+        self.assertEqual(cinema.generate_booking_id(), "BK0008")
+
+        # listeners see the imported bookings, change feed readers redraw once
+        self.assertEqual(table.live_count, 2)
+        self.assertEqual(view.sync(), 15)
+        self.assertEqual(view.full_redraws, 2)
+        self.assertEqual(view.render(), SeatMapView(cinema).render())
+
+        # imported bookings behave like any other
+        cinema.cancel_booking("BK0007")
+        self.assertEqual(cinema.available_seats, 14)
+        self.assertEqual(cinema.allocate_default_seats(2), [(2, 2), (2, 3)])
+
+    def test_import_is_atomic(self):
+        """
+        Test one invalid booking rejects the whole import.
+        """
+        layout = HallLayout.from_string("..X_.")
+        invalid_imports = [
+            [("BK0001", [(0, 0)]), ("BK0002", [(0, 0)])],  # overlap within the import
+            [("BK0001", [(0, 0)]), ("BK0001", [(0, 1)])],  # repeated booking id
+            [("BK0001", [(0, 0)]), ("BK0002", [(0, 2)])],  # blocked seat
+            [("BK0001", [(0, 0)]), ("BK0002", [(0, 3)])],  # aisle
+            [("BK0001", [(0, 0)]), ("BK0002", [(1, 0)])],  # out of range
+            [("BK0001", [(0, 0)]), ("BK0002", [(0, -1)])],  # negative position
+            [("BK0001", [(0, 0)]), ("BK0002", [(0, 1), (0, 1)])],  # repeated seat
+            [("BK0001", [(0, 0), (0, 1)]), ("BK0002", [(0, 1), (0, 2)])],  # overlapping runs
+            [("BK0001", [(0, 0)]), ("BK0002", [])],
+            [("BK0001", [(0, 0)]), ("BK0009", [(0, 4)])],  # booked already
+            [("BK0001", [(0, 1), (0, 0)]), ("BK0002", [(0, 4), (0, 0)])],  # scattered over taken seats
+            [("BK0001", [(0, 0)]), (".", [(0, 1)])],  # seating map marker as id
+            [("BK0001", [(0, 0)]), ("BK0002", SeatRanges([(0, 1, 2)]))],  # run over a blocked seat
+        ]
+        for bookings in invalid_imports:
+            cinema = Cinema("Interstellar", 0, 0, layout)
+            cinema.book_seats([(0, 4)], "BK0009")
+            with self.assertRaises(ValueError):
+                cinema.import_bookings(bookings)
+            self.assertEqual(cinema.bookings, {"BK0009": [(0, 4)]})
+            self.assertEqual(cinema.seating_map[0], [".", ".", "X", " ", "BK0009"])
+            self.assertEqual(cinema.available_seats, 2)
+            self.assertEqual(cinema.version, 1)
+
+        self.assertEqual(Cinema("Interstellar", 0, 0, layout).import_bookings([]), 0)
+
+    def test_import_from_export(self):
+        """
+        Test an export of one screening can be imported into another.
+        """
+        source = Cinema("Interstellar", 4, 6)
+        for num_tickets in (3, 5, 2):
+            source.book_seats(source.allocate_default_seats(num_tickets), source.generate_booking_id())
+        other = Cinema("Tenet", 4, 6)
+        other.book_seats([(0, 0)], other.generate_booking_id())
+
+        for input_format in ("csv", "jsonl"):
+            f = StringIO()
+            export_bookings([source, other], f, input_format)
+            f.seek(0)
+
+            target = Cinema("Interstellar", 4, 6)
+            self.assertEqual(import_bookings(target, f, input_format, screening="Interstellar"), 3)
+            self.assertEqual(target.bookings, source.bookings)
+            self.assertEqual(target.seating_map, source.seating_map)
+            self.assertEqual(target.booking_counter, 3)
+
+        with self.assertRaises(ValueError):
+            import_bookings(Cinema("Interstellar", 4, 6),
+                            StringIO("booking_id,seats\nBK0001,A1 Z9\n"))
+        with self.assertRaises(ValueError):
+            import_bookings(Cinema("Interstellar", 4, 6),
+                            StringIO("booking_id,seats\nBK0001,A1-A3 A2\n"))
+
+    def test_import_ranges(self):
+        """
+        Test range labels are imported as runs, whatever their order.
+        """
+        cinema = Cinema("Interstellar", 4, 6)
+        f = StringIO("booking_id,seats\nBK0001,B5-B6 A1 A2-A3\n")
+        self.assertEqual(import_bookings(cinema, f), 1)
+        self.assertEqual(cinema.bookings["BK0001"].ranges(), [(3, 0, 3), (2, 4, 2)])
+        self.assertEqual(cinema.available_seats, 19)
+
+    def test_import_scattered_seats(self):
+        """
+        Test bookings listed out of order or split over rows are stored as their runs.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        cinema.book_seats([(1, 0)], "BK0001")
+        count = cinema.import_bookings([("BK0002", [(1, 2), (1, 1)]),
+                                        ("BK0003", [(0, 0), (2, 4), (0, 1)]),
+                                        ("BK0004", SeatRanges([(2, 0, 2)]))])
+
+        self.assertEqual(count, 3)
+        self.assertEqual(list(cinema.bookings), ["BK0001", "BK0002", "BK0003", "BK0004"])
+        self.assertEqual(cinema.bookings["BK0002"].ranges(), [(1, 1, 2)])
+        self.assertEqual(cinema.bookings["BK0003"].ranges(), [(2, 4, 1), (0, 0, 2)])
+        self.assertEqual(cinema.seating_map[2], ["BK0004", "BK0004", ".", ".", "BK0003"])
+        self.assertEqual(cinema.free_runs.runs(1), [(3, 5)])
+        self.assertEqual(cinema.available_seats, 7)
+        self.assertEqual(cinema.generate_booking_id(), "BK0005")
+
+
+if __name__ == "__main__":
+    unittest.main()
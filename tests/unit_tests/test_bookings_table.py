@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from bookings_table import BookingsTable
+from cinema import Cinema
+
+class TestBookingsTable(unittest.TestCase):
+    def test_follows_bookings(self):
+        """
+        Test rows are appended on booking and dropped on cancellation.
+        """
+        cinema = Cinema("Interstellar", 5, 5)
+        cinema.book_seats([(4, 2)], "BK0001")
+
+        # existing bookings are picked up
+        table = BookingsTable(cinema)
+        self.assertEqual(table.live_count, 1)
+
+        cinema.book_seats([(4, 3), (4, 4)], "BK0002")
+        cinema.book_seats([(3, 0)], "BK0003")
+        self.assertEqual(table.page(0, 10), [("BK0001", [(4, 2)]), ("BK0002", [(4, 3), (4, 4)]), ("BK0003", [(3, 0)])])
+
+        cinema.cancel_booking("BK0002")
+        self.assertEqual(table.live_count, 2)
+        self.assertEqual(table.page(0, 10), [("BK0001", [(4, 2)]), ("BK0003", [(3, 0)])])
+
+        table.close()
+        cinema.book_seats([(3, 1)], "BK0004")
+        self.assertEqual(table.live_count, 2)
+
+    def test_pagination(self):
+        """
+        Test pages skip cancelled bookings.
+        """
+        cinema = Cinema("Interstellar", 26, 50)
+        table = BookingsTable(cinema)
+        for col in range(50):
+            cinema.book_seats([(0, col)], f"BK{col + 1:04d}")
+        for col in range(0, 50, 3):
+            cinema.cancel_booking(f"BK{col + 1:04d}")
+
+        live = [booking_id for booking_id in cinema.bookings]
+        self.assertEqual(table.page_count(10), 4)
+        pages = [table.page(page, 10) for page in range(4)]
+        self.assertEqual([booking_id for page in pages for booking_id, _ in page], live)
+        self.assertEqual(table.page(4, 10), [])
+
+        with self.assertRaises(ValueError):
+            table.page(0, 0)
+        with self.assertRaises(ValueError):
+            table.page(-1, 10)
+
+    def test_pagination_matches_bookings(self):
+        """
+        Test random bookings and cancellations against the bookings dict.
+        """
+        rng = random.Random(5)
+        cinema = Cinema("Interstellar", 26, 50)
+        table = BookingsTable(cinema)
+        free = [(row, col) for row in range(26) for col in range(50)]
+        rng.shuffle(free)
+        for _ in range(400):
+            if cinema.bookings and rng.random() < 0.3:
+                booking_id = rng.choice(list(cinema.bookings))
+                free.extend(cinema.bookings[booking_id])
+                cinema.cancel_booking(booking_id)
+            else:
+                cinema.book_seats([free.pop()], cinema.generate_booking_id())
+
+            page_size = rng.randint(1, 30)
+            page = rng.randrange(table.page_count(page_size))
+            expected = list(cinema.bookings.items())[page * page_size:(page + 1) * page_size]
+            self.assertEqual(table.page(page, page_size), expected)
+
+    def test_prefix_search(self):
+        """
+        Test searching booking ids by prefix.
+        """
+        cinema = Cinema("Interstellar", 5, 5)
+        table = BookingsTable(cinema)
+        for booking_id in ["BK0001", "BK0010", "BK0011", "BK0100", "VIP01"]:
+            cinema.book_seats(cinema.allocate_default_seats(1), booking_id)
+
+        self.assertEqual(table.search("BK001"), ["BK0010", "BK0011"])
+        self.assertEqual(table.search("BK"), ["BK0001", "BK0010", "BK0011", "BK0100"])
+        self.assertEqual(table.search("BK", limit=2), ["BK0001", "BK0010"])
+        self.assertEqual(table.search("ZZ"), [])
+
+        cinema.cancel_booking("BK0010")
+        self.assertEqual(table.search("BK001"), ["BK0011"])
+
+    def test_seat_labels(self):
+        """
+        Test seats are formatted with row letters and seat numbers.
+        """
+        cinema = Cinema("Interstellar", 5, 5)
+        table = BookingsTable(cinema)
+        self.assertEqual(table.seat_labels([(4, 0), (0, 4)]), "A1, E5")
+
+
+if __name__ == "__main__":
+    unittest.main()
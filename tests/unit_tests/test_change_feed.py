@@ -0,0 +1,46 @@
+import unittest
+
+from change_feed import ChangeFeed
+from cinema import Cinema
+
+class TestChangeFeed(unittest.TestCase):
+    def test_since(self):
+        """
+        Test reading deltas after a version.
+        """
+        feed = ChangeFeed()
+        feed.record(1, [(0, 0), (0, 1)], "BK0001")
+        feed.record(2, [(0, 0)], ".")
+
+        self.assertEqual(feed.since(0), [(1, 0, 0, "BK0001"), (1, 0, 1, "BK0001"), (2, 0, 0, ".")])
+        self.assertEqual(feed.since(1), [(2, 0, 0, ".")])
+        self.assertEqual(feed.since(2), [])
+
+    def test_dropped_deltas(self):
+        """
+        Test readers too far behind are told to start over.
+        """
+        feed = ChangeFeed(size=3)
+        feed.record(1, [(0, 0), (0, 1)], "BK0001")
+        feed.record(2, [(1, 0), (1, 1)], "BK0002")
+
+        # one delta of version 1 was dropped
+        self.assertEqual(feed.floor_version, 1)
+        self.assertIsNone(feed.since(0))
+        self.assertEqual(feed.since(1), [(2, 1, 0, "BK0002"), (2, 1, 1, "BK0002")])
+
+    def test_cinema_changes(self):
+        """
+        Test the cinema records a delta per seat on booking and cancellation.
+        """
+        cinema = Cinema("Interstellar", 3, 3)
+        cinema.book_seats([(2, 1), (2, 2)], "BK0001")
+        cinema.book_seats([(1, 1)], "BK0002")
+        cinema.cancel_booking("BK0001")
+
+        self.assertEqual(cinema.changes_since(1), [(2, 1, 1, "BK0002"), (3, 2, 1, "."), (3, 2, 2, ".")])
+        self.assertEqual(cinema.changes_since(cinema.version), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
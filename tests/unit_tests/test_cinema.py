@@ -1,6 +1,10 @@
 import unittest
+from io import StringIO
+from unittest.mock import patch
 
 from cinema import Cinema
+from hall_layout import HallLayout
+from zones import ZoneMap
 
 class TestCinema(unittest.TestCase):
     def test_initialization(self):
@@ -393,6 +397,192 @@ class TestCinema(unittest.TestCase):
         self.assertEqual(None, cinema.bookings.get(booking_id))
         self.assertEqual(10, cinema.available_seats)
 
+    def test_allocate_contiguous_seats(self):
+        """
+        Test allocating a party as one adjacent block.
+        """
+        cinema = Cinema("Interstellar", 3, 10)
+
+        # empty hall - same seats as the default allocation
+        seats = cinema.allocate_contiguous_seats(4)
+        self.assertEqual(seats, [(2, 3), (2, 4), (2, 5), (2, 6)])
+        self.assertEqual(sorted(seats), sorted(cinema.allocate_default_seats(4)))
+
+        # a booking in the middle of the back row pushes the block aside
+        cinema.book_seats([(2, 4)], "BK0001")
+        self.assertEqual(cinema.allocate_contiguous_seats(4), [(2, 5), (2, 6), (2, 7), (2, 8)])
+
+        # no run long enough in the back row - moves to the next row
+        cinema.book_seats([(2, 1), (2, 7)], "BK0002")
+        self.assertEqual(cinema.allocate_contiguous_seats(4), [(1, 3), (1, 4), (1, 5), (1, 6)])
+
+        # cancelling restores the back row
+        cinema.cancel_booking("BK0001")
+        cinema.cancel_booking("BK0002")
+        self.assertEqual(cinema.allocate_contiguous_seats(4), [(2, 3), (2, 4), (2, 5), (2, 6)])
+
+    def test_allocate_contiguous_seats_edge_cases(self):
+        """
+        Test contiguous allocation when no block is available.
+        """
+        cinema = Cinema("Interstellar", 2, 4)
+        with self.assertRaises(ValueError):
+            cinema.allocate_contiguous_seats(0)
+
+        # wider than a row
+        self.assertIsNone(cinema.allocate_contiguous_seats(5))
+
+        # enough free seats, but not together
+        cinema.book_seats([(0, 1), (0, 2), (1, 1), (1, 2)], "BK0001")
+        self.assertIsNone(cinema.allocate_contiguous_seats(2))
+        self.assertEqual(len(cinema.allocate_default_seats(2)), 2)
+
+    def test_irregular_layout(self):
+        """
+        Test allocation and booking skip aisles, gaps and blocked seats.
+        """
+        layout = HallLayout.from_string("..._...\n..._...\n.X._...")
+        cinema = Cinema("Interstellar", 0, 0, layout)
+        self.assertEqual(cinema.rows, 3)
+        self.assertEqual(cinema.seats_per_row, 7)
+        self.assertEqual(cinema.total_seats, 17)
+        self.assertEqual(cinema.available_seats, 17)
+
+        # aisle and blocked seat are never available
+        self.assertFalse(cinema.is_seat_available(2, 3))
+        self.assertFalse(cinema.is_seat_available(2, 1))
+        with self.assertRaises(ValueError):
+            cinema.book_seats([(2, 3)], "BK0001")
+
+        # middle-out skips the aisle in the middle of the back row
+        seats = cinema.allocate_default_seats(3)
+        self.assertEqual(seats, [(2, 4), (2, 2), (2, 5)])
+
+        # from position skips the blocked seat and the aisle
+        seats = cinema.allocate_seats_from_position(3, 2, 1)
+        self.assertEqual(seats, [(2, 2), (2, 4), (2, 5)])
+
+        # blocks never span the aisle
+        self.assertIsNone(cinema.allocate_contiguous_seats(4))
+        self.assertEqual(cinema.allocate_contiguous_seats(3), [(2, 4), (2, 5), (2, 6)])
+
+        # the whole hall can be sold
+        seats = cinema.allocate_default_seats(17)
+        cinema.book_seats(seats, "BK0001")
+        self.assertEqual(cinema.available_seats, 0)
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(cinema.available_seats, 17)
+
+    def test_irregular_layout_display(self):
+        """
+        Test the seating map shows gaps as blanks and blocked seats as X.
+        """
+        cinema = Cinema("Interstellar", 0, 0, HallLayout.from_string("._X"))
+        with patch('sys.stdout', new=StringIO()) as output:
+            cinema.display_seating_map()
+        self.assertIn("A .       X   ", output.getvalue())
+
+    def test_allocate_accessible_seats(self):
+        """
+        Test wheelchair spaces are kept for accessible allocation.
+        """
+        layout = HallLayout.from_string("......\nWC..CW")
+        cinema = Cinema("Interstellar", 0, 0, layout)
+        self.assertEqual(cinema.seat_type(1, 0), "W")
+
+        # general allocation never hands out wheelchair spaces
+        seats = cinema.allocate_default_seats(10)
+        self.assertNotIn((1, 0), seats)
+        self.assertNotIn((1, 5), seats)
+        self.assertIsNone(cinema.allocate_default_seats(11))
+
+        # two spaces plus companions next to them
+        seats = cinema.allocate_accessible_seats(2, 2)
+        self.assertEqual(sorted(seats), [(1, 0), (1, 1), (1, 4), (1, 5)])
+
+        # companions fall back to standard seats in the same row
+        seats = cinema.allocate_accessible_seats(1, 3)
+        self.assertEqual(seats[0], (1, 0))
+        self.assertEqual(sorted(seats[1:]), [(1, 1), (1, 2), (1, 4)])
+
+        # not enough spaces
+        cinema.book_seats([(1, 0)], "BK0001")
+        self.assertIsNone(cinema.allocate_accessible_seats(2))
+        with self.assertRaises(ValueError):
+            cinema.allocate_accessible_seats(0)
+
+    def test_accessible_seats_with_companions_in_a_later_row(self):
+        """
+        Test a row without room for the companions leaves its spaces for a row with it.
+        """
+        cinema = Cinema("Interstellar", 0, 0, HallLayout.from_string("WC.\nWXX"))
+        self.assertEqual(cinema.allocate_accessible_seats(1, 1), [(0, 0), (0, 1)])
+
+        # spaces are still split across rows, keeping one for the companions' row
+        cinema = Cinema("Interstellar", 0, 0, HallLayout.from_string("WC.\nWWX"))
+        self.assertEqual(sorted(cinema.allocate_accessible_seats(2, 1)), [(0, 0), (0, 1), (1, 1)])
+        self.assertIsNone(cinema.allocate_accessible_seats(1, 3))
+
+    def test_zone_counters(self):
+        """
+        Test per-zone free counters follow bookings and cancellations.
+        """
+        cinema = Cinema("Interstellar", 6, 5)
+        self.assertEqual(cinema.zone_available, {"front-row": 5, "standard": 15, "premium": 10})
+        self.assertEqual(cinema.seats_left("premium"), 10)
+        with self.assertRaises(ValueError):
+            cinema.seats_left("balcony")
+
+        cinema.book_seats([(0, 0), (5, 1), (5, 2)], "BK0001")
+        self.assertEqual(cinema.zone_available, {"front-row": 4, "standard": 15, "premium": 8})
+
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(cinema.zone_available, {"front-row": 5, "standard": 15, "premium": 10})
+
+    def test_zone_restricted_allocation(self):
+        """
+        Test allocators only hand out seats in the requested zone.
+        """
+        zones = ZoneMap.from_string("SSSSS\nSPPPS\nSPPPS", {"S": "standard", "P": "premium"})
+        cinema = Cinema("Interstellar", 3, 5, zones=zones)
+        self.assertEqual(cinema.zone_available, {"standard": 9, "premium": 6})
+
+        seats = cinema.allocate_default_seats(4, "premium")
+        self.assertEqual(seats, [(2, 2), (2, 3), (2, 1), (1, 2)])
+
+        # starting in the side seats skips to the next premium seats
+        seats = cinema.allocate_seats_from_position(3, 2, 0, "premium")
+        self.assertEqual(seats, [(2, 1), (2, 2), (2, 3)])
+
+        seats = cinema.allocate_default_seats(3, "standard")
+        self.assertEqual(seats, [(2, 4), (2, 0), (1, 4)])
+
+        # not enough seats left in the zone
+        self.assertIsNone(cinema.allocate_default_seats(7, "premium"))
+        with self.assertRaises(ValueError):
+            cinema.allocate_default_seats(1, "balcony")
+
+        # zones must match the hall
+        with self.assertRaises(ValueError):
+            Cinema("Interstellar", 4, 5, zones=zones)
+
+    def test_zones_narrower_than_hall(self):
+        """
+        Test seats beyond a narrower zone map book and cancel without a zone.
+        """
+        zones = ZoneMap.from_string("PP\nSS", {"P": "premium", "S": "standard"})
+        cinema = Cinema("Interstellar", 2, 4, zones=zones)
+        self.assertEqual(cinema.zones.seats_per_row, 4)
+        self.assertIsNone(cinema.zones.zone_at(0, 3))
+
+        cinema.book_seats([(0, 3), (1, 0)], "BK0001")
+        self.assertEqual(cinema.available_seats, 6)
+        self.assertEqual(cinema.zone_available, {"premium": 2, "standard": 1})
+
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(cinema.available_seats, 8)
+        self.assertEqual(cinema.zone_available, {"premium": 2, "standard": 2})
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+import unittest
+
+from cinema import Cinema, SeatConflictError
+
+class TestConcurrentSessions(unittest.TestCase):
+    def test_version_tracks_changes(self):
+        """
+        Test the version is bumped by bookings and cancellations only.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        self.assertEqual(cinema.version, 0)
+
+        cinema.allocate_default_seats(2)
+        self.assertEqual(cinema.version, 0)
+
+        cinema.book_seats([(0, 0)], "BK0001")
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(cinema.version, 2)
+
+        # failed bookings leave the map and version untouched
+        cinema.book_seats([(0, 1)], "BK0002")
+        with self.assertRaises(ValueError):
+            cinema.book_seats([(0, 0), (0, 1)], "BK0003")
+        self.assertTrue(cinema.is_seat_available(0, 0))
+        self.assertEqual(cinema.version, 3)
+
+        with self.assertRaises(ValueError):
+            cinema.book_seats([(1, 1), (1, 1)], "BK0004")
+
+    def test_confirm_booking(self):
+        """
+        Test confirming offered seats against the offer version.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        version = cinema.version
+        first = cinema.allocate_default_seats(2)
+        second = cinema.allocate_default_seats(2)
+
+        # both sessions were offered the same seats - only one wins
+        cinema.confirm_booking(first, "BK0001", version)
+        with self.assertRaises(SeatConflictError) as conflict:
+            cinema.confirm_booking(second, "BK0002", version)
+        self.assertEqual(sorted(conflict.exception.seats), sorted(second))
+        self.assertEqual(conflict.exception.version, cinema.version)
+        self.assertNotIn("BK0002", cinema.bookings)
+
+        # seats untouched by the other booking can still be confirmed
+        cinema.confirm_booking([(0, 0)], "BK0002", version)
+        self.assertEqual(cinema.bookings["BK0002"], [(0, 0)])
+
+    def test_many_concurrent_sessions(self):
+        """
+        Test many sessions booking the same hall never double-book a seat.
+        """
+        cinema = Cinema("Interstellar", 15, 20)
+        num_sessions = 60
+        rng = random.Random(11)
+        party_sizes = [rng.randint(1, 6) for _ in range(num_sessions)]
+        start = threading.Barrier(num_sessions)
+        results = {}
+        conflicts = []
+
+        def session(index):
+            start.wait()
+            booking_id = cinema.generate_booking_id()
+            while True:
+                # Offer seats, give the customer a moment, then confirm
+                with cinema.lock:
+                    seats = cinema.allocate_default_seats(party_sizes[index])
+                    version = cinema.version
+                if not seats:
+                    results[index] = None
+                    return
+                time.sleep(0.001)
+                try:
+                    cinema.confirm_booking(seats, booking_id, version)
+                    results[index] = (booking_id, seats)
+                    return
+                except SeatConflictError:
+                    conflicts.append(index)
+
+        threads = [threading.Thread(target=session, args=(index,)) for index in range(num_sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        booked = [result for result in results.values() if result]
+        self.assertEqual(len(results), num_sessions)
+
+        # every booked seat belongs to exactly one booking
+        all_seats = [seat for _, seats in booked for seat in seats]
+        self.assertEqual(len(all_seats), len(set(all_seats)))
+        for booking_id, seats in booked:
+            for row, col in seats:
+                self.assertEqual(cinema.seating_map[row][col], booking_id)
+
+        # the hall has room for everyone, so every session gets its seats
+        self.assertEqual(len(booked), num_sessions)
+        self.assertEqual(cinema.available_seats, cinema.total_seats - sum(party_sizes))
+        self.assertEqual(cinema.version, num_sessions)
+        self.assertGreater(len(conflicts), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
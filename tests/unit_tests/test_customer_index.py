@@ -0,0 +1,127 @@
+import unittest
+
+from cinema import Cinema
+from customer_index import Customer, CustomerIndex, format_customer, guess_field, normalize
+
+class TestCustomerIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = CustomerIndex()
+        self.index.add("BK0001", Customer("Jane Doe", "jane@example.com", "+44 20 7946 0018"))
+        self.index.add("BK0002", Customer("John Doe", "JOHN@example.com"))
+        self.index.add("BK0003", Customer("Janet  Smith", phone="020 7946 0099"))
+        self.index.add("BK0004", Customer("jane doe"))
+
+    def test_normalize(self):
+        """
+        Test values are indexed case-insensitively, and phone numbers by their digits.
+        """
+        self.assertEqual(normalize("name", "  Jane   DOE "), "jane doe")
+        self.assertEqual(normalize("email", " Jane@Example.COM"), "jane@example.com")
+        self.assertEqual(normalize("phone", "+44 (20) 7946-0018"), "442079460018")
+        with self.assertRaises(ValueError):
+            normalize("address", "1 High Street")
+
+        self.assertEqual(guess_field("jane@example.com"), "email")
+        self.assertEqual(guess_field("020 7946"), "phone")
+        self.assertEqual(guess_field("Jane"), "name")
+
+    def test_exact_matches(self):
+        """
+        Test exact lookups by each field, in booking order.
+        """
+        self.assertEqual(self.index.find("name", "JANE DOE"), ["BK0001", "BK0004"])
+        self.assertEqual(self.index.find("email", "john@EXAMPLE.com"), ["BK0002"])
+        self.assertEqual(self.index.find("phone", "442079460018"), ["BK0001"])
+        self.assertEqual(self.index.find("name", "Jane"), [])
+
+    def test_prefix_matches(self):
+        """
+        Test prefix searches on whole values and on later words of names.
+        """
+        self.assertEqual(self.index.search("name", "jan"), ["BK0001", "BK0004", "BK0003"])
+        self.assertEqual(self.index.search("name", "Doe"), ["BK0001", "BK0002", "BK0004"])
+        self.assertEqual(self.index.search("name", "jan", limit=2), ["BK0001", "BK0004"])
+        self.assertEqual(self.index.search("email", "jo"), ["BK0002"])
+        self.assertEqual(self.index.search("phone", "020 7946"), ["BK0003"])
+        self.assertEqual(self.index.search("name", "   "), [])
+
+        # Exact matches come first
+        self.assertEqual(self.index.lookup("Janet Smith"), ["BK0003"])
+        self.assertEqual(self.index.lookup("jane doe"), ["BK0001", "BK0004"])
+        self.assertEqual(self.index.lookup("Doe"), ["BK0001", "BK0002", "BK0004"])
+        self.assertEqual(self.index.lookup("jane@"), ["BK0001"])
+
+    def test_remove_and_replace(self):
+        """
+        Test removed and replaced customers drop out of every index.
+        """
+        self.assertTrue(self.index.remove("BK0001"))
+        self.assertFalse(self.index.remove("BK0001"))
+        self.assertEqual(self.index.find("name", "jane doe"), ["BK0004"])
+        self.assertEqual(self.index.search("email", "jane"), [])
+        self.assertEqual(self.index.search("phone", "44"), [])
+
+        self.index.add("BK0004", Customer("Joan Doe"))
+        self.assertEqual(self.index.find("name", "jane doe"), [])
+        self.assertEqual(self.index.search("name", "doe"), ["BK0002", "BK0004"])
+        self.assertEqual(len(self.index), 3)
+
+        with self.assertRaises(ValueError):
+            self.index.add("BK0005", Customer())
+
+    def test_cinema_bookings(self):
+        """
+        Test customers follow bookings through booking, cancellation, holds and freezing.
+        """
+        cinema = Cinema("Inception", 2, 5)
+        cinema.book_seats(cinema.allocate_default_seats(2), "BK0001", Customer("Jane Doe", "jane@example.com"))
+        cinema.confirm_booking(cinema.allocate_default_seats(3), "BK0002", cinema.version, Customer("John Doe"))
+        cinema.book_seats(cinema.allocate_default_seats(5), "BK0003")
+        self.assertEqual(cinema.find_bookings("doe"), ["BK0001", "BK0002"])
+        self.assertEqual(format_customer(cinema.customers.get("BK0001")), "Jane Doe, jane@example.com")
+        self.assertIsNone(cinema.customers.get("BK0003"))
+
+        cinema.set_customer("BK0003", Customer(phone="07700 900123"))
+        self.assertEqual(cinema.find_bookings("07700900123"), ["BK0003"])
+        with self.assertRaises(ValueError):
+            cinema.set_customer("BK0009", Customer("Nobody"))
+
+        thawed = cinema.freeze().thaw()
+        self.assertEqual(thawed.find_bookings("doe"), ["BK0001", "BK0002"])
+        self.assertEqual(thawed.customers.get("BK0003"), Customer(None, None, "07700 900123"))
+
+        entry_id = cinema.join_waitlist(2)
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(cinema.find_bookings("jane"), [])
+        hold_id = cinema.entry_holds[entry_id]
+        booking_id = cinema.confirm_hold(hold_id, customer=Customer("Janet Smith"))
+        self.assertEqual(cinema.find_bookings("jane"), [booking_id])
+
+    def test_invalid_customer_leaves_no_trace(self):
+        """
+        Test a booking or hold confirmation with an empty customer changes nothing.
+        """
+        cinema = Cinema("Inception", 2, 5)
+        events = []
+        cinema.add_listener(lambda event, booking_id, seats: events.append(event))
+        with self.assertRaises(ValueError):
+            cinema.book_seats([(0, 0)], "BK0001", Customer())
+        self.assertTrue(cinema.is_seat_available(0, 0))
+        self.assertNotIn("BK0001", cinema.bookings)
+        self.assertEqual(cinema.available_seats, 10)
+        self.assertEqual(cinema.version, 0)
+
+        cinema.book_seats(cinema.allocate_default_seats(10), "BK0001")
+        entry_id = cinema.join_waitlist(2)
+        cinema.cancel_booking("BK0001")
+        hold_id = cinema.entry_holds[entry_id]
+        version = cinema.version
+        with self.assertRaises(ValueError):
+            cinema.confirm_hold(hold_id, "BK0002", Customer())
+        self.assertIn(hold_id, cinema.holds)
+        self.assertNotIn("BK0002", cinema.bookings)
+        self.assertEqual(cinema.version, version)
+        self.assertEqual(events, ["book", "cancel", "hold"])
+
+if __name__ == '__main__':
+    unittest.main()
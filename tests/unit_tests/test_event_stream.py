@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from cinema import EVENT_BOOK, EVENT_CANCEL, Cinema
+from event_stream import (OVERFLOW_BLOCK, OVERFLOW_DISCONNECT, OVERFLOW_DROP_OLDEST, EventStream,
+                          SubscriptionClosed)
+
+class TestEventStream(unittest.TestCase):
+    def setUp(self):
+        self.cinema = Cinema("Interstellar", 5, 10)
+        self.stream = EventStream(self.cinema)
+
+    def tearDown(self):
+        self.stream.close()
+
+    def book(self, count):
+        for _ in range(count):
+            self.cinema.book_seats(self.cinema.allocate_default_seats(1), self.cinema.generate_booking_id())
+
+    def test_sync_iteration(self):
+        """
+        Test book and cancel events reach a subscriber in order.
+        """
+        subscription = self.stream.subscribe()
+        self.cinema.book_seats([(4, 4), (4, 5)], "BK0001")
+        self.cinema.cancel_booking("BK0001")
+        self.stream.close()
+
+        events = list(subscription)
+        self.assertEqual([(e.sequence, e.event, e.booking_id, e.seats, e.version) for e in events], [
+            (1, EVENT_BOOK, "BK0001", ((4, 4), (4, 5)), 1),
+            (2, EVENT_CANCEL, "BK0001", ((4, 4), (4, 5)), 2),
+        ])
+        with self.assertRaises(SubscriptionClosed):
+            subscription.get()
+
+    def test_get_timeout(self):
+        """
+        Test get gives up when no event arrives in time.
+        """
+        subscription = self.stream.subscribe()
+        with self.assertRaises(TimeoutError):
+            subscription.get(timeout=0.01)
+
+    def test_drop_oldest(self):
+        """
+        Test a full drop-oldest queue keeps the newest events.
+        """
+        subscription = self.stream.subscribe(max_size=3, overflow=OVERFLOW_DROP_OLDEST)
+        self.book(10)
+        self.assertTrue(self.stream.flush(timeout=5))
+
+        self.assertEqual(subscription.dropped, 7)
+        self.assertEqual([subscription.get().sequence for _ in range(3)], [8, 9, 10])
+
+    def test_disconnect(self):
+        """
+        Test a full disconnect queue closes the subscription but keeps what it got.
+        """
+        subscription = self.stream.subscribe(max_size=3, overflow=OVERFLOW_DISCONNECT)
+        other = self.stream.subscribe(max_size=100)
+        self.book(5)
+        self.assertTrue(self.stream.flush(timeout=5))
+
+        self.assertTrue(subscription.disconnected)
+        self.assertEqual([event.sequence for event in subscription], [1, 2, 3])
+        self.assertEqual(self.stream.subscriber_count, 1)
+        self.assertEqual(other.pending(), 5)
+
+    def test_block_does_not_stall_bookings(self):
+        """
+        Test a blocking subscriber that is not reading never holds up bookings
+        and loses no events once it reads again.
+        """
+        subscription = self.stream.subscribe(max_size=1, overflow=OVERFLOW_BLOCK)
+
+        start_time = time.perf_counter()
+        self.book(40)
+        self.assertLess(time.perf_counter() - start_time, 2)
+        self.assertEqual(self.cinema.available_seats, 10)
+        self.assertFalse(self.stream.flush(timeout=0.05))
+
+        sequences = [subscription.get(timeout=5).sequence for _ in range(40)]
+        self.assertEqual(sequences, list(range(1, 41)))
+        self.assertEqual(subscription.dropped, 0)
+        self.assertTrue(self.stream.flush(timeout=5))
+
+    def test_block_does_not_starve_others(self):
+        """
+        Test a blocking subscriber that is not reading holds back only its
+        own events, and loses the oldest once it falls a buffer behind.
+        """
+        self.stream.close()
+        self.stream = EventStream(self.cinema, buffer_size=10)
+        blocked = self.stream.subscribe(max_size=1, overflow=OVERFLOW_BLOCK)
+        other = self.stream.subscribe(max_size=100, overflow=OVERFLOW_DROP_OLDEST)
+
+        for sequence in range(1, 31):
+            self.book(1)
+            self.assertEqual(other.get(timeout=5).sequence, sequence)
+        self.assertEqual(other.dropped, 0)
+
+        # only the last 10 events were kept for the blocked subscriber
+        sequences = [blocked.get(timeout=5).sequence for _ in range(11)]
+        self.assertEqual(sequences, [1] + list(range(21, 31)))
+        self.assertEqual(blocked.dropped, 19)
+        self.assertTrue(self.stream.flush(timeout=5))
+
+        with self.assertRaises(ValueError):
+            EventStream(self.cinema, buffer_size=0)
+
+    def test_async_iteration(self):
+        """
+        Test events published from another thread reach an async for loop.
+        """
+        subscription = self.stream.subscribe()
+
+        async def consume():
+            received = []
+            async for event in subscription:
+                received.append(event.booking_id)
+                if len(received) == 3:
+                    break
+            return received
+
+        publisher = threading.Timer(0.02, self.book, args=(3,))
+        publisher.start()
+        received = asyncio.run(consume())
+        publisher.join()
+        self.assertEqual(received, ["BK0001", "BK0002", "BK0003"])
+
+    def test_close_subscription(self):
+        """
+        Test a closed subscription stops receiving and ends iteration.
+        """
+        subscription = self.stream.subscribe()
+        self.book(1)
+        self.assertTrue(self.stream.flush(timeout=5))
+        subscription.close()
+        self.book(1)
+        self.assertTrue(self.stream.flush(timeout=5))
+
+        self.assertEqual(list(subscription), [])
+        self.assertEqual(self.stream.subscriber_count, 0)
+
+    def test_invalid_subscription(self):
+        """
+        Test invalid queue sizes and policies are rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.stream.subscribe(max_size=0)
+        with self.assertRaises(ValueError):
+            self.stream.subscribe(overflow="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
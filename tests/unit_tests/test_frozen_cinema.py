@@ -0,0 +1,84 @@
+import unittest
+
+from cinema import Cinema
+from frozen_cinema import FrozenCinema
+from hall_layout import HallLayout
+from zones import ZoneMap
+
+class TestFrozenCinema(unittest.TestCase):
+    def setUp(self):
+        layout = HallLayout.from_string("W...._....\n....._....\n....._....")
+        self.cinema = Cinema("Inception", 3, 10, layout, ZoneMap.default_tiers(3, 10))
+        self.cinema.book_seats(self.cinema.allocate_default_seats(4), "BK0001")
+        self.cinema.book_seats([(0, 9), (0, 8)], "BK0002")
+
+    def test_queries_without_thawing(self):
+        """
+        Test availability and booking lookups work on the frozen bytes.
+        """
+        frozen = self.cinema.freeze()
+
+        self.assertIsInstance(frozen, FrozenCinema)
+        self.assertEqual(frozen.available_seats, self.cinema.available_seats)
+        self.assertEqual(frozen.booking_ids(), ["BK0001", "BK0002"])
+        self.assertEqual(frozen.get_booking("BK0002"), [(0, 9), (0, 8)])
+        self.assertEqual(frozen.get_booking("BK0001"), self.cinema.bookings["BK0001"])
+        self.assertIsNone(frozen.get_booking("BK0003"))
+        self.assertIsNone(frozen.get_booking("BK000"))
+
+        for row_index in range(-1, 4):
+            for col_index in range(-1, 11):
+                self.assertEqual(frozen.is_seat_available(row_index, col_index),
+                                 self.cinema.is_seat_available(row_index, col_index))
+        for zone in self.cinema.zones.names:
+            self.assertEqual(frozen.seats_left(zone), self.cinema.seats_left(zone))
+        with self.assertRaises(ValueError):
+            frozen.seats_left("Balcony")
+
+        with self.assertRaises(AttributeError):
+            frozen.extra = 1
+
+    def test_thaw_restores_state(self):
+        """
+        Test a thawed cinema matches the original and keeps working.
+        """
+        cinema = self.cinema
+        cinema.book_seats([(row_index, col_index) for row_index in range(cinema.rows)
+                           for col_index in range(cinema.seats_per_row)
+                           if cinema.is_seat_allocatable(row_index, col_index)], "BK0003")
+        cinema.join_waitlist(2)
+        cinema.join_waitlist(3, priority=-1)
+        cinema.cancel_booking("BK0002")
+        self.assertEqual(len(cinema.holds), 1)
+
+        thawed = cinema.freeze().thaw()
+
+        self.assertEqual(thawed.format_seating_map(), cinema.format_seating_map())
+        self.assertEqual(thawed.bookings, cinema.bookings)
+        self.assertEqual(thawed.holds, cinema.holds)
+        self.assertEqual(thawed.entry_holds, cinema.entry_holds)
+        self.assertEqual(thawed.waitlist.entries(), cinema.waitlist.entries())
+        self.assertEqual(thawed.free_masks, cinema.free_masks)
+        self.assertEqual(thawed.zone_available, cinema.zone_available)
+        self.assertEqual(thawed.version, cinema.version)
+        self.assertEqual(thawed.generate_booking_id(), cinema.generate_booking_id())
+
+        hold_id = next(iter(thawed.holds))
+        self.assertTrue(thawed.release_hold(hold_id))
+        self.assertTrue(cinema.release_hold(hold_id))
+        self.assertEqual(thawed.format_seating_map(), cinema.format_seating_map())
+
+    def test_memory_footprint(self):
+        """
+        Test frozen screenings are much smaller than live ones.
+        """
+        live = self.cinema.memory_footprint()
+        frozen = self.cinema.freeze().memory_footprint()
+
+        self.assertEqual(live["total"], sum(size for name, size in live.items() if name != "total"))
+        self.assertIn("bookings", live)
+        self.assertIn("_state", frozen)
+        self.assertLess(frozen["total"] * 5, live["total"])
+
+if __name__ == '__main__':
+    unittest.main()
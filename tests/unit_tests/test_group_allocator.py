@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from cinema import Cinema
+from group_allocator import allocate_group_seats, count_blocks, plan_group_seats, rows_spanned
+from hall_layout import HallLayout
+
+class TestGroupAllocator(unittest.TestCase):
+    def test_small_party_in_one_block(self):
+        """
+        Test a party that fits in a row gets one centred block in the back row.
+        """
+        cinema = Cinema("Oppenheimer", 5, 10)
+        plan = plan_group_seats(cinema, 4)
+
+        self.assertEqual(plan.seats, [(4, 3), (4, 4), (4, 5), (4, 6)])
+        self.assertEqual(plan.seats, cinema.allocate_contiguous_seats(4))
+        self.assertEqual((plan.rows_spanned, plan.blocks, plan.optimal, plan.fallback), (1, 1, True, False))
+
+    def test_large_party_spans_fewest_rows(self):
+        """
+        Test a large party is kept in fewer rows and blocks than the default allocation.
+        """
+        cinema = Cinema("Oppenheimer", 6, 10)
+        # Back rows broken up by single booked seats, front rows empty
+        cinema.book_seats([(5, 2), (5, 7), (4, 4), (3, 5)], "BK0001")
+
+        plan = plan_group_seats(cinema, 20)
+        default_seats = cinema.allocate_default_seats(20)
+
+        self.assertEqual(len(set(plan.seats)), 20)
+        self.assertTrue(all(cinema.is_seat_allocatable(*seat) for seat in plan.seats))
+        self.assertEqual(plan.rows_spanned, 2)
+        self.assertEqual(plan.blocks, 2)
+        self.assertEqual(plan.blocks, count_blocks(plan.seats))
+        self.assertEqual({row_index for row_index, _ in plan.seats}, {1, 2})
+        self.assertGreater(rows_spanned(default_seats), plan.rows_spanned)
+        self.assertGreater(count_blocks(default_seats), plan.blocks)
+
+    def test_rows_spanned_is_minimal(self):
+        """
+        Test no window of fewer rows has enough free seats for the party.
+        """
+        rng = random.Random(11)
+        for _ in range(50):
+            cinema = Cinema("Oppenheimer", 6, 9, HallLayout.from_string("..W._.W..\n" * 6))
+            taken = [(row_index, col_index) for row_index in range(6) for col_index in range(9)
+                     if cinema.is_seat_available(row_index, col_index) and rng.random() < 0.5]
+            if taken:
+                cinema.book_seats(taken, "BK0001")
+            num_tickets = rng.randint(1, 12)
+
+            plan = plan_group_seats(cinema, num_tickets)
+            free = [sum(cinema.is_seat_allocatable(row_index, col_index) for col_index in range(9))
+                    for row_index in range(6)]
+            if sum(free) < num_tickets:
+                self.assertIsNone(plan)
+                continue
+
+            self.assertEqual(len(set(plan.seats)), num_tickets)
+            self.assertTrue(all(cinema.is_seat_allocatable(*seat) for seat in plan.seats))
+            fits = [height for height in range(1, 7)
+                    if any(sum(free[first:first + height]) >= num_tickets for first in range(7 - height))]
+            self.assertEqual(plan.rows_spanned, fits[0])
+
+    def test_fallback_when_out_of_time(self):
+        """
+        Test the default allocation is used when the search has no time.
+        """
+        cinema = Cinema("Oppenheimer", 6, 10)
+        cinema.book_seats([(5, 2), (5, 7)], "BK0001")
+
+        plan = plan_group_seats(cinema, 20, time_budget=0)
+        self.assertTrue(plan.fallback)
+        self.assertFalse(plan.optimal)
+        self.assertEqual(plan.seats, cinema.allocate_default_seats(20))
+
+    def test_not_enough_seats(self):
+        """
+        Test parties larger than the free seats get None, and empty parties an error.
+        """
+        cinema = Cinema("Oppenheimer", 2, 3, HallLayout.from_string("W..\n..."))
+        self.assertIsNone(allocate_group_seats(cinema, 6))
+        self.assertEqual(len(allocate_group_seats(cinema, 5)), 5)
+        with self.assertRaises(ValueError):
+            allocate_group_seats(cinema, 0)
+
+if __name__ == '__main__':
+    unittest.main()
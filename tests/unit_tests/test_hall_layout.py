@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from hall_layout import (NO_SEAT, SEAT_BLOCKED, SEAT_COMPANION, SEAT_STANDARD, SEAT_WHEELCHAIR,
+                         HallLayout)
+
+LAYOUT = """
+# front row is staggered
+ ..._.
+...._..
+WC.._XC
+"""
+
+class TestHallLayout(unittest.TestCase):
+    def test_rectangle(self):
+        """
+        Test a rectangular layout has only standard seats.
+        """
+        layout = HallLayout.rectangle(3, 4)
+        self.assertEqual(layout.rows, 3)
+        self.assertEqual(layout.seats_per_row, 4)
+        self.assertEqual(layout.seat_count, 12)
+        self.assertEqual(layout.seat_masks, [0b1111] * 3)
+        self.assertEqual(layout.seat_type(2, 3), SEAT_STANDARD)
+
+    def test_from_string(self):
+        """
+        Test parsing seat types, gaps, comments and padding.
+        """
+        layout = HallLayout.from_string(LAYOUT)
+        self.assertEqual(layout.rows, 3)
+        self.assertEqual(layout.seats_per_row, 7)
+
+        # leading space and short row are gaps
+        self.assertEqual(layout.seat_type(0, 0), NO_SEAT)
+        self.assertEqual(layout.seat_type(0, 4), NO_SEAT)
+        self.assertEqual(layout.seat_type(0, 6), NO_SEAT)
+        self.assertEqual(layout.seat_type(2, 0), SEAT_WHEELCHAIR)
+        self.assertEqual(layout.seat_type(2, 1), SEAT_COMPANION)
+        self.assertEqual(layout.seat_type(2, 5), SEAT_BLOCKED)
+
+        # 4 + 6 + 5 sellable seats, the blocked seat and gaps excluded
+        self.assertEqual(layout.seat_count, 15)
+        self.assertEqual(layout.seat_masks[0], 0b0101110)
+        self.assertEqual(layout.general_masks[2], 0b1001110)
+        self.assertEqual(layout.type_masks[SEAT_WHEELCHAIR], [0, 0, 0b1])
+
+    def test_from_file(self):
+        """
+        Test loading a layout from a file.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hall.txt")
+            with open(path, "w") as f:
+                f.write(LAYOUT)
+            layout = HallLayout.from_file(path)
+        self.assertEqual(layout.seat_count, 15)
+
+    def test_invalid_layouts(self):
+        """
+        Test invalid layouts are rejected.
+        """
+        with self.assertRaises(ValueError):
+            HallLayout.from_string("# nothing here\n")
+        with self.assertRaises(ValueError):
+            HallLayout.from_string("..?..")
+
+
+if __name__ == "__main__":
+    unittest.main()
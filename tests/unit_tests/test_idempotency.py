@@ -0,0 +1,113 @@
+import unittest
+
+from cinema import Cinema, SeatConflictError
+from idempotency import IdempotencyCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestIdempotency(unittest.TestCase):
+    def setUp(self):
+        self.cinema = Cinema("Inception", 3, 10)
+
+    def test_retried_booking_is_not_repeated(self):
+        """
+        Test a retried booking returns the original booking without touching the seats.
+        """
+        seats = self.cinema.allocate_default_seats(2)
+        self.assertEqual(self.cinema.book_seats(seats, "BK0001", idempotency_key="req-1"), "BK0001")
+        version = self.cinema.version
+
+        self.assertEqual(self.cinema.book_seats(seats, "BK0001", idempotency_key="req-1"), "BK0001")
+        self.assertEqual(self.cinema.version, version)
+        self.assertEqual(self.cinema.bookings, {"BK0001": seats})
+
+        # Without a key the same request really is run again
+        with self.assertRaises(ValueError):
+            self.cinema.book_seats(seats, "BK0001")
+
+    def test_retried_failure_is_replayed(self):
+        """
+        Test a retry of a failed operation gets the same error back.
+        """
+        seats = self.cinema.allocate_default_seats(2)
+        self.cinema.book_seats(seats, "BK0001")
+        with self.assertRaises(SeatConflictError):
+            self.cinema.confirm_booking(seats, "BK0002", 0, idempotency_key="req-2")
+
+        # Even once the seats are free again, the retry keeps the first outcome
+        self.cinema.cancel_booking("BK0001")
+        with self.assertRaises(SeatConflictError):
+            self.cinema.confirm_booking(seats, "BK0002", 0, idempotency_key="req-2")
+        self.assertNotIn("BK0002", self.cinema.bookings)
+
+    def test_retried_cancellation(self):
+        """
+        Test a retried cancellation still reports success.
+        """
+        self.cinema.book_seats(self.cinema.allocate_default_seats(3), "BK0001")
+        self.assertTrue(self.cinema.cancel_booking("BK0001", idempotency_key="cancel-BK0001"))
+        self.assertTrue(self.cinema.cancel_booking("BK0001", idempotency_key="cancel-BK0001"))
+        self.assertFalse(self.cinema.cancel_booking("BK0001"))
+
+    def test_retried_hold_confirmation(self):
+        """
+        Test holds are confirmed and released once per key.
+        """
+        self.cinema.book_seats(self.cinema.allocate_default_seats(30), "BK0001")
+        entry_id = self.cinema.join_waitlist(2, idempotency_key="wait-1")
+        self.assertEqual(self.cinema.join_waitlist(2, idempotency_key="wait-1"), entry_id)
+        self.assertEqual(len(self.cinema.waitlist), 1)
+
+        self.cinema.cancel_booking("BK0001")
+        hold_id = next(iter(self.cinema.holds))
+        booking_id = self.cinema.confirm_hold(hold_id, idempotency_key="hold-1")
+        self.assertEqual(self.cinema.confirm_hold(hold_id, idempotency_key="hold-1"), booking_id)
+        self.assertEqual(len(self.cinema.bookings[booking_id]), 2)
+
+    def test_key_reused_for_another_request(self):
+        """
+        Test a key cannot be reused with different arguments, but is separate per operation.
+        """
+        seats = self.cinema.allocate_default_seats(2)
+        self.cinema.book_seats(seats, "BK0001", idempotency_key="req-1")
+        with self.assertRaises(ValueError):
+            self.cinema.book_seats(seats, "BK0002", idempotency_key="req-1")
+        self.assertTrue(self.cinema.cancel_booking("BK0001", idempotency_key="req-1"))
+
+    def test_cache_expiry(self):
+        """
+        Test entries expire after their time to live.
+        """
+        clock = FakeClock()
+        cache = IdempotencyCache(max_keys=10, ttl=60, clock=clock)
+        cache.put("a", (), (None, 1))
+        clock.now = 30
+        cache.put("b", (), (None, 2))
+        self.assertEqual(cache.get("a"), ((), (None, 1)))
+
+        clock.now = 61
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), ((), (None, 2)))
+        cache.put("c", (), (None, 3))
+        clock.now = 95
+        cache.put("d", (), (None, 4))
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_is_bounded(self):
+        """
+        Test the cache drops its oldest keys once full.
+        """
+        cache = IdempotencyCache(max_keys=100, ttl=3600)
+        for key in range(1000):
+            cache.put(key, (), (None, key))
+        self.assertEqual(len(cache), 100)
+        self.assertIsNone(cache.get(899))
+        self.assertEqual(cache.get(900), ((), (None, 900)))
+
+        with self.assertRaises(ValueError):
+            IdempotencyCache(max_keys=0)
@@ -0,0 +1,75 @@
+import unittest
+
+from onsale_simulator import OnSaleSimulator, SimulationConfig, format_report, percentiles, simulate
+
+SMALL_RUSH = SimulationConfig(users=2000, arrival_rate=50.0, rows=8, seats_per_row=12)
+
+class TestOnSaleSimulator(unittest.TestCase):
+    def test_reproducible_from_seed(self):
+        """
+        Test runs with the same seed produce the same report, apart from wall-clock timings.
+        """
+        first = simulate(SMALL_RUSH, seed=3)
+        second = simulate(SMALL_RUSH, seed=3)
+        other = simulate(SMALL_RUSH, seed=4)
+
+        deterministic = first._replace(engine_percentiles=None, wall_time=None)
+        self.assertEqual(deterministic, second._replace(engine_percentiles=None, wall_time=None))
+        self.assertNotEqual(deterministic, other._replace(engine_percentiles=None, wall_time=None))
+
+    def test_accounting_matches_cinema(self):
+        """
+        Test the report agrees with the bookings left in the simulated cinema.
+        """
+        simulator = OnSaleSimulator(SMALL_RUSH, seed=1)
+        report = simulator.run()
+        cinema = simulator.cinema
+
+        self.assertEqual(report.bookings - report.cancellations, len(cinema.bookings))
+        self.assertEqual(report.seats_sold, sum(len(seats) for seats in cinema.bookings.values()))
+        self.assertEqual(report.seats_sold, cinema.total_seats - cinema.available_seats)
+        self.assertIsNotNone(report.sell_out_time)
+        self.assertEqual(report.confirm_attempts, report.bookings + report.conflicts)
+        self.assertLessEqual(report.retries, report.conflicts)
+        self.assertGreater(report.conflicts, 0)
+        self.assertEqual(report.engine_calls, len(simulator.engine_times))
+        self.assertIn("bookings per simulated second", format_report(report))
+
+    def test_quiet_sale_has_no_conflicts(self):
+        """
+        Test users arriving one at a time never conflict and nobody is turned away.
+        """
+        config = SMALL_RUSH._replace(users=20, arrival_rate=0.001, think_time=0.001,
+                                     abandon_probability=0.0, cancel_probability=0.0)
+        report = simulate(config, seed=2)
+
+        self.assertEqual(report.conflicts, 0)
+        self.assertEqual(report.turned_away, 0)
+        self.assertEqual(report.bookings, 20)
+        self.assertIsNone(report.sell_out_time)
+
+    def test_waiting_room(self):
+        """
+        Test a waiting room lets users in gradually, cutting engine calls against the full hall.
+        """
+        open_sale = simulate(SMALL_RUSH, seed=5)
+        queued = simulate(SMALL_RUSH._replace(admission_rate=2.0, max_active=10), seed=5)
+
+        self.assertEqual(open_sale.queue_checks, 0)
+        self.assertGreaterEqual(queued.queue_checks, queued.users)
+        self.assertIsNotNone(queued.wait_percentiles[50])
+        self.assertEqual(queued.seats_sold, open_sale.seats_sold)
+        self.assertLess(queued.engine_calls, open_sale.engine_calls)
+        self.assertLess(queued.conflicts, open_sale.conflicts)
+        self.assertIn("waiting room", format_report(queued))
+
+    def test_percentiles(self):
+        """
+        Test nearest-rank percentiles.
+        """
+        self.assertEqual(percentiles(list(range(1, 101))), {50: 50, 90: 90, 99: 99})
+        self.assertEqual(percentiles([5], (50, 99)), {50: 5, 99: 5})
+        self.assertEqual(percentiles([], (50,)), {50: None})
+
+if __name__ == '__main__':
+    unittest.main()
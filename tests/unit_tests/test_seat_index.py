@@ -0,0 +1,127 @@
+import unittest
+
+from seat_index import FreeRunIndex
+
+class TestFreeRunIndex(unittest.TestCase):
+    def test_initial_runs(self):
+        """
+        Test a fresh index has one full run per row.
+        """
+        index = FreeRunIndex(3, 8)
+        for row in range(3):
+            self.assertEqual(index.runs(row), [(0, 8)])
+            self.assertEqual(index.largest_run(row), 8)
+
+    def test_occupy_splits_runs(self):
+        """
+        Test occupying seats splits the containing run.
+        """
+        index = FreeRunIndex(1, 10)
+        index.occupy(0, 4)
+        self.assertEqual(index.runs(0), [(0, 4), (5, 10)])
+        self.assertEqual(index.largest_run(0), 5)
+
+        # edges of a run
+        index.occupy(0, 0)
+        index.occupy(0, 9)
+        self.assertEqual(index.runs(0), [(1, 4), (5, 9)])
+        self.assertEqual(index.largest_run(0), 4)
+
+        # occupying a taken seat is a no-op
+        index.occupy(0, 4)
+        self.assertEqual(index.runs(0), [(1, 4), (5, 9)])
+
+    def test_release_merges_runs(self):
+        """
+        Test releasing seats merges neighbouring runs.
+        """
+        index = FreeRunIndex(1, 6)
+        for col in range(6):
+            index.occupy(0, col)
+        self.assertEqual(index.runs(0), [])
+        self.assertEqual(index.largest_run(0), 0)
+
+        index.release(0, 1)
+        index.release(0, 3)
+        self.assertEqual(index.runs(0), [(1, 2), (3, 4)])
+
+        index.release(0, 2)
+        self.assertEqual(index.runs(0), [(1, 4)])
+        self.assertEqual(index.largest_run(0), 3)
+
+        # releasing a free seat is a no-op
+        index.release(0, 2)
+        self.assertEqual(index.runs(0), [(1, 4)])
+
+    def test_ranges(self):
+        """
+        Test whole ranges split and merge runs like the seats one at a time.
+        """
+        index = FreeRunIndex(1, 12, [0b111101111111])
+        index.occupy_range(0, 2, 5)
+        self.assertEqual(index.runs(0), [(0, 2), (5, 7), (8, 12)])
+
+        # a range over several runs and the untracked position between them
+        index.occupy_range(0, 6, 10)
+        self.assertEqual(index.runs(0), [(0, 2), (5, 6), (10, 12)])
+        self.assertEqual(index.largest_run(0), 2)
+
+        index.release_range(0, 2, 10)
+        self.assertEqual(index.runs(0), [(0, 7), (8, 12)])
+        self.assertEqual(index.largest_run(0), 7)
+
+        # occupying taken or releasing free seats is a no-op
+        index.occupy_range(0, 7, 8)
+        index.release_range(0, 0, 3)
+        self.assertEqual(index.runs(0), [(0, 7), (8, 12)])
+
+    def test_find_block_closest_to_target(self):
+        """
+        Test block search picks the start nearest the target, preferring the right.
+        """
+        index = FreeRunIndex(1, 10)
+        self.assertEqual(index.find_block(0, 4, 3), 3)
+
+        # block must be shifted to fit around a taken seat
+        index.occupy(0, 4)
+        self.assertEqual(index.find_block(0, 2, 3), 2)
+        self.assertEqual(index.find_block(0, 3, 3), 5)
+
+        # equal distance on either side resolves to the right
+        index = FreeRunIndex(1, 9)
+        index.occupy(0, 4)
+        self.assertEqual(index.find_block(0, 1, 4), 5)
+
+        # too long for any run
+        self.assertIsNone(index.find_block(0, 5, 2))
+
+    def test_matches_brute_force(self):
+        """
+        Test the index against a brute force scan over many fill states.
+        """
+        import random
+        rng = random.Random(7)
+        for _ in range(200):
+            width = rng.randint(1, 20)
+            index = FreeRunIndex(1, width)
+            free = [True] * width
+            for _ in range(rng.randint(0, 40)):
+                col = rng.randrange(width)
+                if rng.random() < 0.6:
+                    index.occupy(0, col)
+                    free[col] = False
+                else:
+                    index.release(0, col)
+                    free[col] = True
+
+            length = rng.randint(1, width)
+            target = rng.randint(0, width - 1)
+            candidates = [s for s in range(width - length + 1) if all(free[s:s + length])]
+            expected = None
+            if candidates:
+                expected = min(candidates, key=lambda s: (abs(s - target), -s))
+            self.assertEqual(index.find_block(0, length, target), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from change_feed import ChangeFeed
+from cinema import Cinema
+from hall_layout import HallLayout
+from seat_map_view import BOOKED_SPAN, SELECTED_SPAN, SeatMapView
+
+class TestSeatMapView(unittest.TestCase):
+    def test_render(self):
+        """
+        Test booked, free, gap and highlighted seats are drawn.
+        """
+        cinema = Cinema("Interstellar", 0, 0, HallLayout.from_string("._X.."))
+        cinema.book_seats([(0, 3)], "BK0001")
+        view = SeatMapView(cinema)
+
+        html = view.render([(0, 4)])
+        self.assertIn("S C R E E N", html)
+        self.assertEqual(html.count(BOOKED_SPAN), 1)
+        self.assertEqual(html.count(SELECTED_SPAN), 1)
+        self.assertIn(">5</span>", html)
+
+        # highlights are not kept between renders
+        self.assertEqual(view.render().count(SELECTED_SPAN), 0)
+
+    def test_incremental_updates(self):
+        """
+        Test only changed seats are redrawn and the result matches a full redraw.
+        """
+        rng = random.Random(9)
+        cinema = Cinema("Interstellar", 10, 12)
+        view = SeatMapView(cinema)
+        view.render()
+        self.assertEqual(view.full_redraws, 1)
+
+        for _ in range(50):
+            if cinema.bookings and rng.random() < 0.3:
+                cinema.cancel_booking(rng.choice(list(cinema.bookings)))
+            else:
+                seats = cinema.allocate_default_seats(rng.randint(1, 3))
+                if seats:
+                    cinema.book_seats(seats, cinema.generate_booking_id())
+
+            changed = len(cinema.changes_since(view.version))
+            self.assertEqual(view.sync(), changed)
+            self.assertEqual(view.render(), SeatMapView(cinema).render())
+
+        self.assertEqual(view.full_redraws, 1)
+
+    def test_full_redraw_when_behind(self):
+        """
+        Test the view redraws everything when the change feed has moved on.
+        """
+        cinema = Cinema("Interstellar", 3, 3)
+        cinema.changes = ChangeFeed(size=2)
+        view = SeatMapView(cinema)
+        view.render()
+
+        cinema.book_seats([(0, 0), (0, 1), (0, 2)], "BK0001")
+        self.assertEqual(view.sync(), 9)
+        self.assertEqual(view.full_redraws, 2)
+        self.assertEqual(view.render(), SeatMapView(cinema).render())
+
+
+if __name__ == "__main__":
+    unittest.main()
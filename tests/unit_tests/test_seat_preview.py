@@ -0,0 +1,84 @@
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from cinema import Cinema, SeatConflictError
+from main import book_tickets
+from seat_preview import SeatPreview
+from terminal_renderer import TerminalRenderer
+
+class TestSeatPreview(unittest.TestCase):
+    def test_preview_leaves_map_untouched(self):
+        """
+        Test a preview is drawn as selected without changing the seating map.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        seating_map = [list(row) for row in cinema.seating_map]
+        preview = SeatPreview(cinema, cinema.allocate_default_seats(2))
+
+        self.assertIn("A .   .   o   o   .   ", cinema.format_seating_map(preview=preview))
+        self.assertEqual(cinema.seating_map, seating_map)
+        self.assertEqual(cinema.version, 0)
+
+        # allocators read the map itself, so the preview seats are still offered
+        self.assertEqual(cinema.allocate_default_seats(2), list(preview.seats))
+
+    def test_concurrent_previews(self):
+        """
+        Test two previews of the same seats can be shown, and only one confirmed.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        first = SeatPreview(cinema, cinema.allocate_default_seats(2))
+        second = SeatPreview(cinema, cinema.allocate_default_seats(3))
+
+        self.assertEqual(first.confirm("BK0001"), "BK0001")
+        self.assertEqual(first.conflicts(), list(first.seats))
+        self.assertEqual(len(second.conflicts()), 2)
+        with self.assertRaises(SeatConflictError):
+            second.confirm("BK0002")
+
+        moved = second.moved_to(cinema.allocate_default_seats(3))
+        self.assertEqual(moved.conflicts(), [])
+        moved.confirm("BK0002")
+        self.assertEqual(cinema.available_seats, 10)
+
+    @patch("terminal_renderer.shutil.get_terminal_size", return_value=os.terminal_size((120, 40)))
+    def test_moving_preview_redraws_overlay_only(self, _):
+        """
+        Test moving a preview on an ANSI terminal only rewrites the old and new preview seats.
+        """
+        cinema = Cinema("Interstellar", 8, 10)
+        cinema.book_seats(cinema.allocate_default_seats(4), "BK0001")
+        renderer = TerminalRenderer(cinema, StringIO(), ansi=True)
+
+        preview = SeatPreview(cinema, cinema.allocate_default_seats(3))
+        renderer.render(preview=preview)
+        self.assertEqual(renderer.render(preview=preview.moved_to([(0, 0), (0, 1), (0, 2)])), 6)
+        self.assertEqual(renderer.render(preview=preview.moved_to([(0, 1), (0, 2), (0, 3)])), 2)
+        self.assertEqual(renderer.full_redraws, 1)
+
+    @patch("builtins.input")
+    def test_book_tickets_does_not_write_previews(self, mock_input):
+        """
+        Test the CLI seat selection loop leaves the seating map alone until booking.
+        """
+        cinema = Cinema("Interstellar", 5, 5)
+        maps_seen = []
+
+        def answer(prompt):
+            maps_seen.append([list(row) for row in cinema.seating_map])
+            return answers.pop(0)
+
+        answers = ["3", "B2", "C1", ""]
+        mock_input.side_effect = answer
+        with patch("sys.stdout", new=StringIO()):
+            book_tickets(cinema)
+
+        empty_map = [["."] * 5 for _ in range(5)]
+        self.assertEqual(maps_seen, [empty_map] * 4)
+        self.assertEqual(cinema.bookings["BK0001"], [(2, 0), (2, 1), (2, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import unittest
+from io import StringIO
+
+from booking_import import import_bookings
+from cinema import Cinema
+from seat_ranges import SeatRanges, parse_range_label, range_labels
+
+class TestSeatRanges(unittest.TestCase):
+    def test_runs(self):
+        """
+        Test seats are merged into runs, ordered from row A by seat number.
+        """
+        seats = SeatRanges.from_seats([(1, 2), (1, 3), (1, 1), (1, 4), (3, 7), (0, 0), (0, 2)])
+        self.assertEqual(seats.ranges(), [(3, 7, 1), (1, 1, 4), (0, 0, 1), (0, 2, 1)])
+        self.assertEqual(list(seats), [(3, 7), (1, 1), (1, 2), (1, 3), (1, 4), (0, 0), (0, 2)])
+        self.assertEqual(len(seats), 7)
+        self.assertIn((1, 3), seats)
+        self.assertNotIn((1, 5), seats)
+        self.assertEqual(seats.row_masks(), {3: 1 << 7, 1: 0b11110, 0: 0b101})
+
+        self.assertEqual(SeatRanges([(1, 1, 2), (1, 3, 2)]).ranges(), [(1, 1, 4)])
+        self.assertEqual(SeatRanges(), [])
+        self.assertFalse(SeatRanges())
+        with self.assertRaises(ValueError):
+            SeatRanges.from_seats([(0, 1), (0, 1)])
+
+        # seats already in one run
+        self.assertEqual(SeatRanges.from_seats([(2, 3), (2, 4), (2, 5)]).ranges(), [(2, 3, 3)])
+        self.assertEqual(SeatRanges.from_seats(((2, 3),)).ranges(), [(2, 3, 1)])
+        with self.assertRaises(ValueError):
+            SeatRanges.from_seats([(0, 0), (0, 0), (0, 2)])
+        with self.assertRaises(ValueError):
+            SeatRanges.from_seats([(0, -1), (0, 0)])
+        with self.assertRaises(ValueError):
+            SeatRanges([(0, 1, 3), (0, 2, 1)])
+
+    def test_equality(self):
+        """
+        Test seat ranges equal the same seats in any order, and nothing else.
+        """
+        seats = SeatRanges.from_seats([(0, 1), (0, 0)])
+        self.assertEqual(seats, [(0, 0), (0, 1)])
+        self.assertEqual([(0, 1), (0, 0)], seats)
+        self.assertEqual(seats, ((0, 1), (0, 0)))
+        self.assertEqual(seats, SeatRanges([(0, 0, 2)]))
+        self.assertEqual(seats.to_bytes(), SeatRanges([(0, 0, 2)]).to_bytes())
+        with self.assertRaises(TypeError):
+            hash(seats)
+        self.assertNotEqual(seats, [(0, 0)])
+        self.assertNotEqual(seats, [(0, 0), (0, 0)])
+        self.assertNotEqual(seats, "A1-A2")
+        self.assertEqual(SeatRanges.from_bytes(seats.to_bytes()), seats)
+        with self.assertRaises(ValueError):
+            SeatRanges.from_bytes(b"\0\0")
+
+    def test_labels(self):
+        """
+        Test runs are labelled as ranges and parsed back.
+        """
+        cinema = Cinema("Inception", 5, 10)
+        seats = [(4, 0), (4, 1), (4, 2), (0, 9), (2, 4), (2, 5)]
+        self.assertEqual(range_labels(cinema.get_row_letter, seats), ["A1-A3", "C5-C6", "E10"])
+
+        self.assertEqual(parse_range_label("A1-A3"), ("A", 1, 3))
+        self.assertEqual(parse_range_label("e10"), ("E", 10, 10))
+        for label in ("A3-A1", "A1-B3", "A0", "A", "A1-", "-A1"):
+            with self.assertRaises(ValueError):
+                parse_range_label(label)
+
+        import_bookings(cinema, StringIO("booking_id,seats\nBK0001,A1-A3 C5\n"))
+        self.assertEqual(cinema.bookings["BK0001"], [(4, 0), (4, 1), (4, 2), (2, 4)])
+
+    def test_cinema_bookings(self):
+        """
+        Test bookings are stored as seat ranges, and cancelling them a run at a time
+        leaves the cinema as if they were never made.
+        """
+        rng = random.Random(7)
+        cinema = Cinema("Inception", 6, 12)
+        fresh = Cinema("Inception", 6, 12)
+        for _ in range(200):
+            if cinema.bookings and rng.random() < 0.4:
+                cinema.cancel_booking(rng.choice(list(cinema.bookings)))
+            else:
+                seats = cinema.allocate_default_seats(rng.randint(1, 6))
+                if seats:
+                    booking_id = cinema.book_seats(seats, cinema.generate_booking_id())
+                    self.assertIsInstance(cinema.bookings[booking_id], SeatRanges)
+
+        for booking_id in list(cinema.bookings):
+            cinema.cancel_booking(booking_id)
+        self.assertEqual(cinema.seating_map, fresh.seating_map)
+        self.assertEqual(cinema.free_masks, fresh.free_masks)
+        self.assertEqual(cinema.zone_available, fresh.zone_available)
+        self.assertEqual(cinema.available_seats, fresh.available_seats)
+        self.assertEqual([cinema.free_runs.runs(row_index) for row_index in range(6)],
+                         [fresh.free_runs.runs(row_index) for row_index in range(6)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import random
+import threading
+import unittest
+
+from cinema import Cinema
+from seat_scoring import (PROFILE_DEFAULT, PROFILE_VIEWING, ScoringAllocator,
+                          build_score_matrix, middle_out_rank)
+
+class TestSeatScoring(unittest.TestCase):
+    def test_middle_out_rank(self):
+        """
+        Test the middle-out order matches the default allocation.
+        """
+        # odd row: 5 is the middle
+        ranks = [middle_out_rank(11, col) for col in range(11)]
+        self.assertEqual(sorted(range(11), key=lambda col: ranks[col])[:3], [5, 6, 4])
+
+        # even row: leans left of centre
+        ranks = [middle_out_rank(10, col) for col in range(10)]
+        self.assertEqual(sorted(range(10), key=lambda col: ranks[col])[:4], [4, 5, 3, 6])
+
+    def test_viewing_scores(self):
+        """
+        Test viewing scores favour the centre line and distant rows.
+        """
+        scores = build_score_matrix(5, 9, PROFILE_VIEWING)
+        self.assertGreater(scores[4][4], scores[4][0])
+        self.assertGreater(scores[4][2], scores[0][2])
+        self.assertAlmostEqual(scores[3][1], scores[3][7])
+
+        with self.assertRaises(ValueError):
+            build_score_matrix(5, 9, "unknown")
+
+    def test_default_profile_matches_default_allocation(self):
+        """
+        Test the default profile reproduces allocate_default_seats.
+        """
+        rng = random.Random(3)
+        for _ in range(100):
+            cinema = Cinema("Interstellar", rng.randint(1, 8), rng.randint(1, 12))
+            allocator = ScoringAllocator(cinema, PROFILE_DEFAULT)
+            seats = [(r, c) for r in range(cinema.rows) for c in range(cinema.seats_per_row)
+                     if rng.random() < 0.4]
+            if seats:
+                cinema.book_seats(seats, "BK0001")
+
+            num_tickets = rng.randint(1, cinema.total_seats)
+            self.assertEqual(allocator.allocate(num_tickets), cinema.allocate_default_seats(num_tickets))
+
+    def test_incremental_updates(self):
+        """
+        Test bookings and cancellations are picked up without a rescore.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        allocator = ScoringAllocator(cinema)
+
+        best = allocator.allocate(2)
+        self.assertEqual(len(best), 2)
+
+        # booked seats are skipped
+        cinema.book_seats(best, "BK0001")
+        seats = allocator.allocate(2)
+        self.assertTrue(set(seats).isdisjoint(best))
+
+        # cancelled seats come back
+        cinema.cancel_booking("BK0001")
+        self.assertEqual(allocator.allocate(2), best)
+
+        # allocation does not consume seats
+        self.assertEqual(allocator.allocate(2), best)
+
+        # not enough seats
+        self.assertIsNone(allocator.allocate(16))
+        with self.assertRaises(ValueError):
+            allocator.allocate(0)
+
+        allocator.close()
+        self.assertEqual(cinema.listeners, [])
+
+    def test_released_holds(self):
+        """
+        Test seats held for the waitlist come back when the hold is released.
+        """
+        cinema = Cinema("Interstellar", 2, 3)
+        allocator = ScoringAllocator(cinema, PROFILE_DEFAULT)
+        cinema.book_seats(cinema.allocate_default_seats(6), "BK0001")
+        entry_id = cinema.join_waitlist(4)
+
+        # cancelled seats go straight to the waiting party, and the best
+        # seats are dropped from the allocator once it finds them held
+        cinema.cancel_booking("BK0001")
+        hold_id = cinema.entry_holds[entry_id]
+        self.assertEqual(allocator.allocate(2), cinema.allocate_default_seats(2))
+        self.assertIsNone(allocator.allocate(3))
+
+        cinema.release_hold(hold_id)
+        self.assertEqual(allocator.allocate(6), cinema.allocate_default_seats(6))
+
+
+    def test_allocate_waits_for_cinema_lock(self):
+        """
+        Test a suggestion is not made while another thread is changing seats.
+        """
+        cinema = Cinema("Interstellar", 3, 4)
+        allocator = ScoringAllocator(cinema)
+        best = allocator.allocate(2)
+        result = []
+
+        with cinema.lock:
+            worker = threading.Thread(target=lambda: result.append(allocator.allocate(2)))
+            worker.start()
+            worker.join(timeout=0.1)
+            self.assertTrue(worker.is_alive())
+            cinema.book_seats(best, "BK0001")
+        worker.join()
+
+        self.assertEqual(len(result[0]), 2)
+        self.assertFalse(set(result[0]) & set(best))
+
+if __name__ == "__main__":
+    unittest.main()
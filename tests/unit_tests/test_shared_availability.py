@@ -0,0 +1,117 @@
+import io
+import multiprocessing
+import struct
+import threading
+import time
+import unittest
+
+from cinema import Cinema
+from hall_layout import HallLayout
+from shared_availability import SharedAvailability, SharedAvailabilityView
+from terminal_renderer import TerminalRenderer
+
+def read_seats(name, seats, results):
+    view = SharedAvailabilityView(name)
+    results.put([view.is_seat_available(*seat) for seat in seats])
+    view.close()
+
+class TestSharedAvailability(unittest.TestCase):
+    def setUp(self):
+        self.cinema = Cinema("Alien", 4, 10, HallLayout.from_string("W...__...X\n..........\n..........\n_........."))
+        self.publisher = SharedAvailability(self.cinema)
+        self.view = SharedAvailabilityView(self.publisher.name)
+
+    def tearDown(self):
+        self.view.close()
+        self.publisher.close()
+
+    def test_view_follows_cinema(self):
+        """
+        Test the view shows the same seats and seating map as the cinema after each change.
+        """
+        self.assertEqual((self.view.title, self.view.rows, self.view.seats_per_row), ("Alien", 4, 10))
+        self.assertEqual(self.view.format_seating_map(), self.cinema.format_seating_map())
+
+        self.cinema.book_seats(self.cinema.allocate_default_seats(12), "BK0001")
+        self.cinema.join_waitlist(2)
+        self.cinema.cancel_booking("BK0001")
+        self.assertEqual(len(self.cinema.holds), 1)
+
+        self.assertEqual(self.view.format_seating_map(), self.cinema.format_seating_map())
+        self.assertEqual(self.view.available_seats, self.cinema.available_seats)
+        for row_index in range(-1, 5):
+            for col_index in range(-1, 11):
+                self.assertEqual(self.view.is_seat_available(row_index, col_index),
+                                 self.cinema.is_seat_available(row_index, col_index))
+
+    def test_long_title(self):
+        """
+        Test a title longer than the header is cut on a character boundary.
+        """
+        cinema = Cinema("A" + "é" * 40, 1, 2)
+        publisher = SharedAvailability(cinema)
+        view = SharedAvailabilityView(publisher.name)
+        try:
+            self.assertEqual(view.title, "A" + "é" * 31)
+        finally:
+            view.close()
+            publisher.close()
+
+    def test_renderer_reads_view(self):
+        """
+        Test the terminal renderer draws a view like the cinema, and redraws on changes.
+        """
+        self.cinema.book_seats([(3, 4), (3, 5)], "BK0001")
+        out = io.StringIO()
+        renderer = TerminalRenderer(self.view, out=out, ansi=False)
+        renderer.render()
+        self.assertEqual(out.getvalue(), self.cinema.format_seating_map() + "\n")
+
+        version = self.view.version
+        self.cinema.cancel_booking("BK0001")
+        self.assertEqual(self.view.version, version + 1)
+
+    def test_lock_pins_a_snapshot(self):
+        """
+        Test reads inside the view lock see one version, even while the cinema changes.
+        """
+        with self.view.lock:
+            version = self.view.version
+            self.cinema.book_seats([(0, 1)], "BK0001")
+            self.assertTrue(self.view.is_seat_available(0, 1))
+            self.assertEqual(self.view.version, version)
+        self.assertFalse(self.view.is_seat_available(0, 1))
+        self.assertEqual(self.view.version, version + 1)
+
+    def test_readers_wait_for_writes(self):
+        """
+        Test a read retries while the sequence number shows a write in progress.
+        """
+        buf = self.publisher._memory.buf
+        sequence = struct.unpack_from("<Q", buf, 0)[0]
+        struct.pack_into("<Q", buf, 0, sequence + 1)
+
+        def finish_write():
+            time.sleep(0.05)
+            struct.pack_into("<Q", buf, 0, sequence + 2)
+
+        writer = threading.Thread(target=finish_write)
+        writer.start()
+        self.assertTrue(self.view.is_seat_available(1, 1))
+        writer.join()
+        self.assertGreater(self.view.retries, 0)
+        self.publisher._sequence = sequence + 2
+
+    def test_other_process_reads(self):
+        """
+        Test a reader process attached by name sees the published seats.
+        """
+        self.cinema.book_seats([(2, 3)], "BK0001")
+        results = multiprocessing.Queue()
+        reader = multiprocessing.Process(target=read_seats, args=(self.publisher.name, [(2, 3), (2, 4)], results))
+        reader.start()
+        self.assertEqual(results.get(timeout=10), [False, True])
+        reader.join()
+
+if __name__ == '__main__':
+    unittest.main()
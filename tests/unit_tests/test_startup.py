@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestStartup(unittest.TestCase):
+    def test_entry_points_import_light(self):
+        """
+        Test the core and CLI modules load without exports, parquet or pandas.
+        """
+        heavy_modules = ["pandas", "pyarrow", "csv", "json", "frozen_cinema", "booking_export"]
+        for module in ("cinema", "main"):
+            result = subprocess.run(
+                [sys.executable, "-c", f"import sys, {module}; print(' '.join(sorted(sys.modules)))"],
+                cwd=ROOT, capture_output=True, text=True, check=True)
+            loaded = set(result.stdout.split())
+            self.assertIn(module, loaded)
+            self.assertEqual([name for name in heavy_modules if name in loaded], [], module)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import re
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from cinema import Cinema
+from terminal_renderer import TerminalRenderer, supports_ansi
+
+TERMINAL_SIZE = os.terminal_size((120, 40))
+
+
+class CountingOutput(StringIO):
+    """
+    StringIO that counts write calls.
+    """
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@patch("terminal_renderer.shutil.get_terminal_size", return_value=TERMINAL_SIZE)
+class TestTerminalRenderer(unittest.TestCase):
+    def test_plain_frames(self, _):
+        """
+        Test plain output matches the seating map printout, one write per frame.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        cinema.book_seats([(2, 2)], "BK0001")
+        out = CountingOutput()
+        renderer = TerminalRenderer(cinema, out)
+
+        renderer.render("BK0001")
+        renderer.render("BK0001")
+
+        with patch("sys.stdout", new=StringIO()) as printed:
+            cinema.display_seating_map("BK0001")
+        self.assertEqual(out.getvalue(), printed.getvalue() * 2)
+        self.assertEqual(out.writes, 2)
+        self.assertNotIn("\033", out.getvalue())
+        self.assertEqual(renderer.full_redraws, 2)
+
+    def test_ansi_redraws_changed_seats(self, _):
+        """
+        Test an ANSI terminal only gets the seats that changed after the first frame.
+        """
+        cinema = Cinema("Interstellar", 3, 5)
+        out = CountingOutput()
+        renderer = TerminalRenderer(cinema, out, ansi=True)
+
+        self.assertEqual(renderer.render(), 15)
+        self.assertIn("S C R E E N", out.getvalue())
+        self.assertIn("\033[9;40r", out.getvalue())
+
+        # nothing changed - nothing written
+        writes = out.writes
+        self.assertEqual(renderer.render(), 0)
+        self.assertEqual(out.writes, writes)
+
+        cinema.book_seats([(0, 0), (2, 4)], "BK0001")
+        out.seek(0)
+        out.truncate()
+        self.assertEqual(renderer.render("BK0001"), 2)
+        frame = out.getvalue()
+        self.assertNotIn("S C R E E N", frame)
+        self.assertEqual(re.findall(r"\033\[(\d+);(\d+)Ho", frame), [("4", "3"), ("6", "19")])
+
+        # the highlighted booking is drawn as booked once it is not current
+        out.seek(0)
+        out.truncate()
+        self.assertEqual(renderer.render(), 2)
+        self.assertEqual(len(re.findall(r"H#", out.getvalue())), 2)
+        self.assertEqual(renderer.full_redraws, 1)
+        self.assertEqual(renderer.seats_redrawn, 19)
+
+        renderer.close()
+        self.assertIn("\033[r", out.getvalue())
+
+    def test_ansi_short_terminal(self, get_terminal_size):
+        """
+        Test a terminal too short to pin the map gets full plain frames.
+        """
+        get_terminal_size.return_value = os.terminal_size((120, 10))
+        cinema = Cinema("Interstellar", 8, 5)
+        out = StringIO()
+        renderer = TerminalRenderer(cinema, out, ansi=True)
+
+        renderer.render()
+        renderer.render()
+        self.assertEqual(out.getvalue().count("S C R E E N"), 2)
+        self.assertEqual(renderer.full_redraws, 2)
+
+    def test_supports_ansi(self, _):
+        """
+        Test ANSI output is only used on terminals.
+        """
+        self.assertFalse(supports_ansi(StringIO()))
+
+        tty = StringIO()
+        tty.isatty = lambda: True
+        with patch.dict(os.environ, {"TERM": "xterm"}):
+            self.assertTrue(supports_ansi(tty))
+        with patch.dict(os.environ, {"TERM": "dumb"}):
+            self.assertFalse(supports_ansi(tty))
+
+
+if __name__ == "__main__":
+    unittest.main()
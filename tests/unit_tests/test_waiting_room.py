@@ -0,0 +1,116 @@
+import unittest
+
+from waiting_room import TokenBucket, WaitingRoom
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestWaitingRoom(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_token_bucket(self):
+        """
+        Test the bucket allows a burst, then refills at its rate.
+        """
+        bucket = TokenBucket(rate=2.0, burst=3, clock=self.clock)
+        self.assertEqual([bucket.try_take() for _ in range(4)], [True, True, True, False])
+        self.assertAlmostEqual(bucket.wait_time(), 0.5)
+        self.assertAlmostEqual(bucket.wait_time(3), 1.5)
+
+        self.clock.now = 0.5
+        self.assertTrue(bucket.try_take())
+        self.assertFalse(bucket.try_take())
+
+        self.clock.now = 100
+        self.assertEqual(sum(bucket.try_take() for _ in range(10)), 3)
+
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, burst=1)
+
+    def test_fifo_admission(self):
+        """
+        Test visitors are let in in arrival order at the token rate.
+        """
+        room = WaitingRoom(rate=1.0, burst=2, max_active=10, clock=self.clock)
+        admissions = [room.enter(f"visitor-{index}") for index in range(5)]
+        self.assertEqual([admission.admitted for admission in admissions], [True, True, False, False, False])
+        self.assertEqual([admission.position for admission in admissions], [0, 0, 1, 2, 3])
+        self.assertAlmostEqual(admissions[4].eta, 3.0)
+        self.assertEqual((room.active, room.waiting), (2, 3))
+
+        # A later arrival never overtakes the queue
+        self.clock.now = 1.0
+        self.assertFalse(room.enter("visitor-5").admitted)
+        self.assertEqual(room.enter("visitor-3").position, 1)
+        self.assertTrue(room.enter("visitor-2").admitted)
+        self.assertEqual(room.enter("visitor-5").position, 3)
+
+    def test_active_session_cap(self):
+        """
+        Test no more visitors than the cap are let in until sessions end.
+        """
+        room = WaitingRoom(rate=100.0, burst=100, max_active=2, session_timeout=60, clock=self.clock)
+        for visitor_id in ("a", "b", "c", "d"):
+            room.enter(visitor_id)
+        self.assertEqual((room.active, room.waiting), (2, 2))
+        self.assertEqual(room.enter("d").position, 2)
+
+        self.assertTrue(room.leave("a"))
+        self.assertTrue(room.enter("c").admitted)
+        self.assertFalse(room.enter("d").admitted)
+
+        # Idle sessions time out, but a visitor who keeps using the page stays in
+        self.clock.now = 50
+        self.assertTrue(room.enter("c").admitted)
+        self.clock.now = 70
+        self.assertTrue(room.enter("d").admitted)
+        self.assertTrue(room.enter("c").admitted)
+        self.assertEqual(room.active, 2)
+        self.assertFalse(room.enter("b").admitted)
+        self.assertEqual(room.admitted, 4)
+
+    def test_leaving_the_queue(self):
+        """
+        Test visitors leaving the queue move everyone behind them up.
+        """
+        room = WaitingRoom(rate=1.0, burst=1, max_active=10, clock=self.clock)
+        for visitor_id in ("a", "b", "c", "d"):
+            room.enter(visitor_id)
+        self.assertEqual(room.enter("d").position, 3)
+        self.assertTrue(room.leave("c"))
+        self.assertFalse(room.leave("c"))
+        self.assertEqual(room.enter("d").position, 2)
+        self.assertEqual(room.waiting, 2)
+
+        # Someone who left and comes back joins the end of the queue
+        self.assertEqual(room.enter("c").position, 3)
+
+    def test_abandoned_queue_entries(self):
+        """
+        Test visitors who stop checking the queue are dropped before anyone is let in.
+        """
+        room = WaitingRoom(rate=1.0, burst=1, max_active=1, session_timeout=300, queue_timeout=10,
+                           clock=self.clock)
+        for visitor_id in ("a", "b", "c"):
+            room.enter(visitor_id)
+        self.assertEqual(room.waiting, 2)
+
+        # b closed the tab, c keeps checking; a leaves and the slot goes to c
+        self.clock.now = 8
+        self.assertEqual(room.enter("c").position, 2)
+        self.clock.now = 12
+        self.assertTrue(room.leave("a"))
+        self.assertTrue(room.enter("c").admitted)
+        self.assertEqual((room.active, room.waiting), (1, 0))
+        self.assertFalse(room.leave("b"))
+
+        # b coming back joins the end of the queue
+        self.assertEqual(room.enter("b").position, 1)
+
+if __name__ == '__main__':
+    unittest.main()
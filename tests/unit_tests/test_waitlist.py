@@ -0,0 +1,112 @@
+import unittest
+
+from cinema import EVENT_BOOK, EVENT_CANCEL, EVENT_HOLD, EVENT_RELEASE, Cinema
+from waitlist import Waitlist
+
+class TestWaitlist(unittest.TestCase):
+    def test_priority_order(self):
+        """
+        Test parties come off the waitlist by priority, then arrival.
+        """
+        waitlist = Waitlist()
+        waitlist.add("WL0001", 2, priority=1)
+        waitlist.add("WL0002", 4, priority=0)
+        waitlist.add("WL0003", 2, priority=0)
+        waitlist.add("WL0004", 1, priority=0)
+
+        self.assertEqual(waitlist.first_fitting(10), ("WL0002", 4))
+        self.assertEqual(waitlist.first_fitting(3), ("WL0003", 2))
+        self.assertEqual(waitlist.first_fitting(1), ("WL0004", 1))
+        self.assertIsNone(Waitlist().first_fitting(10))
+
+        self.assertTrue(waitlist.remove("WL0003"))
+        self.assertFalse(waitlist.remove("WL0003"))
+        self.assertEqual(waitlist.first_fitting(3), ("WL0004", 1))
+        self.assertEqual(len(waitlist), 3)
+        self.assertEqual(waitlist.entry("WL0001"), (1, 1, 2))
+
+        with self.assertRaises(ValueError):
+            waitlist.add("WL0001", 2)
+        with self.assertRaises(ValueError):
+            waitlist.add("WL0005", 0)
+
+    def test_cancellation_fills_waitlist(self):
+        """
+        Test a cancellation turns waiting parties into holds, in priority order.
+        """
+        cinema = Cinema("Interstellar", 2, 5)
+        cinema.book_seats(cinema.allocate_default_seats(6), "BK0001")
+        cinema.book_seats(cinema.allocate_default_seats(4), "BK0002")
+        self.assertIsNone(cinema.allocate_default_seats(1))
+
+        events = []
+        cinema.add_listener(lambda event, booking_id, seats: events.append((event, booking_id, len(seats))))
+        late = cinema.join_waitlist(3, priority=1)
+        large = cinema.join_waitlist(5)
+        pair = cinema.join_waitlist(2)
+
+        # 4 seats free up - the party of 5 does not fit, the pair goes first
+        cinema.cancel_booking("BK0002")
+        self.assertEqual(events, [(EVENT_CANCEL, "BK0002", 4), (EVENT_HOLD, "HD0001", 2)])
+        self.assertEqual(cinema.entry_holds, {pair: "HD0001"})
+        self.assertEqual(cinema.available_seats, 2)
+        self.assertEqual(len(cinema.waitlist), 2)
+
+        hold_seats = cinema.holds["HD0001"][1]
+        self.assertFalse(any(cinema.is_seat_available(*seat) for seat in hold_seats))
+        self.assertIn("#", cinema.format_seating_map())
+
+        # 8 seats free - the party of 5 goes before the lower priority party of 3
+        cinema.cancel_booking("BK0001")
+        self.assertEqual([event for event in events[-3:]],
+                         [(EVENT_CANCEL, "BK0001", 6), (EVENT_HOLD, "HD0002", 5), (EVENT_HOLD, "HD0003", 3)])
+        self.assertEqual(cinema.entry_holds[large], "HD0002")
+        self.assertEqual(cinema.entry_holds[late], "HD0003")
+        self.assertEqual(cinema.available_seats, 0)
+
+        booking_id = cinema.confirm_hold("HD0001")
+        self.assertEqual(booking_id, "BK0001")
+        self.assertEqual(cinema.bookings[booking_id], hold_seats)
+        self.assertEqual(events[-1], (EVENT_BOOK, booking_id, 2))
+        self.assertEqual(cinema.seating_map[hold_seats[0][0]][hold_seats[0][1]], booking_id)
+
+        self.assertTrue(cinema.release_hold("HD0003"))
+        self.assertFalse(cinema.release_hold("HD0003"))
+        self.assertEqual(events[-1], (EVENT_RELEASE, "HD0003", 3))
+        self.assertEqual(cinema.available_seats, 3)
+        with self.assertRaises(ValueError):
+            cinema.confirm_hold("HD0003")
+
+    def test_join_with_free_seats(self):
+        """
+        Test a party joining while seats are free is held straight away, and
+        parties that left are skipped.
+        """
+        cinema = Cinema("Interstellar", 2, 5)
+        cinema.book_seats(cinema.allocate_default_seats(9), "BK0001")
+        entry_id = cinema.join_waitlist(2)
+        self.assertIn(entry_id, cinema.waitlist)
+        self.assertTrue(cinema.leave_waitlist(entry_id))
+
+        second = cinema.join_waitlist(1)
+        self.assertEqual(cinema.entry_holds, {second: "HD0001"})
+        self.assertEqual(cinema.available_seats, 0)
+
+    def test_large_cancellation(self):
+        """
+        Test a large cancellation fills many waiting parties.
+        """
+        cinema = Cinema("Interstellar", 26, 50)
+        cinema.book_seats(cinema.allocate_default_seats(1300), "BK0001")
+        for index in range(2000):
+            cinema.join_waitlist(index % 6 + 1, priority=index % 3)
+
+        cinema.cancel_booking("BK0001")
+        held = sum(len(seats) for _, seats in cinema.holds.values())
+        self.assertEqual(held + cinema.available_seats, 1300)
+        self.assertEqual(len(cinema.holds) + len(cinema.waitlist), 2000)
+        self.assertLess(cinema.available_seats, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
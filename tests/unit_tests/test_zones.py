@@ -0,0 +1,47 @@
+import unittest
+
+from zones import ZONE_FRONT_ROW, ZONE_PREMIUM, ZONE_STANDARD, ZoneMap
+
+class TestZoneMap(unittest.TestCase):
+    def test_by_rows(self):
+        """
+        Test zones built from whole rows.
+        """
+        zones = ZoneMap.by_rows(3, 4, {"cheap": [0], "vip": [2]})
+        self.assertEqual(zones.names, ["cheap", "vip"])
+        self.assertEqual(zones.masks["cheap"], [0b1111, 0, 0])
+        self.assertEqual(zones.masks["vip"], [0, 0, 0b1111])
+        self.assertEqual(zones.zone_at(0, 3), "cheap")
+        self.assertIsNone(zones.zone_at(1, 0))
+
+        with self.assertRaises(ValueError):
+            ZoneMap.by_rows(3, 4, {"cheap": [3]})
+
+    def test_from_string(self):
+        """
+        Test zones drawn one character per position.
+        """
+        zones = ZoneMap.from_string("FFFF\nS_PS", {"F": "front", "S": "side", "P": "premium"})
+        self.assertEqual(zones.zone_at(0, 0), "front")
+        self.assertEqual(zones.zone_at(1, 2), "premium")
+        self.assertIsNone(zones.zone_at(1, 1))
+        self.assertEqual(zones.masks["side"], [0, 0b1001])
+
+        with self.assertRaises(ValueError):
+            ZoneMap.from_string("FQ", {"F": "front"})
+
+    def test_default_tiers(self):
+        """
+        Test the default front-row, standard and premium tiers.
+        """
+        zones = ZoneMap.default_tiers(6, 2)
+        self.assertEqual([zones.zone_at(row, 0) for row in range(6)],
+                         [ZONE_FRONT_ROW] + [ZONE_STANDARD] * 3 + [ZONE_PREMIUM] * 2)
+
+        # tiny halls still get every row a zone
+        self.assertEqual(ZoneMap.default_tiers(1, 2).names, [ZONE_FRONT_ROW])
+        self.assertEqual(ZoneMap.default_tiers(2, 2).names, [ZONE_FRONT_ROW, ZONE_PREMIUM])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+Admission control for busy screenings: a virtual waiting room in front of
+the booking page.
+
+Visitors queue in arrival order and are let in by a token bucket, so at
+most `rate` visitors per second start booking, and never more than
+`max_active` book at once. Waiting visitors only ask for their position,
+which costs a dictionary lookup and a binary search, instead of running
+allocations against a nearly full hall.
+"""
+import bisect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Defaults for a screening's waiting room
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_ACTIVE = 100
+DEFAULT_SESSION_TIMEOUT = 300.0
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+# Whether a visitor may book now; if not, their place in the queue (from 1)
+# and the estimated seconds until they are let in
+Admission = namedtuple("Admission", ["admitted", "position", "eta"])
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most
+    `burst` tokens. It starts full.
+    """
+    def __init__(self, rate, burst, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Token bucket needs a positive rate and room for at least one token")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self):
+        """
+        Take a token if one is available.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, tokens=1):
+        """
+        Return the seconds until `tokens` tokens will have been available,
+        if nobody else takes them.
+        """
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class WaitingRoom:
+    """
+    FIFO virtual queue for one screening, with rate-limited admission and a
+    cap on active booking sessions.
+
+    `enter(visitor_id)` is called on every request to the booking page: it
+    queues new visitors, lets in whoever is at the front when a token and a
+    session slot are free, and keeps an admitted visitor's session alive.
+    Sessions end with `leave(visitor_id)`, or after `session_timeout` idle
+    seconds, for visitors who close the page. Waiting visitors who have not
+    checked their place for `queue_timeout` seconds are taken out of the
+    queue before anyone is let in, so closed tabs never take up a token or a
+    session. Waiting times are estimated
+    from the admission rate, or from how quickly sessions have been ending
+    when every slot is taken.
+    """
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_active=DEFAULT_MAX_ACTIVE,
+                 session_timeout=DEFAULT_SESSION_TIMEOUT, queue_timeout=DEFAULT_QUEUE_TIMEOUT,
+                 clock=time.monotonic):
+        if max_active < 1:
+            raise ValueError("Waiting room must allow at least one active session")
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.max_active = max_active
+        self.session_timeout = session_timeout
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        # Waiting visitors by ticket number, and their tickets in queue order
+        self._ticket_counter = 0
+        self._tickets = {}
+        self._visitors = {}
+        self._queue = []
+
+        # Waiting visitors by last check, least recent first
+        self._last_checked = OrderedDict()
+
+        # Admitted visitors by last request, least recent first: (admitted at, last seen)
+        self._active = OrderedDict()
+        self._mean_session = None
+        self.admitted = 0
+
+    @property
+    def waiting(self):
+        """
+        Number of visitors in the queue.
+        """
+        return len(self._queue)
+
+    @property
+    def active(self):
+        """
+        Number of admitted visitors with a live session.
+        """
+        return len(self._active)
+
+    def _end_session(self, visitor_id, now):
+        # Smooth the observed session length, used for waiting time estimates
+        admitted_at, _ = self._active.pop(visitor_id)
+        if self._mean_session is None:
+            self._mean_session = now - admitted_at
+        else:
+            self._mean_session += 0.1 * (now - admitted_at - self._mean_session)
+
+    def _dequeue(self, visitor_id):
+        ticket = self._tickets.pop(visitor_id)
+        del self._visitors[ticket]
+        del self._last_checked[visitor_id]
+        del self._queue[bisect.bisect_left(self._queue, ticket)]
+
+    def _admit(self, now):
+        # Drop idle sessions and visitors who stopped checking the queue, then
+        # let in visitors from the front of the queue
+        while self._active:
+            visitor_id, (_, last_seen) = next(iter(self._active.items()))
+            if now - last_seen < self.session_timeout:
+                break
+            self._end_session(visitor_id, now)
+        while self._last_checked:
+            visitor_id, last_checked = next(iter(self._last_checked.items()))
+            if now - last_checked < self.queue_timeout:
+                break
+            self._dequeue(visitor_id)
+
+        admitted = 0
+        while admitted < len(self._queue) and len(self._active) < self.max_active and self.bucket.try_take():
+            visitor_id = self._visitors.pop(self._queue[admitted])
+            del self._tickets[visitor_id]
+            del self._last_checked[visitor_id]
+            self._active[visitor_id] = (now, now)
+            admitted += 1
+        if admitted:
+            del self._queue[:admitted]
+            self.admitted += admitted
+
+    def _eta(self, position):
+        # Admissions per second: the token rate, unless every slot is taken
+        # and sessions have been ending more slowly than that
+        eta = self.bucket.wait_time(position)
+        if len(self._active) >= self.max_active and self._mean_session is not None:
+            eta = max(eta, position * self._mean_session / self.max_active)
+        return eta
+
+    def enter(self, visitor_id):
+        """
+        Queue a visitor, or refresh their session if they were let in, and
+        return their Admission.
+        """
+        with self._lock:
+            now = self.clock()
+            if visitor_id in self._active:
+                self._active[visitor_id] = (self._active[visitor_id][0], now)
+                self._active.move_to_end(visitor_id)
+                return Admission(True, 0, 0.0)
+
+            if visitor_id not in self._tickets:
+                self._ticket_counter += 1
+                self._tickets[visitor_id] = self._ticket_counter
+                self._visitors[self._ticket_counter] = visitor_id
+                self._queue.append(self._ticket_counter)
+            self._last_checked[visitor_id] = now
+            self._last_checked.move_to_end(visitor_id)
+
+            self._admit(now)
+            if visitor_id in self._active:
+                return Admission(True, 0, 0.0)
+            position = bisect.bisect_left(self._queue, self._tickets[visitor_id]) + 1
+            return Admission(False, position, self._eta(position))
+
+    def leave(self, visitor_id):
+        """
+        End a visitor's session, or take them out of the queue. Return False
+        if they were neither waiting nor admitted.
+        """
+        with self._lock:
+            now = self.clock()
+            if visitor_id in self._active:
+                self._end_session(visitor_id, now)
+                return True
+
+            if visitor_id not in self._tickets:
+                return False
+            self._dequeue(visitor_id)
+            return True
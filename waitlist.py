@@ -0,0 +1,82 @@
+import heapq
+
+
+class Waitlist:
+    """
+    Parties waiting for seats of a sold-out screening.
+
+    Entries are ordered by `(priority, arrival)`, lower priority values
+    first, and kept in one heap per party size. Finding the first party
+    that fits in a number of free seats only looks at the head of each
+    party size's heap, so it does not depend on how long the waitlist is.
+    Removed entries are skipped lazily when they reach the head of a heap.
+    """
+    def __init__(self):
+        self._heaps = {}
+        self._entries = {}
+        self._arrivals = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._entries
+
+    def add(self, entry_id, party_size, priority=0, arrival=None):
+        """
+        Add a party to the waitlist. `arrival` is only given when restoring
+        a saved waitlist; new parties arrive after everyone else.
+        """
+        if party_size <= 0:
+            raise ValueError("Party size must be positive")
+        if entry_id in self._entries:
+            raise ValueError(f"Waitlist entry {entry_id} already exists")
+
+        if arrival is None:
+            arrival = self._arrivals + 1
+        self._arrivals = max(self._arrivals, arrival)
+        self._entries[entry_id] = (priority, arrival, party_size)
+        heapq.heappush(self._heaps.setdefault(party_size, []), (priority, arrival, entry_id))
+
+    def remove(self, entry_id):
+        """
+        Take a party off the waitlist. Return False if it was not on it.
+        """
+        return self._entries.pop(entry_id, None) is not None
+
+    def entries(self):
+        """
+        Return `(entry_id, priority, arrival, party_size)` of every waiting
+        party, in arrival order.
+        """
+        return sorted(((entry_id,) + entry for entry_id, entry in self._entries.items()),
+                      key=lambda entry: entry[2])
+
+    def entry(self, entry_id):
+        """
+        Return `(priority, arrival, party_size)` of a waiting party.
+        """
+        return self._entries[entry_id]
+
+    def _head(self, party_size):
+        heap = self._heaps[party_size]
+        while heap and heap[0][2] not in self._entries:
+            heapq.heappop(heap)
+        if not heap:
+            del self._heaps[party_size]
+            return None
+        return heap[0]
+
+    def first_fitting(self, max_party_size):
+        """
+        Return `(entry_id, party_size)` of the first party in priority order
+        with at most `max_party_size` people, or None.
+        """
+        best = None
+        for party_size in [size for size in self._heaps if size <= max_party_size]:
+            head = self._head(party_size)
+            if head is not None and (best is None or head < best[0]):
+                best = (head, party_size)
+        if best is None:
+            return None
+        return best[0][2], best[1]
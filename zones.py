@@ -0,0 +1,97 @@
+"""
+Pricing zones defined over the seat grid of a cinema.
+"""
+
+# Default tiers
+ZONE_PREMIUM = "premium"
+ZONE_STANDARD = "standard"
+ZONE_FRONT_ROW = "front-row"
+
+
+class ZoneMap:
+    """
+    Assigns each position of the seat grid to at most one named zone.
+
+    Zones are compiled into per-row bitmasks, where bit `col_index` of a row
+    mask is set when that position belongs to the zone. Rows are padded
+    without a zone to the longest row, or to `seats_per_row` if given.
+    """
+    def __init__(self, cells, seats_per_row=0):
+        self.rows = len(cells)
+        self.seats_per_row = max([seats_per_row] + [len(row) for row in cells])
+        self.cells = [list(row) + [None] * (self.seats_per_row - len(row)) for row in cells]
+
+        self.names = []
+        self.masks = {}
+        for row_index, row in enumerate(self.cells):
+            for col_index, name in enumerate(row):
+                if name is None:
+                    continue
+                if name not in self.masks:
+                    self.names.append(name)
+                    self.masks[name] = [0] * self.rows
+                self.masks[name][row_index] |= 1 << col_index
+
+    @classmethod
+    def by_rows(cls, rows, seats_per_row, zone_rows):
+        """
+        Build zones from whole rows, given as a mapping of zone name to row indexes.
+        Rows not listed are left without a zone.
+        """
+        cells = [[None] * seats_per_row for _ in range(rows)]
+        for name, row_indexes in zone_rows.items():
+            for row_index in row_indexes:
+                if not (0 <= row_index < rows):
+                    raise ValueError(f"Row index {row_index} is out of range")
+                cells[row_index] = [name] * seats_per_row
+        return cls(cells)
+
+    @classmethod
+    def from_string(cls, text, names):
+        """
+        Parse zones drawn one character per position, like a hall layout, with
+        `names` mapping each character to a zone name. `_` or a space leaves a
+        position without a zone.
+        """
+        cells = []
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.lstrip().startswith("#"):
+                continue
+            row = []
+            for char in line:
+                if char in ("_", " "):
+                    row.append(None)
+                elif char in names:
+                    row.append(names[char])
+                else:
+                    raise ValueError(f"Unknown zone code '{char}'")
+            cells.append(row)
+        return cls(cells)
+
+    @classmethod
+    def default_tiers(cls, rows, seats_per_row):
+        """
+        Default tiers: the row nearest the screen is front-row, the back third
+        of the hall is premium and everything in between is standard.
+        """
+        premium_rows = max(rows // 3, 1) if rows > 1 else 0
+        return cls.by_rows(rows, seats_per_row, {
+            ZONE_FRONT_ROW: range(0, min(rows, 1)),
+            ZONE_STANDARD: range(1, rows - premium_rows),
+            ZONE_PREMIUM: range(max(rows - premium_rows, 1), rows),
+        })
+
+    def zone_at(self, row_index, col_index):
+        """
+        Return the zone name of a position, or None if it has no zone.
+        """
+        return self.cells[row_index][col_index]
+
+    def widened(self, seats_per_row):
+        """
+        Return these zones padded without a zone out to `seats_per_row`.
+        """
+        if seats_per_row <= self.seats_per_row:
+            return self
+        return ZoneMap(self.cells, seats_per_row)